@@ -0,0 +1,78 @@
+"""
+Memory benchmark: list-of-SlackUser rosters versus CompactRoster.
+
+Writes a synthetic ``fixed_full`` roster in which a pool of people appear
+many times (as they do in real rotations), then measures the memory each
+representation retains after loading it, using tracemalloc.
+
+Usage:
+    python benchmarks/roster_memory.py [--entries 100000] [--people 500]
+"""
+
+import argparse
+import gc
+import os
+import tempfile
+import tracemalloc
+
+from goaliebot.core.compact import CompactRoster
+from goaliebot.core.file_ops import get_goalie_and_users
+from goaliebot.core.roster import Roster
+
+
+def write_roster(path, entries, people):
+    with open(path, "w") as f:
+        for i in range(entries):
+            goalie, deputy = i % people, (i + 1) % people
+            marker = " **" if i == entries // 2 else ""
+            f.write(
+                f"person{goalie}{marker}, U{goalie:08d} | person{deputy}, U{deputy:08d}\n"
+            )
+
+
+def retained_bytes(load):
+    """Bytes still allocated once ``load()`` returns, while its result is alive."""
+    gc.collect()
+    tracemalloc.start()
+    result = load()
+    gc.collect()
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return current
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--people", type=int, default=500)
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(suffix=".txt")
+    os.close(fd)
+    try:
+        write_roster(path, args.entries, args.people)
+        candidates = {
+            "get_goalie_and_users (list of SlackUser)": lambda: get_goalie_and_users(
+                path, mode="fixed_full"
+            ),
+            "Roster (lines + SlackUser columns)": lambda: Roster.load(
+                path, mode="fixed_full"
+            ),
+            "CompactRoster (interned array columns)": lambda: CompactRoster.load(
+                path, mode="fixed_full"
+            ),
+        }
+        print(f"{args.entries:,} entries, {args.people:,} distinct people")
+        for name, load in candidates.items():
+            size = retained_bytes(load)
+            print(
+                f"  {name:<42} {size / 1024 / 1024:8.2f} MiB"
+                f"  ({size / args.entries:6.1f} B/entry)"
+            )
+    finally:
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
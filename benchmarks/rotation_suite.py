@@ -0,0 +1,311 @@
+"""
+Benchmark suite for roster parsing, rotation and the Slack fan-out.
+
+Generates synthetic rosters for every mode and times the hot paths
+separately: get_goalie_and_users, get_next_goalie_and_deputy and
+update_goalie_file. Then runs run_slack_commands end to end against a fake
+Slack client with a fixed per-call latency, counting the API calls each
+scenario makes. Results are written as JSON so runs can be compared from
+one release to the next. With --profile, one extra run of each operation
+and scenario is profiled and its profile directory recorded with its
+timings.
+
+Usage:
+    python benchmarks/rotation_suite.py [--sizes 10,1000,100000,1000000]
+        [--repeat 3] [--channels 10] [--latency 0.05] [--concurrency 8]
+        [--output results.json] [--profile profiles/]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from importlib.metadata import version
+
+from goaliebot.core.file_ops import (
+    get_goalie_and_users,
+    get_next_goalie_and_deputy,
+    update_goalie_file,
+)
+from goaliebot.core.models import MODES, Cadence, Command, SlackUser
+from goaliebot.operations.command_runner import run_slack_commands
+from goaliebot.slack_api.directory import configure_directory
+from goaliebot.slack_api.ratelimit import configure_scheduler
+from goaliebot.telemetry.profiling import RunProfiler
+
+DEFAULT_SIZES = (10, 1_000, 100_000, 1_000_000)
+USER_GROUP_ID = "S00000001"
+
+
+def write_roster(path, lines, mode):
+    """Write a roster of ``lines`` distinct people, marked halfway through."""
+    current = lines // 2
+    with open(path, "w") as f:
+        for i in range(lines):
+            marker = " **" if i == current else ""
+            entry = f"person{i}{marker}, U{i:08d}"
+            if mode == "fixed_full":
+                deputy = (i + 1) % lines
+                entry = f"{entry} | person{deputy}, U{deputy:08d}"
+            f.write(entry + "\n")
+
+
+def time_runs(run, repeat, setup=None):
+    """Wall-clock seconds of each of ``repeat`` runs; ``setup`` is untimed."""
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def profile_run(run, directory, setup=None):
+    """Profile one untimed run into ``directory`` and return it."""
+    if setup:
+        setup()
+    profiler = RunProfiler(directory)
+    profiler.start()
+    try:
+        run()
+    finally:
+        profiler.stop()
+    profiler.write()
+    return directory
+
+
+def summarize(timings):
+    return {
+        "runs": len(timings),
+        "min_seconds": round(min(timings), 6),
+        "median_seconds": round(statistics.median(timings), 6),
+    }
+
+
+def bench_roster(path, lines, mode, repeat, profile_dir=None):
+    """Time the three rotation steps on one synthetic roster."""
+    source = path + ".src"
+    write_roster(source, lines, mode)
+    shutil.copyfile(source, path)
+
+    current_goalie, users, index = get_goalie_and_users(path, mode=mode)
+    next_goalie, deputy = get_next_goalie_and_deputy(
+        path, users, current_goalie, index, mode=mode
+    )
+    steps = {
+        "get_goalie_and_users": (
+            lambda: get_goalie_and_users(path, mode=mode),
+            None,
+        ),
+        "get_next_goalie_and_deputy": (
+            lambda: get_next_goalie_and_deputy(
+                path, users, current_goalie, index, mode=mode
+            ),
+            None,
+        ),
+        "update_goalie_file": (
+            lambda: update_goalie_file(path, next_goalie, deputy, mode=mode),
+            lambda: shutil.copyfile(source, path),
+        ),
+    }
+
+    results = []
+    try:
+        for operation, (run, setup) in steps.items():
+            with contextlib.redirect_stdout(io.StringIO()):
+                timings = time_runs(run, repeat, setup)
+                record = {
+                    "mode": mode,
+                    "lines": lines,
+                    "operation": operation,
+                    **summarize(timings),
+                }
+                if profile_dir:
+                    record["profile"] = profile_run(
+                        run,
+                        os.path.join(profile_dir, f"{mode}-{lines}-{operation}"),
+                        setup,
+                    )
+            results.append(record)
+    finally:
+        os.unlink(source)
+    return results
+
+
+class FakeSlack:
+    """
+    Stand-in for WebClient: every API method sleeps for ``latency`` seconds,
+    counts the call and returns a canned response for ``channels`` channels.
+    """
+
+    def __init__(self, channels, latency):
+        self.token = "xoxb-benchmark"
+        self.latency = latency
+        self.calls = Counter()
+        self.channels = [
+            {"id": f"C{i:08d}", "name": f"bench-{i}", "topic": {"value": ""}}
+            for i in range(channels)
+        ]
+
+    def _respond(self, method):
+        self.calls[method] += 1
+        if method == "conversations_list":
+            return {"channels": self.channels, "response_metadata": {}}
+        if method == "usergroups_list":
+            return {
+                "usergroups": [{"id": USER_GROUP_ID, "handle": "goalies", "users": []}]
+            }
+        if method == "conversations_info":
+            return {"channel": {"topic": {"value": ""}}}
+        if method == "conversations_history":
+            return {"messages": []}
+        return {"ok": True}
+
+    def __getattr__(self, method):
+        def call(**kwargs):
+            time.sleep(self.latency)
+            return self._respond(method)
+
+        return call
+
+
+class FakeAsyncSlack(FakeSlack):
+    """Stand-in for AsyncWebClient with the same responses and counting."""
+
+    def __getattr__(self, method):
+        async def call(**kwargs):
+            await asyncio.sleep(self.latency)
+            return self._respond(method)
+
+        return call
+
+
+def bench_slack(channels, latency, concurrency, repeat, profile_dir=None):
+    """Run the full Slack fan-out per scenario, counting API calls."""
+    scenarios = {
+        "sequential": {},
+        "concurrent": {"concurrency": concurrency},
+        "reconcile": {"reconcile": True},
+    }
+    slack_channels = [f"#bench-{i}" for i in range(channels)]
+    goalie = SlackUser("person1", "U00000001")
+    deputy = SlackUser("person2", "U00000002")
+
+    results = []
+    for scenario, options in scenarios.items():
+        timings = []
+        calls = Counter()
+
+        def fan_out():
+            # A cold in-memory directory per run, so every run pays for lookups.
+            configure_directory(cache_path=None)
+            client = FakeSlack(channels, latency)
+            async_client = FakeAsyncSlack(channels, latency)
+            with contextlib.redirect_stdout(io.StringIO()):
+                run_slack_commands(
+                    "xoxb-benchmark",
+                    slack_channels,
+                    goalie,
+                    deputy,
+                    USER_GROUP_ID,
+                    list(Command),
+                    Cadence.WEEK,
+                    client=client,
+                    async_client=async_client,
+                    **options,
+                )
+            return client.calls + async_client.calls
+
+        for _ in range(repeat):
+            started = time.perf_counter()
+            calls = fan_out()
+            timings.append(time.perf_counter() - started)
+        record = {
+            "scenario": scenario,
+            "channels": channels,
+            "latency_seconds": latency,
+            "concurrency": options.get("concurrency"),
+            "api_calls": dict(sorted(calls.items())),
+            "total_api_calls": sum(calls.values()),
+            **summarize(timings),
+        }
+        if profile_dir:
+            record["profile"] = profile_run(
+                fan_out, os.path.join(profile_dir, f"slack-{scenario}")
+            )
+        results.append(record)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--sizes",
+        default=",".join(str(size) for size in DEFAULT_SIZES),
+        help="Comma-separated roster sizes in lines",
+    )
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--channels", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--output", help="Write JSON here instead of stdout")
+    parser.add_argument(
+        "--profile",
+        help="Also profile one extra run of each operation and scenario into this directory",
+    )
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    modes = args.modes.split(",")
+    # The fake client never rate limits, so only its own latency is measured.
+    configure_scheduler(throttle=False)
+
+    roster_results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "roster.txt")
+        for mode in modes:
+            for lines in sizes:
+                print(f"⏱️  {mode}, {lines:,} lines", file=sys.stderr)
+                roster_results += bench_roster(
+                    path, lines, mode, args.repeat, args.profile
+                )
+
+    print(f"⏱️  Slack fan-out, {args.channels} channels", file=sys.stderr)
+    slack_results = bench_slack(
+        args.channels, args.latency, args.concurrency, args.repeat, args.profile
+    )
+
+    report = {
+        "meta": {
+            "goaliebot": version("goaliebot"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "repeat": args.repeat,
+        },
+        "roster": roster_results,
+        "slack": slack_results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,382 @@
+import os
+import sys
+import time
+from datetime import date, datetime
+
+import click
+
+from goaliebot.core.announcements import plan_announcements
+from goaliebot.core.compact import CompactRoster
+from goaliebot.core.models import MODES, Cadence
+from goaliebot.core.schedule import RotationSchedule, period_index, period_start
+from goaliebot.slack_api.resilience import SlackUnavailableError
+from goaliebot.rotation_entry import (
+    configure_slack_runtime,
+    load_availability,
+    load_notification_template,
+    resolve_user_group_id,
+    slack_client_options,
+    validate_cadence,
+    write_run_metrics,
+)
+from goaliebot.telemetry.logs import get_logger
+from goaliebot.telemetry.metrics import get_metrics
+
+
+def rotation_key(file_path):
+    """Scheduled announcements are recorded per roster file."""
+    return os.path.abspath(file_path)
+
+
+def planned_anchor(planned, roster, cadence, today):
+    """
+    The anchor to plan from when none is given. ``planned`` is the
+    ``(anchor, current_index)`` of the last plan: while the roster's goalie
+    is the same, its anchor is kept so re-planning changes nothing. Once
+    the roster has rotated, the new goalie's period is taken to be the one
+    containing ``today``, on the last plan's period boundaries.
+    """
+    if planned is None:
+        return today
+    anchor, current_index = planned
+    if current_index == roster.current_index:
+        return anchor
+    return period_start(anchor, cadence, period_index(anchor, cadence, today))
+
+
+def plan_rotation_announcements(
+    file_path,
+    slack_token,
+    slack_channels,
+    user_group_handle,
+    mode,
+    cadence,
+    anchor,
+    count,
+    post_time,
+    store,
+    now=None,
+    dry_run=False,
+    client=None,
+    template=None,
+    availability=None,
+):
+    """
+    Work out the next ``count`` announcements of a roster and schedule them
+    in Slack, replacing ones planned from an older version of the roster.
+    Without an ``anchor``, the last plan's is reused (see planned_anchor),
+    or today on the first plan. A ``template`` (a NotificationTemplate)
+    replaces the built-in message, and with an ``availability`` calendar
+    people away are skipped as the rotation runs would skip them.
+    """
+    from goaliebot.operations.announcements import sync_announcements
+    from goaliebot.operations.slack_helpers import render_goalie_notification
+    from goaliebot.slack_api.client import get_client
+
+    metrics = get_metrics()
+    with metrics.phase("parse_roster"):
+        roster = CompactRoster.load(file_path, mode=mode)
+    if roster.current_index < 0:
+        get_logger().error(
+            "no_current_goalie", "❌ No current goalie marked with '**' in the file."
+        )
+        sys.exit(1)
+    now = time.time() if now is None else now
+    rotation = rotation_key(file_path)
+    today = date.fromtimestamp(now)
+    anchor = anchor or planned_anchor(store.anchor(rotation), roster, cadence, today)
+    store.set_anchor(rotation, anchor, roster.current_index)
+    schedule = RotationSchedule.from_roster(roster, cadence, anchor, availability)
+
+    client = client or get_client(slack_token)
+    user_group_id = resolve_user_group_id(slack_token, user_group_handle, client=client)
+
+    def compose(assignment):
+        return render_goalie_notification(
+            assignment.goalie,
+            assignment.deputy,
+            user_group_id,
+            cadence,
+            template,
+            schedule.assignment(assignment.period + 1).goalie,
+        )
+
+    with metrics.phase("plan_announcements"):
+        desired = plan_announcements(
+            rotation, schedule, slack_channels, count, post_time, compose, now
+        )
+    with metrics.phase("sync_announcements"):
+        return sync_announcements(client, store, rotation, desired, now, dry_run)
+
+
+def _describe(announcement):
+    when = datetime.fromtimestamp(announcement.post_at).strftime("%Y-%m-%d %H:%M")
+    message_id = announcement.scheduled_message_id or "-"
+    return f"{when}  {announcement.channel}  period {announcement.period}  {message_id}"
+
+
+def print_sync_result(result, dry_run):
+    logger = get_logger()
+    verb = "Would schedule" if dry_run else "Scheduled"
+    for announcement in result.scheduled:
+        logger.info(
+            "announcement_planned",
+            f"📅 {verb}: {_describe(announcement)}",
+            channel=announcement.channel,
+        )
+    verb = "Would cancel" if dry_run else "Cancelled"
+    for announcement in result.cancelled:
+        logger.info(
+            "announcement_dropped",
+            f"🗑️ {verb}: {_describe(announcement)}",
+            channel=announcement.channel,
+        )
+    logger.info(
+        "announcements_synced",
+        f"✅ {len(result.kept)} kept, {len(result.scheduled)} scheduled, "
+        f"{len(result.cancelled)} cancelled, {len(result.failed)} failed",
+        ok=not result.failed,
+    )
+
+
+@click.group()
+def announcements():
+    """Queue rotation announcements in Slack ahead of time."""
+
+
+def store_option(command):
+    return click.option(
+        "--store",
+        "store_path",
+        default=None,
+        help="File recording scheduled announcement IDs (default: ~/.cache/goaliebot/scheduled_announcements.json)",
+    )(command)
+
+
+@announcements.command()
+@click.option("--file-path", required=True, help="Path to the text file with users")
+@click.option("--slack-token", required=True, help="Slack API token")
+@click.option(
+    "--slack-channels",
+    required=True,
+    help="Space-separated list of Slack channels to announce in",
+)
+@click.option(
+    "--user-group-handle",
+    required=True,
+    help="Slack user group handle mentioned in the announcements",
+)
+@click.option(
+    "--mode",
+    default="next_as_deputy",
+    type=click.Choice(MODES),
+    help="Mode of deputy assignment",
+)
+@click.option(
+    "--cadence",
+    default="week",
+    type=click.Choice([c.value for c in Cadence]),
+    callback=validate_cadence,
+    help="Cadence of rotation: day, week, month (default: week)",
+)
+@click.option(
+    "--anchor",
+    type=click.DateTime(formats=["%Y-%m-%d"]),
+    default=None,
+    help="Start date of the current goalie's period (default: the anchor of the first plan, or today)",
+)
+@click.option(
+    "--count",
+    type=click.IntRange(min=1),
+    default=4,
+    show_default=True,
+    help="Number of upcoming periods to announce (Slack schedules at most 120 days ahead)",
+)
+@click.option(
+    "--post-time",
+    type=click.DateTime(formats=["%H:%M"]),
+    default="09:00",
+    show_default=True,
+    help="Local time of day, on the first day of each period, to post at",
+)
+@click.option(
+    "--availability",
+    default=None,
+    help="File of out-of-office ranges ('person, first day, last day'); people away during a period are skipped",
+)
+@click.option(
+    "--template",
+    default=None,
+    help="Notification template: a text file, or a .json file of Block Kit blocks",
+)
+@click.option(
+    "--dry-run",
+    is_flag=True,
+    default=False,
+    help="Show what would be scheduled and cancelled without calling Slack's write methods",
+)
+@store_option
+@slack_client_options
+def plan(
+    file_path,
+    slack_token,
+    slack_channels,
+    user_group_handle,
+    mode,
+    cadence,
+    anchor,
+    count,
+    post_time,
+    availability,
+    template,
+    dry_run,
+    store_path,
+    directory_cache,
+    directory_cache_ttl,
+    rate_limit_state,
+    slack_base_url,
+    slack_timeout,
+    slack_pool_size,
+    slack_retries,
+    circuit_breaker_threshold,
+    run_deadline,
+    log_level,
+    log_format,
+    metrics_json,
+    metrics_textfile,
+    trace_file,
+):
+    """Schedule the next announcements, re-planning any the roster no longer matches."""
+    from goaliebot.operations.announcements import AnnouncementStore
+
+    configure_slack_runtime(
+        directory_cache,
+        directory_cache_ttl,
+        rate_limit_state,
+        slack_base_url,
+        slack_timeout,
+        slack_pool_size,
+        slack_retries,
+        circuit_breaker_threshold,
+        run_deadline,
+        log_level,
+        log_format,
+        trace_file,
+    )
+    notification_template = load_notification_template(template)
+    calendar = load_availability(availability)
+    try:
+        result = plan_rotation_announcements(
+            file_path=file_path,
+            slack_token=slack_token,
+            slack_channels=slack_channels.split(),
+            user_group_handle=user_group_handle,
+            mode=mode,
+            cadence=cadence,
+            anchor=anchor.date() if anchor else None,
+            count=count,
+            post_time=post_time.time(),
+            store=AnnouncementStore(store_path),
+            dry_run=dry_run,
+            template=notification_template,
+            availability=calendar,
+        )
+    except (OSError, ValueError, SlackUnavailableError) as e:
+        get_logger().error(
+            "announcements_not_planned", f"❌ Could not plan announcements: {e}"
+        )
+        sys.exit(1)
+    finally:
+        write_run_metrics(metrics_json, metrics_textfile)
+
+    print_sync_result(result, dry_run)
+    if result.failed:
+        sys.exit(1)
+
+
+@announcements.command("list")
+@click.option("--file-path", default=None, help="Only list this roster's announcements")
+@store_option
+def list_announcements(file_path, store_path):
+    """List the announcements recorded as scheduled."""
+    from goaliebot.operations.announcements import AnnouncementStore
+
+    rotation = rotation_key(file_path) if file_path else None
+    recorded = AnnouncementStore(store_path).for_rotation(rotation)
+    if not recorded:
+        print("No scheduled announcements recorded.")
+        return
+    now = time.time()
+    for announcement in recorded:
+        status = "sent" if announcement.post_at <= now else "pending"
+        print(f"{_describe(announcement)}  {status}  {announcement.rotation}")
+
+
+@announcements.command()
+@click.option("--slack-token", required=True, help="Slack API token")
+@click.option(
+    "--file-path", default=None, help="Only cancel this roster's announcements"
+)
+@store_option
+@slack_client_options
+def cancel(
+    slack_token,
+    file_path,
+    store_path,
+    directory_cache,
+    directory_cache_ttl,
+    rate_limit_state,
+    slack_base_url,
+    slack_timeout,
+    slack_pool_size,
+    slack_retries,
+    circuit_breaker_threshold,
+    run_deadline,
+    log_level,
+    log_format,
+    metrics_json,
+    metrics_textfile,
+    trace_file,
+):
+    """Cancel the pending announcements recorded as scheduled."""
+    from goaliebot.operations.announcements import (
+        AnnouncementStore,
+        cancel_announcements,
+    )
+    from goaliebot.slack_api.client import get_client
+
+    configure_slack_runtime(
+        directory_cache,
+        directory_cache_ttl,
+        rate_limit_state,
+        slack_base_url,
+        slack_timeout,
+        slack_pool_size,
+        slack_retries,
+        circuit_breaker_threshold,
+        run_deadline,
+        log_level,
+        log_format,
+        trace_file,
+    )
+    store = AnnouncementStore(store_path)
+    rotation = rotation_key(file_path) if file_path else None
+    try:
+        cancelled = cancel_announcements(
+            get_client(slack_token), store, rotation, now=time.time()
+        )
+    finally:
+        write_run_metrics(metrics_json, metrics_textfile)
+
+    remaining = len(store.for_rotation(rotation))
+    get_logger().info(
+        "announcements_cancelled",
+        f"✅ Cancelled {cancelled} announcement(s), {remaining} could not be cancelled",
+        ok=not remaining,
+    )
+    if remaining:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    announcements()
@@ -0,0 +1,241 @@
+import json
+import sys
+import time
+from dataclasses import asdict, dataclass
+
+import click
+
+from goaliebot.core.availability import AvailabilityCalendar
+from goaliebot.core.manifest import load_manifest
+from goaliebot.core.templates import load_template
+from goaliebot.slack_api.client import get_client
+from goaliebot.telemetry.logs import configure_logging, get_logger
+from goaliebot.telemetry.tracing import get_tracer
+from goaliebot.rotation_entry import (
+    configure_slack_runtime,
+    profile_option,
+    profiled_run,
+    write_run_metrics,
+    run_rotation,
+    slack_runtime_options,
+)
+
+
+@dataclass
+class RotationResult:
+    name: str
+    ok: bool
+    goalie: str = None
+    deputy: str = None
+    error: str = None
+    duration_seconds: float = 0.0
+
+
+def _exit_reason(exit_error):
+    code = exit_error.code
+    return code if isinstance(code, str) else f"exited with status {code}"
+
+
+def run_spec(
+    spec,
+    slack_token,
+    client,
+    async_client=None,
+    concurrency=None,
+    reconcile=False,
+    state=None,
+    roster_cache=None,
+):
+    """
+    Rotate the roster of one manifest entry. A failure is recorded in the
+    returned RotationResult rather than raised.
+    """
+    get_logger().info(
+        "rotation_started", f"\n🔄 Rotating {spec.name} ({spec.file_path})"
+    )
+    started = time.perf_counter()
+    result = RotationResult(name=spec.name, ok=False)
+    with get_tracer().span(
+        "rotate_roster",
+        **{"goaliebot.rotation": spec.name, "goaliebot.roster": spec.file_path},
+    ) as span:
+        try:
+            goalie, deputy = run_rotation(
+                file_path=spec.file_path,
+                slack_token=slack_token,
+                slack_channels=spec.channels,
+                user_group_handle=spec.user_group_handle,
+                commands=spec.commands,
+                mode=spec.mode,
+                cadence=spec.cadence,
+                concurrency=concurrency,
+                client=client,
+                async_client=async_client,
+                reconcile=reconcile,
+                state=state,
+                roster_cache=roster_cache,
+                availability=(
+                    AvailabilityCalendar.load(spec.availability)
+                    if spec.availability
+                    else None
+                ),
+                template=load_template(spec.template) if spec.template else None,
+            )
+            result.ok = True
+            result.goalie = goalie.handle
+            result.deputy = deputy.handle if deputy else None
+        except SystemExit as e:
+            result.error = _exit_reason(e)
+        except Exception as e:
+            result.error = str(e) or type(e).__name__
+            get_logger().error(
+                "rotation_failed",
+                f"❌ Rotation {spec.name} failed: {result.error}",
+                error=result.error,
+            )
+        if result.error:
+            span.record_error(result.error)
+    result.duration_seconds = round(time.perf_counter() - started, 3)
+    return result
+
+
+def run_batch(specs, slack_token, concurrency=None, reconcile=False):
+    """
+    Rotate every roster in ``specs`` with one shared set of Slack clients
+    (and, with ``reconcile``, one shared cache of Slack state reads).
+
+    A failing rotation is recorded and the batch moves on to the next one.
+    Returns one RotationResult per spec, in order.
+    """
+    from goaliebot.operations.command_runner import create_async_client
+    from goaliebot.slack_api.state import SlackStateReader
+
+    client = get_client(slack_token)
+    async_client = create_async_client(slack_token) if concurrency else None
+    state = SlackStateReader() if reconcile else None
+
+    return [
+        run_spec(
+            spec,
+            slack_token,
+            client,
+            async_client=async_client,
+            concurrency=concurrency,
+            reconcile=reconcile,
+            state=state,
+        )
+        for spec in specs
+    ]
+
+
+def print_batch_report(results):
+    succeeded = sum(result.ok for result in results)
+    logger = get_logger()
+    logger.info(
+        "batch_complete",
+        f"\n📋 Batch complete: {succeeded}/{len(results)} rotations succeeded.",
+        ok=succeeded == len(results),
+    )
+    for result in results:
+        if result.ok:
+            logger.info(
+                "rotation_result",
+                f"✅ {result.name}: goalie {result.goalie}, deputy {result.deputy or 'None'}",
+                ok=True,
+            )
+        else:
+            logger.error(
+                "rotation_result",
+                f"❌ {result.name}: {result.error}",
+                ok=False,
+                error=result.error,
+            )
+
+
+def write_batch_report(results, report_path):
+    with open(report_path, "w") as f:
+        json.dump([asdict(result) for result in results], f, indent=2)
+
+
+@click.command()
+@click.option(
+    "--manifest",
+    required=True,
+    type=click.Path(exists=True, dir_okay=False),
+    help="TOML file listing the rotations to run",
+)
+@click.option(
+    "--slack-token",
+    required=True,
+    envvar="SLACK_TOKEN",
+    help="Slack API token (or set SLACK_TOKEN)",
+)
+@click.option(
+    "--report",
+    default=None,
+    help="Write a JSON report with one entry per rotation to this file",
+)
+@profile_option
+@slack_runtime_options
+def batch(
+    manifest,
+    slack_token,
+    report,
+    directory_cache,
+    directory_cache_ttl,
+    concurrency,
+    reconcile,
+    rate_limit_state,
+    slack_base_url,
+    slack_timeout,
+    slack_pool_size,
+    slack_retries,
+    circuit_breaker_threshold,
+    run_deadline,
+    log_level,
+    log_format,
+    metrics_json,
+    metrics_textfile,
+    trace_file,
+    profile_dir,
+):
+    """Rotate every roster listed in a manifest in one process."""
+    # Set up early so a manifest error is logged in the chosen format.
+    configure_logging(level=log_level, fmt=log_format)
+    try:
+        specs = load_manifest(manifest)
+    except (OSError, ValueError) as e:
+        get_logger().error("invalid_manifest", f"❌ Invalid manifest {manifest}: {e}")
+        sys.exit(1)
+
+    with profiled_run(profile_dir):
+        configure_slack_runtime(
+            directory_cache,
+            directory_cache_ttl,
+            rate_limit_state,
+            slack_base_url,
+            slack_timeout,
+            slack_pool_size,
+            slack_retries,
+            circuit_breaker_threshold,
+            run_deadline,
+            log_level,
+            log_format,
+            trace_file,
+        )
+        try:
+            results = run_batch(
+                specs, slack_token, concurrency=concurrency, reconcile=reconcile
+            )
+        finally:
+            write_run_metrics(metrics_json, metrics_textfile)
+
+    print_batch_report(results)
+    if report:
+        write_batch_report(results, report)
+    if not all(result.ok for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    batch()
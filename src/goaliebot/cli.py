@@ -0,0 +1,67 @@
+import sys
+from importlib import import_module
+
+import click
+
+from goaliebot.rotation_entry import main as rotate
+
+# Subcommands imported only when invoked, so `goaliebot rotate` (the default)
+# does not pay for the batch runner or the stub server's HTTP stack.
+LAZY_COMMANDS = {
+    "announcements": "goaliebot.announcements_entry:announcements",
+    "batch": "goaliebot.batch_entry:batch",
+    "compile": "goaliebot.compile_entry:compile_command",
+    "schedule": "goaliebot.schedule_entry:schedule",
+    "serve": "goaliebot.serve_entry:serve",
+    "slack-stub": "goaliebot.testing.slack_stub:main",
+    "validate": "goaliebot.validate_entry:validate",
+}
+
+
+class _RotateByDefault(click.Group):
+    """
+    Treat ``goaliebot --file-path ...`` as ``goaliebot rotate --file-path ...``
+    and load the other subcommands on first use.
+    """
+
+    def list_commands(self, ctx):
+        return sorted(set(super().list_commands(ctx)) | set(LAZY_COMMANDS))
+
+    def get_command(self, ctx, name):
+        command = super().get_command(ctx, name)
+        if command is None and name in LAZY_COMMANDS:
+            module, attribute = LAZY_COMMANDS[name].split(":")
+            command = getattr(import_module(module), attribute)
+        return command
+
+    def parse_args(self, ctx, args):
+        if args and args[0] == "--import-profile":
+            _profile_imports(args[1:])
+        if args and args[0].startswith("-") and args[0] not in ("--help", "-h"):
+            args = ["rotate", *args]
+        return super().parse_args(ctx, args)
+
+
+def _profile_imports(args):
+    from goaliebot.telemetry.imports import print_import_report, run_with_importtime
+
+    returncode, timings = run_with_importtime(args)
+    print_import_report(timings)
+    sys.exit(returncode)
+
+
+@click.group(cls=_RotateByDefault)
+@click.option(
+    "--import-profile",
+    is_flag=True,
+    help="Run the rest of the command line in a fresh interpreter and report import time per module (must come first)",
+)
+def cli(import_profile):
+    """Goalie rotation for Slack."""
+
+
+cli.add_command(rotate, name="rotate")
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,63 @@
+import sys
+
+import click
+
+from goaliebot.core.compiled import CompiledRoster, compile_file, is_compiled
+from goaliebot.core.models import MODES
+
+
+@click.command(name="compile")
+@click.option(
+    "--file-path",
+    required=True,
+    type=click.Path(exists=True, dir_okay=False),
+    help="Roster to convert: text to compile, or a compiled roster with --decompile",
+)
+@click.option(
+    "--output",
+    required=True,
+    help="Where to write the result ('-' for stdout with --decompile)",
+)
+@click.option(
+    "--mode",
+    default="next_as_deputy",
+    type=click.Choice(MODES),
+    help="Mode of deputy assignment the text roster is written for",
+)
+@click.option(
+    "--decompile",
+    is_flag=True,
+    help="Turn a compiled roster back into the text format",
+)
+def compile_command(file_path, output, mode, decompile):
+    """Convert a roster to or from the compiled binary format."""
+    try:
+        if decompile:
+            if not is_compiled(file_path):
+                raise ValueError(f"{file_path} is not a compiled roster")
+            with CompiledRoster(file_path) as roster:
+                text = roster.dumps()
+            if output == "-":
+                sys.stdout.write(text)
+                return
+            with open(output, "w", encoding="utf-8", newline="") as f:
+                f.write(text)
+            print(f"✅ Decompiled {file_path} to {output}")
+            return
+
+        if output == "-":
+            raise ValueError("a compiled roster cannot be written to stdout")
+        if is_compiled(file_path):
+            raise ValueError(f"{file_path} is already compiled")
+        roster = compile_file(file_path, output, mode=mode)
+    except (OSError, ValueError, UnicodeDecodeError) as e:
+        print(f"❌ Could not convert {file_path}: {e}")
+        sys.exit(1)
+
+    if roster.current_index < 0:
+        print("⚠️ No current goalie marked with '**' in the file.")
+    print(f"✅ Compiled {len(roster)} entries from {file_path} to {output}")
+
+
+if __name__ == "__main__":
+    compile_command()
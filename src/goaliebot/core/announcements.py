@@ -0,0 +1,68 @@
+import json
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+
+from .schedule import period_index
+
+# Slack refuses to schedule a message more than 120 days ahead.
+MAX_SCHEDULE_AHEAD = timedelta(days=120)
+
+
+@dataclass
+class Announcement:
+    """One rotation announcement, queued or to be queued with chat.scheduleMessage."""
+
+    rotation: str
+    channel: str
+    period: int
+    post_at: int
+    text: str
+    channel_id: str = None
+    scheduled_message_id: str = None
+    blocks: list = None
+
+    @property
+    def key(self):
+        """What has to match for an already scheduled message to be kept."""
+        blocks = json.dumps(self.blocks, sort_keys=True)
+        return (self.rotation, self.channel, self.post_at, self.text, blocks)
+
+
+def post_timestamp(day, post_time):
+    """Unix time of ``post_time`` (local time) on ``day``."""
+    return int(datetime.combine(day, post_time).timestamp())
+
+
+def plan_announcements(rotation, schedule, channels, count, post_time, compose, now):
+    """
+    Announcements for the next ``count`` periods of ``schedule`` that start
+    after ``now``, posted to every channel at ``post_time`` on the first day
+    of the period. ``compose`` turns an Assignment into its Notification.
+    Periods beyond Slack's scheduling horizon are left for a later run.
+    """
+    today = date.fromtimestamp(now)
+    first = max(1, period_index(schedule.anchor, schedule.cadence, today))
+    horizon = now + MAX_SCHEDULE_AHEAD.total_seconds()
+
+    announcements = []
+    planned = 0
+    for assignment in schedule.periods(count + 1, first):
+        post_at = post_timestamp(assignment.start, post_time)
+        if post_at <= now:
+            continue
+        if planned == count or post_at > horizon:
+            break
+        planned += 1
+        notification = compose(assignment)
+        announcements += [
+            Announcement(
+                rotation,
+                channel,
+                assignment.period,
+                post_at,
+                notification.text,
+                blocks=notification.blocks,
+            )
+            for channel in channels
+        ]
+    return announcements
@@ -0,0 +1,86 @@
+from bisect import bisect_left
+from datetime import date, timedelta
+
+
+def _parse_date(value, line_number):
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"Line {line_number}: invalid date {value!r}")
+
+
+class AvailabilityCalendar:
+    """
+    Out-of-office ranges per person, read from a file of lines like::
+
+        # handle or user ID, first day away, last day away (inclusive)
+        alice, 2026-03-02, 2026-03-13
+        U456, 2026-04-01
+
+    Each person's ranges are merged and kept as sorted start and end lists,
+    so checking whether someone is away during a period is one dictionary
+    lookup and one bisect, however many ranges the file holds.
+    """
+
+    def __init__(self):
+        self._pending = {}
+        self._starts = {}
+        self._ends = {}
+
+    @classmethod
+    def load(cls, file_path):
+        calendar = cls()
+        with open(file_path, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, start=1):
+                line = line.split("#", 1)[0].strip()
+                if not line:
+                    continue
+                parts = [part.strip() for part in line.split(",")]
+                if len(parts) not in (2, 3) or not parts[0]:
+                    raise ValueError(
+                        f"Line {line_number}: expected 'person, first day[, last day]'"
+                    )
+                first = _parse_date(parts[1], line_number)
+                last = _parse_date(parts[-1], line_number)
+                if last < first:
+                    raise ValueError(f"Line {line_number}: range ends before it starts")
+                calendar.add(parts[0], first, last)
+        return calendar
+
+    def add(self, person, first, last):
+        """Record ``person`` (a handle or user ID) as away from ``first`` to ``last``."""
+        ranges = self._pending.setdefault(person, [])
+        if person in self._starts:
+            ranges += zip(self._starts.pop(person), self._ends.pop(person))
+        ranges.append((first, last + timedelta(days=1)))
+
+    def _index(self, person):
+        if person in self._pending:
+            starts, ends = [], []
+            for start, end in sorted(self._pending.pop(person)):
+                if ends and start <= ends[-1]:
+                    ends[-1] = max(ends[-1], end)
+                else:
+                    starts.append(start)
+                    ends.append(end)
+            self._starts[person], self._ends[person] = starts, ends
+        return self._starts.get(person), self._ends.get(person)
+
+    def _is_away(self, person, start, end):
+        starts, ends = self._index(person)
+        if not starts:
+            return False
+        # The last range starting before the period ends is the only one
+        # that can overlap it, since merged ranges do not overlap each other.
+        position = bisect_left(starts, end) - 1
+        return position >= 0 and ends[position] > start
+
+    def is_available(self, user, start, end):
+        """Whether ``user`` is not away on any day from ``start`` up to ``end`` (exclusive)."""
+        if self._is_away(user.handle, start, end):
+            return False
+        return not self._is_away(user.user_id, start, end)
+
+    def available_during(self, start, end):
+        """Predicate telling whether a SlackUser is available for the whole period."""
+        return lambda user: self.is_available(user, start, end)
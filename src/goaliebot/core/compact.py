@@ -0,0 +1,145 @@
+import sys
+from array import array
+
+from .models import SlackUser
+from .parser import parse_goalie_line, parse_fixed_full_line
+from .patching import recover_interrupted_patch
+from .roster import goalie_after_next, next_goalie_and_deputy
+
+NO_DEPUTY = 0xFFFFFFFF
+
+
+class _DeputyColumn:
+    """Sequence view over a CompactRoster's deputies."""
+
+    __slots__ = ("_roster",)
+
+    def __init__(self, roster):
+        self._roster = roster
+
+    def __len__(self):
+        return len(self._roster)
+
+    def __getitem__(self, position):
+        return self._roster.deputy(position)
+
+
+class CompactRoster:
+    """
+    Memory-compact, read-only roster for large files and batch runs.
+
+    Handles and user IDs are dictionary-encoded: each distinct string is
+    interned and stored once, and the entries are parallel ``array('I')``
+    columns of codes into that table. SlackUser objects are only built when
+    an entry is accessed, so a roster costs a few bytes per entry plus its
+    distinct names. Behaves as a sequence of goalies, like ``Roster.users``.
+    """
+
+    __slots__ = (
+        "mode",
+        "current_index",
+        "_strings",
+        "_codes",
+        "_handles",
+        "_user_ids",
+        "_deputy_handles",
+        "_deputy_ids",
+    )
+
+    def __init__(self, mode="next_as_deputy"):
+        self.mode = mode
+        self.current_index = -1
+        self._strings = []
+        self._codes = {}
+        self._handles = array("I")
+        self._user_ids = array("I")
+        self._deputy_handles = array("I")
+        self._deputy_ids = array("I")
+
+    @classmethod
+    def load(cls, file_path, mode="next_as_deputy"):
+        """Parse a rotation file line by line without keeping its text."""
+        roster = cls(mode=mode)
+        recover_interrupted_patch(file_path)
+        with open(file_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith("#") or not line:
+                    continue
+                if mode == "fixed_full":
+                    goalie, deputy, is_current_goalie = parse_fixed_full_line(line)
+                else:
+                    goalie, deputy = parse_goalie_line(line), None
+                    is_current_goalie = "**" in line
+                if is_current_goalie:
+                    roster.current_index = len(roster)
+                roster.append(goalie, deputy)
+        return roster
+
+    @classmethod
+    def from_roster(cls, roster):
+        """Build a compact copy of a Roster."""
+        compact = cls(mode=roster.mode)
+        deputies = roster.deputies or [None] * len(roster.users)
+        for goalie, deputy in zip(roster.users, deputies):
+            compact.append(goalie, deputy)
+        compact.current_index = roster.current_index
+        return compact
+
+    def _code(self, value):
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self._strings)
+            value = sys.intern(value)
+            self._strings.append(value)
+            self._codes[value] = code
+        return code
+
+    def append(self, goalie, deputy=None):
+        self._handles.append(self._code(goalie.handle))
+        self._user_ids.append(self._code(goalie.user_id))
+        if deputy is None:
+            self._deputy_handles.append(NO_DEPUTY)
+            self._deputy_ids.append(NO_DEPUTY)
+        else:
+            self._deputy_handles.append(self._code(deputy.handle))
+            self._deputy_ids.append(self._code(deputy.user_id))
+
+    def __len__(self):
+        return len(self._handles)
+
+    def __getitem__(self, position):
+        strings = self._strings
+        return SlackUser(
+            strings[self._handles[position]], strings[self._user_ids[position]]
+        )
+
+    def __iter__(self):
+        for position in range(len(self)):
+            yield self[position]
+
+    def deputy(self, position):
+        handle = self._deputy_handles[position]
+        if handle == NO_DEPUTY:
+            return None
+        return SlackUser(
+            self._strings[handle], self._strings[self._deputy_ids[position]]
+        )
+
+    @property
+    def deputies(self):
+        return _DeputyColumn(self) if self.mode == "fixed_full" else None
+
+    @property
+    def current_goalie(self):
+        if self.current_index < 0:
+            return None
+        return self[self.current_index]
+
+    def next_goalie_and_deputy(self, available=None):
+        return next_goalie_and_deputy(
+            self, self.current_index, self.mode, self.deputies, available
+        )
+
+    def upcoming_goalie(self, available=None):
+        return goalie_after_next(self, self.current_index, available)
@@ -0,0 +1,249 @@
+import mmap
+import os
+import shutil
+import struct
+
+from .compact import NO_DEPUTY, _DeputyColumn
+from .models import MODES, SlackUser
+from .patching import atomic_write, recover_interrupted_patch
+from .roster import (
+    Roster,
+    goalie_after_next,
+    next_goalie_and_deputy,
+    next_goalie_position,
+)
+
+MAGIC = b"GOALIEBR"
+VERSION = 1
+
+# magic, version, mode, current index, entry/string/line counts, then the
+# offsets of the record table, string index, line table and string blob.
+HEADER = struct.Struct("<8sHHiIIIQQQQ")
+CURRENT_INDEX_OFFSET = 12
+# goalie handle, goalie user ID, deputy handle, deputy user ID (codes into
+# the string table) and the line the entry was read from.
+RECORD = struct.Struct("<IIIII")
+STRING_SLOT = struct.Struct("<QI")
+LINE_SLOT = struct.Struct("<I")
+
+
+def is_compiled(file_path):
+    """Whether ``file_path`` holds a compiled roster rather than text."""
+    with open(file_path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def _layout_matches(compiled_mode, mode):
+    # Only fixed_full lines pair a deputy with each goalie, so the other
+    # modes can share one compiled file.
+    return (compiled_mode == "fixed_full") == (mode == "fixed_full")
+
+
+def compile_roster(roster):
+    """
+    Encode a Roster as bytes: a header, a fixed-width record per entry, and
+    an interned string table holding the names, user IDs and every original
+    line of the file, so the text can be rebuilt exactly.
+    """
+    strings, codes = [], {}
+
+    def code(value):
+        if value not in codes:
+            codes[value] = len(strings)
+            strings.append(value)
+        return codes[value]
+
+    records = bytearray()
+    deputies = roster.deputies or [None] * len(roster.users)
+    for goalie, deputy, line_index in zip(roster.users, deputies, roster.line_indexes):
+        deputy_codes = (
+            (NO_DEPUTY, NO_DEPUTY)
+            if deputy is None
+            else (code(deputy.handle), code(deputy.user_id))
+        )
+        records += RECORD.pack(
+            code(goalie.handle), code(goalie.user_id), *deputy_codes, line_index
+        )
+    lines = b"".join(LINE_SLOT.pack(code(line)) for line in roster.lines)
+
+    index, blob = bytearray(), bytearray()
+    for value in strings:
+        encoded = value.encode("utf-8")
+        index += STRING_SLOT.pack(len(blob), len(encoded))
+        blob += encoded
+
+    records_offset = HEADER.size
+    strings_offset = records_offset + len(records)
+    lines_offset = strings_offset + len(index)
+    blob_offset = lines_offset + len(lines)
+    header = HEADER.pack(
+        MAGIC,
+        VERSION,
+        MODES.index(roster.mode),
+        roster.current_index,
+        len(roster.users),
+        len(strings),
+        len(roster.lines),
+        records_offset,
+        strings_offset,
+        lines_offset,
+        blob_offset,
+    )
+    return b"".join((header, records, index, lines, blob))
+
+
+def compile_file(file_path, output_path, mode="next_as_deputy"):
+    """Compile the text roster at ``file_path`` into ``output_path``."""
+    recover_interrupted_patch(file_path)
+    # Line endings are kept as they are, so decompiling gives the same bytes.
+    with open(file_path, "r", encoding="utf-8", newline="") as f:
+        roster = Roster(f.readlines(), mode=mode)
+    atomic_write(output_path, [compile_roster(roster)])
+    return roster
+
+
+class CompiledRoster:
+    """
+    A compiled roster read through mmap.
+
+    Entries are fixed-width records, so any entry, and with the current
+    index in the header the current goalie, next goalie and deputy, is
+    found by offset arithmetic without parsing. Rotating rewrites only the
+    current index in the header. Behaves as a sequence of goalies and
+    offers the same rotate/save interface as Roster.
+    """
+
+    def __init__(self, file_path, mode=None):
+        self.file_path = file_path
+        with open(file_path, "rb") as f:
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (
+            magic,
+            version,
+            mode_code,
+            self.current_index,
+            self._count,
+            self._string_count,
+            self._line_count,
+            self._records_offset,
+            self._strings_offset,
+            self._lines_offset,
+            self._blob_offset,
+        ) = HEADER.unpack_from(self._buffer)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{file_path} is not a compiled roster (version 1)")
+        self.compiled_mode = MODES[mode_code]
+        self.mode = mode or self.compiled_mode
+        if not _layout_matches(self.compiled_mode, self.mode):
+            self.close()
+            raise ValueError(
+                f"{file_path} was compiled for mode {self.compiled_mode}, "
+                f"not {self.mode}"
+            )
+        self._pending = None
+
+    def close(self):
+        self._buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _string(self, code):
+        offset, length = STRING_SLOT.unpack_from(
+            self._buffer, self._strings_offset + code * STRING_SLOT.size
+        )
+        start = self._blob_offset + offset
+        end = start + length
+        return self._buffer[start:end].decode("utf-8")
+
+    def _record(self, position):
+        if not 0 <= position < self._count:
+            raise IndexError(position)
+        return RECORD.unpack_from(
+            self._buffer, self._records_offset + position * RECORD.size
+        )
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, position):
+        handle, user_id = self._record(position)[:2]
+        return SlackUser(self._string(handle), self._string(user_id))
+
+    def __iter__(self):
+        for position in range(len(self)):
+            yield self[position]
+
+    def deputy(self, position):
+        handle, user_id = self._record(position)[2:4]
+        if handle == NO_DEPUTY:
+            return None
+        return SlackUser(self._string(handle), self._string(user_id))
+
+    @property
+    def deputies(self):
+        return _DeputyColumn(self) if self.mode == "fixed_full" else None
+
+    @property
+    def current_goalie(self):
+        if self.current_index < 0:
+            return None
+        return self[self.current_index]
+
+    def next_goalie_and_deputy(self, available=None):
+        return next_goalie_and_deputy(
+            self, self.current_index, self.mode, self.deputies, available
+        )
+
+    def upcoming_goalie(self, available=None):
+        return goalie_after_next(self, self.current_index, available)
+
+    def rotate(self, available=None):
+        """Advance the current index to the next (available) entry; written out by save()."""
+        next_goalie, next_deputy = self.next_goalie_and_deputy(available)
+        self._pending = next_goalie_position(self, self.current_index, available)
+        return next_goalie, next_deputy
+
+    def save(self, file_path):
+        """Write the rotation by patching the header's current index."""
+        if self._pending is None:
+            return
+        if os.path.abspath(file_path) != os.path.abspath(self.file_path):
+            shutil.copyfile(self.file_path, file_path)
+        # Unlike text rosters, this is not replaced through atomic_write: that
+        # would copy the whole file to change 4 bytes. The index is an aligned
+        # 4-byte word in the first sector, and disks write a sector whole, so
+        # a crash leaves it old or new rather than torn. Readers that have
+        # the file mapped also see the new index.
+        with open(file_path, "r+b") as f:
+            f.seek(CURRENT_INDEX_OFFSET)
+            f.write(struct.pack("<i", self._pending))
+            f.flush()
+            os.fsync(f.fileno())
+        self.current_index = self._pending
+        self._pending = None
+
+    def lines(self):
+        """The lines of the text roster the file was compiled from."""
+        codes = struct.unpack_from(
+            f"<{self._line_count}I", self._buffer, self._lines_offset
+        )
+        return [self._string(code) for code in codes]
+
+    def to_roster(self):
+        """
+        The text roster as it stands now. Unrotated, this is the original
+        file byte for byte; after rotations the marker lines are re-rendered
+        the way update_goalie_file writes them.
+        """
+        roster = Roster(self.lines(), mode=self.compiled_mode)
+        if 0 <= self.current_index != roster.current_index:
+            roster.mark(self.current_index)
+        return roster
+
+    def dumps(self):
+        return self.to_roster().dumps()
@@ -1,184 +1,344 @@
+import io
+import mmap
+import os
+
+from goaliebot.telemetry.logs import get_logger
+
+from .compiled import CompiledRoster, is_compiled
 from .parser import parse_goalie_line, parse_fixed_full_line
+from .patching import (
+    digest_file,
+    file_digest,
+    file_version,
+    patch_file,
+    recover_interrupted_patch,
+)
+from .roster import (
+    Roster,
+    goalie_after_next,
+    next_goalie_and_deputy,
+    render_entry,
+)
+
+# Rosters at least this large are rotated with StreamingRoster.
+STREAMING_THRESHOLD_BYTES = 16 * 1024 * 1024
 
 
 def get_goalie_and_users(file_path, mode="next_as_deputy"):
-    current_goalie = None
-    current_goalie_index = -1
-    users = []
-
-    with open(file_path, "r") as f:
-        for line_index, line in enumerate(f):
-            line = line.strip()
-            if line.startswith("#") or not line:
-                continue
-
-            if mode == "fixed_full":
-                goalie, _, is_current_goalie = parse_fixed_full_line(line)
-                if is_current_goalie:
-                    current_goalie = goalie
-                    current_goalie_index = len(users)  # Index in the users list
-                users.append(goalie)
-            else:
-                user = parse_goalie_line(line)
-                if "**" in line:
-                    current_goalie = user
-                    current_goalie_index = len(users)  # Index in the users list
-                users.append(user)
-
-    return current_goalie, users, current_goalie_index
+    roster = Roster.load(file_path, mode=mode)
+    return roster.current_goalie, roster.users, roster.current_index
 
 
 def get_next_goalie_and_deputy(
-    file_path, users, current_goalie, current_goalie_index, mode="next_as_deputy"
-):
-    """Rotate to next goalie and determine deputy based on mode."""
-    if current_goalie_index < 0:
-        raise ValueError("Current goalie index not found")
-
-    next_index = (current_goalie_index + 1) % len(users)
-    next_goalie = users[next_index]
-
-    if mode == "no_deputy":
-        return next_goalie, None
-    elif mode == "former_goalie_is_deputy":
-        return next_goalie, current_goalie
-    elif mode == "next_as_deputy":
-        deputy_index = (next_index + 1) % len(users)
-        return next_goalie, users[deputy_index]
-    elif mode == "fixed_full":
-        # Re-parse the file to find the deputy line for the new goalie
-        with open(file_path, "r") as f:
-            for line in f:
-                line = line.strip()
-                if line.startswith("#") or not line:
-                    continue
-                if line.startswith(next_goalie.handle):
-                    _, deputy, _ = parse_fixed_full_line(line)
-                    return next_goalie, deputy
-        return next_goalie, None
-    else:
-        raise ValueError(f"Unknown mode: {mode}")
-
-
-def _find_current_goalie_index(lines):
-    """Find the index of the line containing the current goalie (marked with **)."""
-    for i, line in enumerate(lines):
-        if "**" in line.strip():
-            return i
-    return -1
-
-
-def _find_target_line_index(lines, current_goalie_index, next_goalie_handle):
-    """Find the index of the next line to mark with ** for the next goalie."""
-    if current_goalie_index < 0:
-        return -1
-
-    # Search after current goalie first
-    for i in range(current_goalie_index + 1, len(lines)):
-        if _line_matches_goalie(lines[i], next_goalie_handle):
-            return i
-
-    # If not found, wrap around to beginning
-    for i in range(0, current_goalie_index):
-        if _line_matches_goalie(lines[i], next_goalie_handle):
-            return i
-
-    return -1
-
-
-def _line_matches_goalie(line, goalie_handle):
-    """Check if a line matches the given goalie handle."""
-    line = line.strip()
-    if not line or line.startswith("#"):
-        return False
-
-    parts = [p.strip() for p in line.split("|")]
-    if len(parts) == 0:
-        return False
-
-    goalie_info = parts[0].replace("**", "").strip()
-    if not goalie_info:
-        return False
-
-    current_handle = goalie_info.split(",")[0].strip()
-    return current_handle == goalie_handle
-
-
-def _process_fixed_full_line(
-    line, line_index, target_line_index, next_goalie, deputy, goalie_marked
+    file_path,
+    users,
+    current_goalie,
+    current_goalie_index,
+    mode="next_as_deputy",
+    available=None,
 ):
-    """Process a single line for fixed_full mode."""
-    parts = [p.strip() for p in line.split("|")]
-    goalie_info = parts[0].replace("**", "").strip()
-    deputy_info = parts[1].strip() if len(parts) > 1 else ""
-
-    goalie_handle, goalie_id = map(str.strip, goalie_info.split(","))
-
-    should_mark = line_index == target_line_index and not goalie_marked
-
-    if should_mark:
-        goalie_info = f"{goalie_handle} **, {goalie_id}"
-        deputy_info = f"{deputy.handle}, {deputy.user_id}" if deputy else deputy_info
-        goalie_marked = True
-    else:
-        goalie_info = f"{goalie_handle}, {goalie_id}"
-
-    return f"{goalie_info} | {deputy_info}", goalie_marked
-
-
-def _process_standard_line(line, next_goalie, goalie_marked):
-    """Process a single line for standard modes (not fixed_full)."""
-    handle, user_id = map(str.strip, line.replace("**", "").split(","))
-    is_goalie = handle == next_goalie.handle and user_id == next_goalie.user_id
-
-    if is_goalie and not goalie_marked:
-        updated_line = f"{handle} **, {user_id}"
-        goalie_marked = True
-    else:
-        updated_line = f"{handle}, {user_id}"
-
-    return updated_line, goalie_marked
+    """
+    Rotate to next goalie and determine deputy based on mode, skipping
+    people the ``available`` predicate rejects.
+    """
+    deputies = None
+    if mode == "fixed_full" and current_goalie_index >= 0:
+        # Deputies are paired per line, so they come from the file itself.
+        deputies = Roster.load(file_path, mode=mode).deputies
+    return next_goalie_and_deputy(
+        users, current_goalie_index, mode, deputies, available
+    )
+
+
+def _report_update(next_goalie, deputy):
+    get_logger().info(
+        "roster_updated",
+        f"✅ Goalie file updated: Goalie = {next_goalie.handle}, Deputy = {deputy.handle if deputy else 'None'}",
+    )
 
 
 def update_goalie_file(file_path, next_goalie, deputy=None, mode="next_as_deputy"):
     """Update the goalie file to mark the next goalie and deputy."""
     try:
-        with open(file_path, "r") as f:
-            lines = f.readlines()
-
-        target_line_index = -1
-        if mode == "fixed_full":
-            current_goalie_index = _find_current_goalie_index(lines)
-            target_line_index = _find_target_line_index(
-                lines, current_goalie_index, next_goalie.handle
-            )
-
-        updated_lines = []
-        goalie_marked = False
-
-        for i, line in enumerate(lines):
-            original = line.strip()
-            if not original:
-                updated_lines.append("")
-                continue
-
-            if mode == "fixed_full":
-                updated_line, goalie_marked = _process_fixed_full_line(
-                    original, i, target_line_index, next_goalie, deputy, goalie_marked
-                )
-            else:
-                updated_line, goalie_marked = _process_standard_line(
-                    original, next_goalie, goalie_marked
-                )
+        roster = Roster.load(file_path, mode=mode)
+        position = roster.find_next_position(
+            next_goalie, match_user_id=mode != "fixed_full"
+        )
+        if position < 0:
+            raise ValueError(f"{next_goalie.handle} is not in the roster")
 
-            updated_lines.append(updated_line)
+        roster.mark(position, deputy)
+        roster.save(file_path)
+        _report_update(next_goalie, deputy)
 
-        with open(file_path, "w") as f:
-            f.writelines(f"{line}\n" for line in updated_lines)
+    except Exception as e:
+        get_logger().error("roster_not_written", f"❌ Error updating goalie file: {e}")
+
+
+def write_rotated_roster(roster, file_path, available=None):
+    """
+    Advance an already loaded roster to the next goalie and write it back.
+    A failed write, including FileChangedError, is raised to the caller.
+    """
+    next_goalie, deputy = roster.rotate(available)
+    roster.save(file_path)
+    _report_update(next_goalie, deputy)
+
+
+def _iter_entry_spans(buffer):
+    """
+    Yield ``(start, end, line)`` for each roster entry in ``buffer``, where
+    ``line`` is the stripped entry and ``start``/``end`` are the byte offsets
+    of the whole line including its newline. Comments and blanks are skipped.
+    """
+    size = len(buffer)
+    start = 0
+    while start < size:
+        newline = buffer.find(b"\n", start)
+        end = size if newline < 0 else newline + 1
+        line = buffer[start:end].strip()
+        if line and not line.startswith(b"#"):
+            yield start, end, line
+        start = end
+
+
+class _SparseEntries:
+    """The few entries a StreamingRoster keeps, indexed by roster position."""
+
+    def __init__(self, count, entries):
+        self.count = count
+        self.entries = entries
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, position):
+        return self.entries[position]
+
+
+class StreamingRoster:
+    """
+    Rotates a roster without holding it in memory.
+
+    One mmap-backed pass over the file keeps only the first two entries (for
+    wraparound), the current goalie and the two entries after it, so peak
+    memory does not depend on the roster size. Saving patches just the
+    changed lines with patch_file, in place when their length is unchanged,
+    failing with FileChangedError if the file was modified since it was
+    scanned. Offers the same rotate/save interface as Roster.
+    """
+
+    def __init__(self, file_path, mode="next_as_deputy"):
+        self.file_path = file_path
+        self.mode = mode
+        self.current_index = -1
+        self._count = 0
+        self._spans = {}
+        self._marked_spans = []
+        self._pending = None
+        self._digest = None
+        self._version = None
+        # The bytes of each kept line as scanned, by offset.
+        self._raw = {}
+        self._scan()
+
+    def _is_marked(self, line):
+        goalie_part = line.split(b"|", 1)[0] if self.mode == "fixed_full" else line
+        return b"**" in goalie_part
+
+    def _keep(self, buffer, span):
+        start, end, _ = span
+        self._raw[start] = bytes(buffer[start:end])
+        return span
+
+    def _scan(self):
+        recover_interrupted_patch(self.file_path)
+        with open(self.file_path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            self._version = file_version(stat)
+            if stat.st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                self._digest = file_digest(buffer)
+                for position, span in enumerate(_iter_entry_spans(buffer)):
+                    if position < 2:
+                        self._spans[position] = self._keep(buffer, span)
+                    if self._is_marked(span[2]):
+                        # The last marked line wins, as with Roster.
+                        self._spans = {p: s for p, s in self._spans.items() if p < 2}
+                        self._spans[position] = self._keep(buffer, span)
+                        self.current_index = position
+                        self._marked_spans.append(span)
+                    elif 0 <= self.current_index < position <= self.current_index + 2:
+                        self._spans[position] = self._keep(buffer, span)
+                    self._count = position + 1
+
+    def _parse(self, position):
+        return self._parse_line(self._spans[position][2])
+
+    def close(self):
+        """Nothing to release: the file is only mapped while scanning or saving."""
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def current_goalie(self):
+        if self.current_index < 0:
+            return None
+        return self._parse(self.current_index)[0]
+
+    def _entries(self, available):
+        if available is not None:
+            raise ValueError(
+                "Availability needs the whole roster; it cannot be streamed"
+            )
+        parsed = {position: self._parse(position) for position in self._spans}
+        users = _SparseEntries(self._count, {p: e[0] for p, e in parsed.items()})
+        deputies = _SparseEntries(self._count, {p: e[1] for p, e in parsed.items()})
+        return users, deputies
+
+    def next_goalie_and_deputy(self, available=None):
+        users, deputies = self._entries(available)
+        return next_goalie_and_deputy(
+            users,
+            self.current_index,
+            self.mode,
+            deputies if self.mode == "fixed_full" else None,
+        )
 
-        print(
-            f"✅ Goalie file updated: Goalie = {next_goalie.handle}, Deputy = {deputy.handle if deputy else 'None'}"
+    def upcoming_goalie(self, available=None):
+        # The two entries after the current one are kept, so the goalie
+        # after next is always at hand.
+        users, _ = self._entries(available)
+        return goalie_after_next(users, self.current_index)
+
+    def rotate(self, available=None):
+        """Advance the marker by one entry; written out by save()."""
+        next_goalie, next_deputy = self.next_goalie_and_deputy(available)
+        self._pending = (self.current_index + 1) % self._count
+        return next_goalie, next_deputy
+
+    def _replacements(self):
+        target = self._spans[self._pending]
+        rewrites = {}
+        for start, end, line in self._marked_spans + [target]:
+            goalie, deputy = self._parse_line(line)
+            is_current = start == target[0]
+            rewrites[start] = (end, render_entry(goalie, deputy, is_current))
+        return sorted(rewrites.items())
+
+    def _parse_line(self, line):
+        line = line.decode("utf-8")
+        if self.mode == "fixed_full":
+            goalie, deputy, _ = parse_fixed_full_line(line)
+            return goalie, deputy
+        return parse_goalie_line(line), None
+
+    def save(self, file_path):
+        if self._pending is None:
+            return
+        patches, originals = [], []
+        for start, (end, text) in self._replacements():
+            original = self._raw[start]
+            content_length = len(original.rstrip(b"\r\n"))
+            ending = original[content_length:]
+            patches.append((start, end, text.encode("utf-8") + ending))
+            originals.append(original)
+        patch_file(
+            file_path,
+            patches,
+            source_path=self.file_path,
+            expected_digest=self._digest,
+            expected_version=self._version,
+            originals=originals,
         )
 
-    except Exception as e:
-        print(f"❌ Error updating goalie file: {e}")
+
+def load_roster(file_path, mode="next_as_deputy", stream=True):
+    """
+    Load a roster for rotation: compiled rosters are read through mmap and,
+    unless ``stream`` is false, very large text rosters are streamed. Close
+    the roster once it is saved.
+    """
+    if is_compiled(file_path):
+        return CompiledRoster(file_path, mode=mode)
+    if stream and os.path.getsize(file_path) >= STREAMING_THRESHOLD_BYTES:
+        return StreamingRoster(file_path, mode=mode)
+    return Roster.load(file_path, mode=mode)
+
+
+class RosterCache:
+    """
+    Rosters kept loaded between rotations by a long-running process.
+
+    A roster is parsed again only when its file's content changes. An
+    unchanged modification time and size is taken at face value; otherwise
+    the file is hashed and compared with what was parsed. Rotations this
+    process writes itself are recorded with ``remember``, so they do not
+    cost a re-parse either. Compiled rosters, which need no parsing, and
+    rosters large enough to be streamed are not cached.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self.parses = 0
+
+    def load(self, file_path, mode="next_as_deputy", stream=True):
+        if is_compiled(file_path):
+            return CompiledRoster(file_path, mode=mode)
+        recover_interrupted_patch(file_path)
+        key = os.path.abspath(file_path)
+        info = os.stat(file_path)
+        stat = file_version(info)
+        entry = self._entries.get(key)
+        if entry and entry["mode"] != mode:
+            entry = None
+        if entry and entry["stat"] == stat:
+            return entry["roster"]
+
+        # Streamed rosters are read lazily, so nothing is hashed up front.
+        if stream and info.st_size >= STREAMING_THRESHOLD_BYTES:
+            self._entries.pop(key, None)
+            return StreamingRoster(file_path, mode=mode)
+        if entry and entry["digest"] == digest_file(file_path):
+            entry["stat"] = stat
+            return entry["roster"]
+
+        self._entries.pop(key, None)
+        self.parses += 1
+        with open(file_path, "rb") as f:
+            data = f.read()
+        digest = file_digest(data)
+        # Split like Roster.load does, keeping line endings.
+        lines = io.StringIO(data.decode("utf-8"), newline="").readlines()
+        roster = Roster(lines, mode=mode, source_path=file_path, source_version=stat)
+        self._entries[key] = {
+            "mode": mode,
+            "stat": stat,
+            "digest": digest,
+            "roster": roster,
+        }
+        return roster
+
+    def remember(self, file_path, roster):
+        """
+        Record that ``roster`` was just written to ``file_path``. If the file
+        does not hold what the roster renders, say because the write failed,
+        the entry is dropped and the next load parses the file again.
+        """
+        key = os.path.abspath(file_path)
+        entry = self._entries.get(key)
+        if entry is None or entry["roster"] is not roster:
+            return
+        with open(file_path, "rb") as f:
+            data = f.read()
+        if data != roster.dumps().encode("utf-8"):
+            del self._entries[key]
+            return
+        entry["stat"] = _stat_key(file_path)
+        entry["digest"] = file_digest(data)
+
+
+def _stat_key(file_path):
+    return file_version(os.stat(file_path))
@@ -0,0 +1,154 @@
+import argparse
+import os
+from dataclasses import dataclass, field
+from datetime import date, datetime, time
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    import tomli as tomllib
+
+from .models import MODES, Cadence
+from .parser import parse_commands
+from .triggers import load_zone
+
+ROTATION_KEYS = {
+    "name",
+    "file",
+    "mode",
+    "cadence",
+    "channels",
+    "user_group_handle",
+    "commands",
+    "anchor",
+    "timezone",
+    "at",
+    "availability",
+    "template",
+}
+
+
+@dataclass(frozen=True)
+class RotationSpec:
+    """One roster listed in a batch manifest."""
+
+    name: str
+    file_path: str
+    mode: str = "next_as_deputy"
+    cadence: Cadence = Cadence.WEEK
+    channels: list = field(default_factory=list)
+    user_group_handle: str = None
+    commands: list = None
+    anchor: date = None
+    timezone: str = None
+    at: time = None
+    availability: str = None
+    template: str = None
+
+
+def _parse_channels(value):
+    if isinstance(value, str):
+        return value.replace(",", " ").split()
+    return [str(channel).strip() for channel in value or []]
+
+
+def _parse_commands(value, position):
+    if isinstance(value, (list, tuple)):
+        value = "|".join(value)
+    try:
+        return parse_commands(value) if value else None
+    except argparse.ArgumentTypeError as e:
+        raise ValueError(f"Rotation #{position}: {e}")
+
+
+def _parse_anchor(value, position):
+    """Start date of the current goalie's period, as a TOML date or ISO string."""
+    if value is None or (isinstance(value, date) and not isinstance(value, datetime)):
+        return value
+    if isinstance(value, datetime):
+        return value.date()
+    try:
+        return date.fromisoformat(str(value))
+    except ValueError:
+        raise ValueError(f"Rotation #{position}: invalid anchor date {value!r}")
+
+
+def _parse_timezone(value, position):
+    """IANA timezone name used by 'goaliebot serve'; validated here."""
+    if value is None:
+        return None
+    try:
+        load_zone(str(value))
+    except ValueError as e:
+        raise ValueError(f"Rotation #{position}: {e}")
+    return str(value)
+
+
+def _parse_at(value, position):
+    """Time of day a rotation fires under 'goaliebot serve', as a TOML time or 'HH:MM'."""
+    if value is None or isinstance(value, time):
+        return value
+    try:
+        return datetime.strptime(str(value), "%H:%M").time()
+    except ValueError:
+        raise ValueError(f"Rotation #{position}: invalid time of day {value!r}")
+
+
+def _resolve_path(value, base_dir):
+    if not value:
+        return None
+    return os.path.join(base_dir, os.path.expanduser(value))
+
+
+def _build_spec(entry, defaults, base_dir, position):
+    settings = {**defaults, **entry}
+    unknown = set(settings) - ROTATION_KEYS
+    if unknown:
+        raise ValueError(
+            f"Rotation #{position}: unknown keys {', '.join(sorted(unknown))}"
+        )
+    if not settings.get("file"):
+        raise ValueError(f"Rotation #{position}: 'file' is required")
+
+    mode = settings.get("mode", "next_as_deputy")
+    if mode not in MODES:
+        raise ValueError(f"Rotation #{position}: unknown mode {mode!r}")
+
+    file_path = os.path.join(base_dir, os.path.expanduser(settings["file"]))
+    return RotationSpec(
+        name=settings.get("name") or os.path.splitext(os.path.basename(file_path))[0],
+        file_path=file_path,
+        mode=mode,
+        cadence=Cadence(settings.get("cadence", "week")),
+        channels=_parse_channels(settings.get("channels")),
+        user_group_handle=settings.get("user_group_handle"),
+        commands=_parse_commands(settings.get("commands"), position),
+        anchor=_parse_anchor(settings.get("anchor"), position),
+        timezone=_parse_timezone(settings.get("timezone"), position),
+        at=_parse_at(settings.get("at"), position),
+        availability=_resolve_path(settings.get("availability"), base_dir),
+        template=_resolve_path(settings.get("template"), base_dir),
+    )
+
+
+def load_manifest(manifest_path):
+    """
+    Load the rotations listed in a TOML manifest.
+
+    The manifest has an optional ``[defaults]`` table and one
+    ``[[rotations]]`` table per roster. Relative ``file``, ``availability``
+    and ``template`` paths are resolved against the manifest's directory.
+    """
+    with open(manifest_path, "rb") as f:
+        data = tomllib.load(f)
+
+    defaults = data.get("defaults", {})
+    entries = data.get("rotations", [])
+    if not entries:
+        raise ValueError("Manifest does not list any [[rotations]]")
+
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    return [
+        _build_spec(entry, defaults, base_dir, position)
+        for position, entry in enumerate(entries, start=1)
+    ]
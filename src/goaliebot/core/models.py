@@ -1,6 +1,8 @@
 from dataclasses import dataclass
 from enum import Enum
 
+MODES = ("next_as_deputy", "former_goalie_is_deputy", "no_deputy", "fixed_full")
+
 
 @dataclass(frozen=True)
 class SlackUser:
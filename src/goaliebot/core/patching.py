@@ -0,0 +1,212 @@
+import hashlib
+import json
+import os
+import tempfile
+
+COPY_CHUNK_BYTES = 1024 * 1024
+
+# Written next to a file while it is patched in place; see patch_file.
+JOURNAL_SUFFIX = ".goaliebot-journal"
+
+
+def _fsync_directory(directory):
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:  # Directories cannot be opened on Windows.
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def atomic_write(file_path, chunks):
+    """
+    Replace ``file_path`` with the concatenated byte ``chunks``: they are
+    written to a temporary file in the same directory, fsynced and renamed
+    over the original, so readers see either the old or the new content.
+    """
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            for chunk in chunks:
+                out.write(chunk)
+            out.flush()
+            os.fsync(out.fileno())
+        if os.path.exists(file_path):
+            os.chmod(tmp_path, os.stat(file_path).st_mode & 0o7777)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    _fsync_directory(directory)
+
+
+class FileChangedError(Exception):
+    """A file no longer holds the content a patch was computed from."""
+
+
+def file_digest(data):
+    """SHA-256 of ``data``, as compared by patch_file's ``expected_digest``."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def digest_file(file_path):
+    """file_digest of the file at ``file_path``, read in chunks."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(COPY_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_version(stat):
+    """``(mtime_ns, size)`` of an ``os.stat`` result, as compared by patch_file."""
+    return stat.st_mtime_ns, stat.st_size
+
+
+def journal_path(file_path):
+    return file_path + JOURNAL_SUFFIX
+
+
+def _changed(file_path):
+    return FileChangedError(
+        f"{file_path} changed on disk since it was read; not overwriting it"
+    )
+
+
+def _read_range(f, start, end, digest=None):
+    f.seek(start)
+    for offset in range(start, end, COPY_CHUNK_BYTES):
+        chunk = f.read(min(COPY_CHUNK_BYTES, end - offset))
+        if digest is not None:
+            digest.update(chunk)
+        yield chunk
+
+
+def _patched_chunks(f, patches, size, file_path, expected_digest):
+    digest = hashlib.sha256()
+    copied = 0
+    for start, end, data in patches:
+        yield from _read_range(f, copied, start, digest)
+        # The replaced bytes are read too, so the whole source is hashed.
+        for _ in _read_range(f, start, end, digest):
+            pass
+        yield data
+        copied = end
+    yield from _read_range(f, copied, size, digest)
+    if expected_digest is not None and digest.hexdigest() != expected_digest:
+        raise _changed(file_path)
+
+
+def _write_span(f, offset, data):
+    f.seek(offset)
+    f.write(data)
+    f.flush()
+    os.fsync(f.fileno())
+
+
+def _finish_journal(file_path):
+    os.unlink(journal_path(file_path))
+    _fsync_directory(os.path.dirname(os.path.abspath(file_path)))
+
+
+def recover_interrupted_patch(file_path):
+    """
+    Finish an in-place patch of ``file_path`` that was interrupted, say by
+    a crash, if its journal is still there. Returns whether one was found.
+    Raises FileChangedError, keeping the journal, if the span holds bytes
+    that are neither the old nor the new content.
+    """
+    try:
+        with open(journal_path(file_path), "r") as f:
+            entry = json.load(f)
+    except FileNotFoundError:
+        return False
+    offset = entry["offset"]
+    old, new = bytes.fromhex(entry["old"]), bytes.fromhex(entry["new"])
+    with open(file_path, "r+b") as f:
+        f.seek(offset)
+        current = f.read(len(new))
+        if current != new:
+            torn = len(current) == len(new) and all(
+                byte in (old[i], new[i]) for i, byte in enumerate(current)
+            )
+            if not torn:
+                raise _changed(file_path)
+            _write_span(f, offset, new)
+    _finish_journal(file_path)
+    return True
+
+
+def _patch_in_place(file_path, patches, expected_version, originals):
+    first, last = patches[0][0], patches[-1][1]
+    with open(file_path, "r+b") as f:
+        if expected_version is not None and (
+            file_version(os.fstat(f.fileno())) != expected_version
+        ):
+            raise _changed(file_path)
+        old = b"".join(_read_range(f, first, last))
+        span = bytearray(old)
+        for index, (start, end, data) in reversed(list(enumerate(patches))):
+            start, end = start - first, end - first
+            if originals is not None and span[start:end] != originals[index]:
+                raise _changed(file_path)
+            span[start:end] = data
+        # The journal is durable before the file is touched, so a write cut
+        # short is completed by recover_interrupted_patch.
+        journal = {"offset": first, "old": old.hex(), "new": span.hex()}
+        atomic_write(journal_path(file_path), [json.dumps(journal).encode("ascii")])
+        _write_span(f, first, span)
+    _finish_journal(file_path)
+
+
+def patch_file(
+    file_path,
+    patches,
+    source_path=None,
+    expected_digest=None,
+    expected_version=None,
+    originals=None,
+):
+    """
+    Replace byte ranges of a file. ``patches`` are sorted, non-overlapping
+    ``(start, end, data)`` ranges of ``source_path`` (by default the file
+    itself).
+
+    When the patches leave the file's length unchanged and span at most
+    ``COPY_CHUNK_BYTES``, that span is rewritten in place, so the I/O
+    scales with the change rather than the file; a rotation usually
+    touches two neighbouring lines. The old and new span are first saved
+    to a journal next to the file, so a write cut short is completed by
+    recover_interrupted_patch, which loading a roster runs. The file must
+    still have the ``expected_version`` (see file_version) and each range
+    still hold its ``originals`` entry, else FileChangedError is raised and
+    nothing is written.
+
+    Otherwise the source is streamed into a patched copy that atomically
+    replaces ``file_path``. With an ``expected_digest`` (see file_digest),
+    the source is hashed on the way and FileChangedError raised, leaving
+    ``file_path`` untouched, if it no longer holds the content the patches
+    were computed from.
+    """
+    if not patches:
+        return
+    recover_interrupted_patch(file_path)
+    source_path = source_path or file_path
+    first, last = patches[0][0], patches[-1][1]
+    same_file = os.path.abspath(source_path) == os.path.abspath(file_path)
+    growth = sum(len(data) - (end - start) for start, end, data in patches)
+    in_place = same_file and growth == 0 and last - first <= COPY_CHUNK_BYTES
+    # A digest can only be checked by reading the whole file.
+    if in_place and (expected_digest is None or expected_version is not None):
+        _patch_in_place(file_path, patches, expected_version, originals)
+        return
+
+    with open(source_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        atomic_write(
+            file_path,
+            _patched_chunks(f, patches, size, source_path, expected_digest),
+        )
@@ -0,0 +1,306 @@
+import os
+from bisect import bisect_right, insort
+
+from .parser import parse_goalie_line, parse_fixed_full_line
+from .patching import (
+    FileChangedError,
+    atomic_write,
+    file_digest,
+    file_version,
+    patch_file,
+    recover_interrupted_patch,
+)
+
+
+def _next_available(column, start, available, exclude=None):
+    """
+    First position from ``start`` on, wrapping around, whose entry is
+    available and is not ``exclude``. Returns -1 if there is none.
+    """
+    for step in range(len(column)):
+        position = (start + step) % len(column)
+        entry = column[position]
+        if entry != exclude and available(entry):
+            return position
+    return -1
+
+
+def next_goalie_position(users, current_index, available=None):
+    """
+    Position of the next goalie: the entry after the current one, or with
+    an ``available`` predicate the first available entry after it. If
+    nobody is available the plain next entry is used.
+    """
+    if current_index < 0:
+        raise ValueError("Current goalie index not found")
+
+    next_index = (current_index + 1) % len(users)
+    if available is not None:
+        position = _next_available(users, next_index, available)
+        if position >= 0:
+            return position
+    return next_index
+
+
+def next_goalie_and_deputy(users, current_index, mode, deputies=None, available=None):
+    """
+    Pick the next goalie and deputy by index arithmetic.
+
+    ``deputies`` holds the paired deputy of each entry and is only needed
+    for ``fixed_full``. With an ``available`` predicate, unavailable people
+    are skipped: the goalie is the first available entry after the current
+    one, and a deputy who is away is replaced by the next available person
+    after them in the same column (the roster, or the paired deputies in
+    ``fixed_full``) who is not the goalie.
+    """
+    next_index = next_goalie_position(users, current_index, available)
+    next_goalie = users[next_index]
+
+    if mode == "no_deputy":
+        return next_goalie, None
+    elif mode == "former_goalie_is_deputy":
+        column, position = users, current_index
+    elif mode == "next_as_deputy":
+        column, position = users, (next_index + 1) % len(users)
+    elif mode == "fixed_full":
+        if not deputies:
+            return next_goalie, None
+        column, position = deputies, next_index
+    else:
+        raise ValueError(f"Unknown mode: {mode}")
+
+    deputy = column[position]
+    if available is not None and not available(deputy):
+        substitute = _next_available(column, position, available, exclude=next_goalie)
+        if substitute >= 0:
+            deputy = column[substitute]
+    return next_goalie, deputy
+
+
+def goalie_after_next(users, current_index, available=None):
+    """
+    The goalie of the period after the coming one, projected by taking the
+    entry after the next goalie.
+    """
+    position = next_goalie_position(users, current_index, available)
+    return users[(position + 1) % len(users)]
+
+
+def render_entry(goalie, deputy=None, is_current=False):
+    """Format a roster entry the way update_goalie_file writes it."""
+    marker = " **" if is_current else ""
+    text = f"{goalie.handle}{marker}, {goalie.user_id}"
+    if deputy is not None:
+        text = f"{text} | {deputy.handle}, {deputy.user_id}"
+    return text
+
+
+def _line_ending(line):
+    content_length = len(line.rstrip("\r\n"))
+    return line[content_length:]
+
+
+class Roster:
+    """
+    A rotation file loaded into memory once.
+
+    Keeps the original lines so unchanged lines (comments, blank lines,
+    spacing) are written back verbatim, plus parallel per-entry columns:
+    ``users`` (the goalie of each entry), ``deputies`` (the paired deputy in
+    ``fixed_full`` mode) and ``line_indexes`` (where each entry lives in
+    ``lines``). ``handle_index`` maps each handle to its entry positions.
+
+    ``source_path`` is the file the lines were read from and
+    ``source_version`` its file_version at the time; saving back to it
+    patches only the lines that changed, and fails with FileChangedError
+    if the file was modified since it was read.
+    """
+
+    def __init__(
+        self, lines, mode="next_as_deputy", source_path=None, source_version=None
+    ):
+        self.lines = lines
+        self.mode = mode
+        self.source_path = source_path
+        self.source_version = source_version
+        self.users = []
+        self.deputies = [] if mode == "fixed_full" else None
+        self.line_indexes = []
+        self.handle_index = {}
+        self.marked = []
+        self.current_index = -1
+        # Lines changed since the roster was read, as they still are on disk.
+        self._saved_lines = {}
+        # Hash of the source file's content, to notice edits made meanwhile.
+        self._source_digest = (
+            file_digest(self.dumps().encode("utf-8")) if source_path else None
+        )
+        self._parse()
+
+    @classmethod
+    def load(cls, file_path, mode="next_as_deputy"):
+        recover_interrupted_patch(file_path)
+        # Line endings are kept so lines map onto the file's bytes.
+        with open(file_path, "r", encoding="utf-8", newline="") as f:
+            version = file_version(os.fstat(f.fileno()))
+            return cls(
+                f.readlines(),
+                mode=mode,
+                source_path=file_path,
+                source_version=version,
+            )
+
+    @classmethod
+    def from_text(cls, text, mode="next_as_deputy"):
+        return cls(text.splitlines(keepends=True), mode=mode)
+
+    def _parse(self):
+        for line_index, raw in enumerate(self.lines):
+            line = raw.strip()
+            if line.startswith("#") or not line:
+                continue
+
+            position = len(self.users)
+            if self.mode == "fixed_full":
+                goalie, deputy, is_current_goalie = parse_fixed_full_line(line)
+                self.deputies.append(deputy)
+            else:
+                goalie = parse_goalie_line(line)
+                is_current_goalie = "**" in line
+
+            if is_current_goalie:
+                self.current_index = position
+                self.marked.append(position)
+            self.users.append(goalie)
+            self.line_indexes.append(line_index)
+            self.handle_index.setdefault(goalie.handle, []).append(position)
+
+    def __len__(self):
+        return len(self.users)
+
+    def close(self):
+        """Nothing to release; every roster load_roster returns can be closed."""
+
+    @property
+    def current_goalie(self):
+        if self.current_index < 0:
+            return None
+        return self.users[self.current_index]
+
+    def next_goalie_and_deputy(self, available=None):
+        return next_goalie_and_deputy(
+            self.users, self.current_index, self.mode, self.deputies, available
+        )
+
+    def upcoming_goalie(self, available=None):
+        return goalie_after_next(self.users, self.current_index, available)
+
+    def find_next_position(self, goalie, match_user_id=True):
+        """
+        Position of the first entry for ``goalie`` after the current one,
+        wrapping around to the start of the roster. Returns -1 if absent.
+        """
+        positions = self.handle_index.get(goalie.handle, [])
+        if match_user_id:
+            positions = [
+                p for p in positions if self.users[p].user_id == goalie.user_id
+            ]
+        if not positions:
+            return -1
+        after = bisect_right(positions, self.current_index)
+        return positions[after] if after < len(positions) else positions[0]
+
+    def rotate(self, available=None):
+        """
+        Advance the current-goalie marker to the next (available) entry.
+        A substitute deputy is returned but not written into the roster.
+        """
+        next_goalie, next_deputy = self.next_goalie_and_deputy(available)
+        self.mark(next_goalie_position(self.users, self.current_index, available))
+        return next_goalie, next_deputy
+
+    def mark(self, position, deputy=None):
+        """Make ``position`` the current goalie, clearing any other marker."""
+        if self.mode == "fixed_full" and deputy is not None:
+            self.deputies[position] = deputy
+
+        for marked in self.marked:
+            if marked != position:
+                self._render(marked, is_current=False)
+        self._render(position, is_current=True)
+        self.marked = [position]
+        self.current_index = position
+
+    def replace(self, position, goalie=None, deputy=None):
+        """Replace an entry's goalie and/or paired deputy, keeping its marker."""
+        if goalie is not None:
+            old = self.users[position]
+            if goalie.handle != old.handle:
+                self.handle_index[old.handle].remove(position)
+                if not self.handle_index[old.handle]:
+                    del self.handle_index[old.handle]
+                insort(self.handle_index.setdefault(goalie.handle, []), position)
+            self.users[position] = goalie
+        if deputy is not None and self.mode == "fixed_full":
+            self.deputies[position] = deputy
+        self._render(position, is_current=position in self.marked)
+
+    def _render(self, position, is_current):
+        line_index = self.line_indexes[position]
+        deputy = self.deputies[position] if self.mode == "fixed_full" else None
+        text = render_entry(self.users[position], deputy, is_current)
+        self._saved_lines.setdefault(line_index, self.lines[line_index])
+        self.lines[line_index] = text + _line_ending(self.lines[line_index])
+
+    def dumps(self):
+        return "".join(self.lines)
+
+    def _patches(self, file_path):
+        """
+        Byte-range patches turning the file as it was read into the roster
+        as it is now, with the bytes each range held, or None if
+        ``file_path`` is not that file.
+        """
+        if self.source_path is None or not os.path.exists(file_path):
+            return None
+        if os.path.abspath(file_path) != os.path.abspath(self.source_path):
+            return None
+        patches, originals, offset = [], [], 0
+        for line_index, line in enumerate(self.lines):
+            saved = self._saved_lines.get(line_index, line).encode("utf-8")
+            if line_index in self._saved_lines:
+                data = line.encode("utf-8")
+                if data != saved:
+                    patches.append((offset, offset + len(saved), data))
+                    originals.append(saved)
+            offset += len(saved)
+        if os.path.getsize(file_path) != offset:
+            raise FileChangedError(
+                f"{file_path} changed on disk since it was read; not overwriting it"
+            )
+        return patches, originals
+
+    def save(self, file_path):
+        """
+        Write the roster to ``file_path``. A new file, or another one, is
+        replaced atomically. Saved back to the file it was read from, only
+        the changed lines are patched, in place when the file's length stays
+        the same (see patch_file), and only if the file still holds what was
+        read; otherwise FileChangedError is raised and nothing is written.
+        """
+        changes = self._patches(file_path)
+        if changes is None:
+            atomic_write(file_path, [self.dumps().encode("utf-8")])
+        else:
+            patches, originals = changes
+            patch_file(
+                file_path,
+                patches,
+                expected_digest=self._source_digest,
+                expected_version=self.source_version,
+                originals=originals,
+            )
+        self.source_path = file_path
+        self.source_version = file_version(os.stat(file_path))
+        self._saved_lines = {}
+        self._source_digest = file_digest(self.dumps().encode("utf-8"))
@@ -0,0 +1,150 @@
+import calendar
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+from .models import Cadence, SlackUser
+from .roster import next_goalie_and_deputy, next_goalie_position
+
+
+@dataclass(frozen=True)
+class Assignment:
+    """Who is on duty for one rotation period; ``end`` is exclusive."""
+
+    period: int
+    start: date
+    end: date
+    goalie: SlackUser
+    deputy: SlackUser = None
+
+
+def _add_months(anchor, months):
+    month_index = anchor.year * 12 + anchor.month - 1 + months
+    year, month = divmod(month_index, 12)
+    day = min(anchor.day, calendar.monthrange(year, month + 1)[1])
+    return date(year, month + 1, day)
+
+
+def period_start(anchor, cadence, period):
+    """First day of ``period`` periods after the one starting on ``anchor``."""
+    cadence = cadence if isinstance(cadence, Cadence) else Cadence(cadence)
+    if cadence == Cadence.DAY:
+        return anchor + timedelta(days=period)
+    if cadence == Cadence.WEEK:
+        return anchor + timedelta(weeks=period)
+    return _add_months(anchor, period)
+
+
+def period_index(anchor, cadence, when):
+    """The period that contains ``when``, counted from the one starting on ``anchor``."""
+    cadence = cadence if isinstance(cadence, Cadence) else Cadence(cadence)
+    days = (when - anchor).days
+    if cadence == Cadence.DAY:
+        return days
+    if cadence == Cadence.WEEK:
+        return days // 7
+    period = (when.year - anchor.year) * 12 + when.month - anchor.month
+    if when < _add_months(anchor, period):
+        period -= 1
+    return period
+
+
+class RotationSchedule:
+    """
+    Projects a roster forward in time without stepping through it.
+
+    Period 0 is the one that starts on ``anchor`` and belongs to the current
+    goalie; period ``k`` is what the roster would say after ``k`` rotations,
+    worked out by the same index arithmetic as a single rotation.
+
+    With an ``availability`` calendar, each future period skips the people
+    away during it, as the rotation run at its start would. Who is skipped
+    shifts everyone after them, so those periods are stepped through from
+    period 1 instead; the current and past periods are left as they are.
+    """
+
+    def __init__(
+        self,
+        users,
+        current_index,
+        mode,
+        cadence,
+        anchor,
+        deputies=None,
+        availability=None,
+    ):
+        if current_index < 0:
+            raise ValueError("Current goalie index not found")
+        self.users = users
+        self.current_index = current_index
+        self.mode = mode
+        self.cadence = Cadence(cadence)
+        self.anchor = anchor
+        self.deputies = deputies
+        self.availability = availability
+
+    @classmethod
+    def from_roster(cls, roster, cadence, anchor, availability=None):
+        """Schedule for a Roster or CompactRoster."""
+        return cls(
+            getattr(roster, "users", roster),
+            roster.current_index,
+            roster.mode,
+            cadence,
+            anchor,
+            roster.deputies,
+            availability,
+        )
+
+    def assignment(self, period):
+        """The goalie and deputy for ``period`` (negative periods look back)."""
+        if self.availability is not None and period > 0:
+            return self.periods(1, period)[0]
+        return self._assignment(
+            period,
+            period_start(self.anchor, self.cadence, period),
+            period_start(self.anchor, self.cadence, period + 1),
+        )
+
+    def _assignment(self, period, start, end):
+        previous_index = (self.current_index + period - 1) % len(self.users)
+        goalie, deputy = next_goalie_and_deputy(
+            self.users, previous_index, self.mode, self.deputies
+        )
+        return Assignment(period, start, end, goalie, deputy)
+
+    def on(self, when):
+        """The assignment covering the date ``when``."""
+        return self.assignment(period_index(self.anchor, self.cadence, when))
+
+    def periods(self, count, first=0):
+        """``count`` consecutive assignments starting at period ``first``."""
+        starts = [
+            period_start(self.anchor, self.cadence, period)
+            for period in range(first, first + count + 1)
+        ]
+        # Without a calendar every period is arithmetic; with one, only the
+        # current and past ones are.
+        past = count if self.availability is None else max(0, min(count, 1 - first))
+        assignments = [
+            self._assignment(first + i, starts[i], starts[i + 1]) for i in range(past)
+        ]
+        if past < count:
+            assignments += self._stepped(first + past, count - past)
+        return assignments
+
+    def _stepped(self, first, count):
+        """Assignments of periods ``first`` (at least 1) on, rotating with the calendar."""
+        assignments = []
+        position = self.current_index
+        start = period_start(self.anchor, self.cadence, 1)
+        for period in range(1, first + count):
+            end = period_start(self.anchor, self.cadence, period + 1)
+            available = self.availability.available_during(start, end)
+            if period >= first:
+                goalie, deputy = next_goalie_and_deputy(
+                    self.users, position, self.mode, self.deputies, available
+                )
+                assignments.append(Assignment(period, start, end, goalie, deputy))
+            position = next_goalie_position(self.users, position, available)
+            start = end
+        return assignments
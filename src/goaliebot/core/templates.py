@@ -0,0 +1,227 @@
+import hashlib
+import json
+import re
+from dataclasses import dataclass
+
+# {name} inserts a variable, {#name}...{/name} keeps its contents only when
+# the variable is set and {^name}...{/name} only when it is not. {{ and }}
+# are literal braces.
+TOKEN_PATTERN = re.compile(r"\{\{|\}\}|\{([#^/]?)([a-z_]+)\}")
+
+VARIABLES = (
+    "goalie",
+    "goalie_handle",
+    "goalie_id",
+    "deputy",
+    "deputy_handle",
+    "deputy_id",
+    "user_group",
+    "user_group_id",
+    "cadence",
+    "cadence_text",
+    "next_goalie",
+    "next_goalie_handle",
+    "next_goalie_id",
+)
+
+DEFAULT_TEXT = (
+    "🎉 {goalie} is the goalie {cadence_text}! "
+    "{#deputy}👮‍♂️ Your trusty deputy is {deputy} 🙌. "
+    "Give the team a nudge with {user_group}! 🎉{/deputy}"
+    "{^deputy}No deputy assigned. Use {user_group} to reach out. 🎯{/deputy}"
+)
+
+_VARIABLE = "var"
+_SECTION = "section"
+
+
+def format_cadence_text(cadence):
+    cadence_str = cadence.value if hasattr(cadence, "value") else cadence
+    if cadence_str == "day":
+        return "today"
+    elif cadence_str == "week":
+        return "this week"
+    elif cadence_str == "month":
+        return "this month"
+    else:
+        return f"this {cadence_str}"
+
+
+def notification_context(goalie, deputy, user_group_id, cadence, next_goalie=None):
+    """The values of every template variable for one rotation."""
+
+    def person(prefix, user):
+        return {
+            prefix: f"<@{user.user_id}>" if user else "",
+            f"{prefix}_handle": user.handle if user else "",
+            f"{prefix}_id": user.user_id if user else "",
+        }
+
+    cadence_str = cadence.value if hasattr(cadence, "value") else cadence
+    return {
+        **person("goalie", goalie),
+        **person("deputy", deputy),
+        **person("next_goalie", next_goalie),
+        "user_group": f"<!subteam^{user_group_id}>",
+        "user_group_id": user_group_id,
+        "cadence": cadence_str,
+        "cadence_text": format_cadence_text(cadence),
+    }
+
+
+def _compile_text(source):
+    """
+    Split a text template into fragments: literal strings, variables and
+    sections holding their own fragments. Adjacent literals are joined.
+    """
+    root = []
+    stack = [(None, root)]
+    position = 0
+
+    def literal(text):
+        fragments = stack[-1][1]
+        if fragments and isinstance(fragments[-1], str):
+            fragments[-1] += text
+        elif text:
+            fragments.append(text)
+
+    for match in TOKEN_PATTERN.finditer(source):
+        start, end = match.span()
+        literal(source[position:start])
+        position = end
+        token = match.group(0)
+        if token in ("{{", "}}"):
+            literal(token[0])
+            continue
+        kind, name = match.groups()
+        if name not in VARIABLES:
+            raise ValueError(f"Unknown template variable {name!r}")
+        if kind == "":
+            stack[-1][1].append((_VARIABLE, name))
+        elif kind == "/":
+            if stack[-1][0] != name:
+                raise ValueError(f"Unexpected {{/{name}}} in template")
+            stack.pop()
+        else:
+            fragments = []
+            stack[-1][1].append((_SECTION, name, kind == "^", fragments))
+            stack.append((name, fragments))
+    literal(source[position:])
+    if len(stack) > 1:
+        raise ValueError(f"Unclosed {{#{stack[-1][0]}}} in template")
+    return root
+
+
+def _render_text(fragments, context):
+    parts = []
+    for fragment in fragments:
+        if isinstance(fragment, str):
+            parts.append(fragment)
+        elif fragment[0] == _VARIABLE:
+            parts.append(context[fragment[1]])
+        else:
+            _, name, inverted, children = fragment
+            if bool(context[name]) != inverted:
+                parts.append(_render_text(children, context))
+    return "".join(parts)
+
+
+class _TextSlot:
+    """A Block Kit string that holds template variables."""
+
+    __slots__ = ("fragments",)
+
+    def __init__(self, fragments):
+        self.fragments = fragments
+
+
+def _compile_json(value):
+    """Compile every string of a Block Kit structure; other values stay as they are."""
+    if isinstance(value, str):
+        fragments = _compile_text(value)
+        if all(isinstance(fragment, str) for fragment in fragments):
+            return "".join(fragments)
+        return _TextSlot(fragments)
+    if isinstance(value, list):
+        return [_compile_json(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _compile_json(item) for key, item in value.items()}
+    return value
+
+
+def _render_json(value, context):
+    if isinstance(value, _TextSlot):
+        return _render_text(value.fragments, context)
+    if isinstance(value, list):
+        return [_render_json(item, context) for item in value]
+    if isinstance(value, dict):
+        return {key: _render_json(item, context) for key, item in value.items()}
+    return value
+
+
+@dataclass(frozen=True)
+class Notification:
+    text: str
+    blocks: list = None
+
+
+class NotificationTemplate:
+    """
+    A rotation announcement, compiled once into literal fragments and
+    variable slots so that rendering is only substitution.
+
+    ``text`` is used for the message, the channel topic and the notification
+    fallback; ``blocks``, if given, is a Block Kit structure whose strings
+    may use the same variables.
+    """
+
+    def __init__(self, text=DEFAULT_TEXT, blocks=None):
+        self._text = _compile_text(text)
+        self._blocks = None if blocks is None else _compile_json(blocks)
+
+    def render(self, context):
+        text = _render_text(self._text, context)
+        if self._blocks is None:
+            return Notification(text)
+        return Notification(text, _render_json(self._blocks, context))
+
+
+_compiled = {}
+
+
+def compile_template(source, block_kit=False):
+    """
+    Compile a template, reusing the compiled form of any template with the
+    same content. Block Kit templates are JSON: a list of blocks, or an
+    object with ``blocks`` and an optional ``text`` fallback template.
+    """
+    key = hashlib.sha256(f"{int(block_kit)}:{source}".encode("utf-8")).hexdigest()
+    template = _compiled.get(key)
+    if template is None:
+        if block_kit:
+            try:
+                document = json.loads(source)
+            except ValueError as e:
+                raise ValueError(f"Invalid Block Kit JSON: {e}")
+            if isinstance(document, list):
+                document = {"blocks": document}
+            if not isinstance(document, dict) or "blocks" not in document:
+                raise ValueError("Block Kit templates need a 'blocks' list")
+            template = NotificationTemplate(
+                document.get("text", DEFAULT_TEXT), document["blocks"]
+            )
+        else:
+            template = NotificationTemplate(source.strip())
+        _compiled[key] = template
+    return template
+
+
+def load_template(file_path):
+    """Compile the template in ``file_path``; ``.json`` files are Block Kit."""
+    with open(file_path, "r", encoding="utf-8") as f:
+        source = f.read()
+    return compile_template(source, block_kit=file_path.endswith(".json"))
+
+
+def default_template():
+    return compile_template(DEFAULT_TEXT)
@@ -0,0 +1,46 @@
+from datetime import date, datetime, time
+from functools import lru_cache
+
+try:
+    from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+except ImportError:  # Python < 3.9
+    from backports.zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from .schedule import period_index, period_start
+
+# A Monday and the first of a month, so that without an anchor weekly
+# rotations fire on Mondays and monthly ones on the 1st.
+DEFAULT_ANCHOR = date(2024, 1, 1)
+DEFAULT_AT = time(9, 0)
+
+
+@lru_cache(maxsize=None)
+def load_zone(name):
+    """ZoneInfo for an IANA name; ``None`` means the system's local time."""
+    if name is None:
+        return None
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"unknown timezone {name!r}")
+
+
+def _local(day, at, zone):
+    moment = datetime.combine(day, at)
+    return moment.astimezone() if zone is None else moment.replace(tzinfo=zone)
+
+
+def next_trigger(cadence, after, at=DEFAULT_AT, zone=None, anchor=None):
+    """
+    The first period start strictly after the aware datetime ``after``, at
+    wall-clock time ``at`` in ``zone``. Periods are counted from ``anchor``
+    as in RotationSchedule, so a weekly rotation fires on the anchor's
+    weekday and a monthly one on its day of the month.
+    """
+    anchor = anchor or DEFAULT_ANCHOR
+    period = period_index(anchor, cadence, after.astimezone(zone).date())
+    while True:
+        fire = _local(period_start(anchor, cadence, period), at, zone)
+        if fire > after:
+            return fire
+        period += 1
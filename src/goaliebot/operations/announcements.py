@@ -0,0 +1,231 @@
+import json
+import os
+import tempfile
+from dataclasses import asdict, dataclass, field
+from datetime import date
+
+from slack_sdk.errors import SlackApiError
+
+from goaliebot.core.announcements import Announcement
+from goaliebot.slack_api import (
+    delete_scheduled_message,
+    get_directory,
+    schedule_message,
+)
+from goaliebot.slack_api.directory import default_cache_dir
+from goaliebot.telemetry.logs import get_logger
+
+
+def default_store_path():
+    """Return the on-disk location of the scheduled announcement store."""
+    return os.path.join(default_cache_dir(), "scheduled_announcements.json")
+
+
+class AnnouncementStore:
+    """
+    Local record of the announcements goaliebot has scheduled, with their
+    Slack IDs, so they can be listed, cancelled or re-planned later. Slack
+    offers no way to find them again by content.
+
+    The anchor each rotation was planned from, and the roster position of
+    its goalie, are kept too, so a later plan without ``--anchor`` lays out
+    the same periods rather than starting them on the day it runs.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or default_store_path()
+        self.announcements, self.anchors = self._load()
+
+    def for_rotation(self, rotation=None):
+        return [a for a in self.announcements if rotation in (None, a.rotation)]
+
+    def anchor(self, rotation):
+        """
+        ``(anchor, current_index)`` that ``rotation`` was last planned
+        from, or None.
+        """
+        entry = self.anchors.get(rotation)
+        if not entry:
+            return None
+        return date.fromisoformat(entry["anchor"]), entry["current_index"]
+
+    def set_anchor(self, rotation, anchor, current_index):
+        self.anchors[rotation] = {
+            "anchor": anchor.isoformat(),
+            "current_index": current_index,
+        }
+
+    def replace(self, rotation, announcements):
+        """Make ``announcements`` the full record for ``rotation``."""
+        others = [a for a in self.announcements if a.rotation != rotation]
+        self.announcements = others + sorted(
+            announcements, key=lambda a: (a.post_at, a.channel)
+        )
+
+    def _load(self):
+        try:
+            with open(self.path, "r") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return [], {}
+        if not isinstance(state, dict):
+            return [], {}
+        entries = state.get("announcements", [])
+        return [Announcement(**entry) for entry in entries], state.get("anchors", {})
+
+    def save(self):
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(
+                {
+                    "announcements": [asdict(a) for a in self.announcements],
+                    "anchors": self.anchors,
+                },
+                f,
+            )
+        os.replace(tmp_path, self.path)
+
+
+@dataclass
+class SyncResult:
+    kept: list = field(default_factory=list)
+    scheduled: list = field(default_factory=list)
+    cancelled: list = field(default_factory=list)
+    failed: list = field(default_factory=list)
+
+
+def _cancel(client, announcement):
+    """True unless Slack refused to cancel the message."""
+    try:
+        if delete_scheduled_message(
+            client, announcement.channel_id, announcement.scheduled_message_id
+        ):
+            get_logger().info(
+                "announcement_cancelled",
+                f"🗑️ Cancelled announcement for {announcement.channel}",
+                method="chat_deleteScheduledMessage",
+                channel=announcement.channel,
+                ok=True,
+            )
+        return True
+    except SlackApiError as e:
+        get_logger().error(
+            "announcement_cancel_failed",
+            f"Error cancelling announcement for {announcement.channel}: "
+            f"{e.response['error']}",
+            method="chat_deleteScheduledMessage",
+            channel=announcement.channel,
+            ok=False,
+            error=e.response["error"],
+        )
+        return False
+
+
+def _schedule(client, announcement):
+    """True when the message was scheduled; its ID is set on ``announcement``."""
+    try:
+        announcement.channel_id = get_directory().channel_id(
+            client, announcement.channel
+        )
+        if not announcement.channel_id:
+            get_logger().error(
+                "announcement_failed",
+                f"Error scheduling announcement: unknown channel {announcement.channel}",
+                channel=announcement.channel,
+                ok=False,
+                error="channel_not_found",
+            )
+            return False
+        announcement.scheduled_message_id = schedule_message(
+            client,
+            announcement.channel_id,
+            announcement.text,
+            announcement.post_at,
+            announcement.blocks,
+        )
+    except SlackApiError as e:
+        get_logger().error(
+            "announcement_failed",
+            f"Error scheduling announcement for {announcement.channel}: "
+            f"{e.response['error']}",
+            method="chat_scheduleMessage",
+            channel=announcement.channel,
+            ok=False,
+            error=e.response["error"],
+        )
+        return False
+    get_logger().info(
+        "announcement_scheduled",
+        f"📅 Scheduled announcement for {announcement.channel}: "
+        f"{announcement.scheduled_message_id}",
+        method="chat_scheduleMessage",
+        channel=announcement.channel,
+        ok=True,
+    )
+    return True
+
+
+def sync_announcements(client, store, rotation, desired, now, dry_run=False):
+    """
+    Bring the messages scheduled for ``rotation`` in line with ``desired``:
+    keep those that still match, cancel the rest and schedule what is
+    missing. Records of messages already posted are dropped. The store is
+    saved even if a Slack call fails half way, so no ID is lost.
+    """
+    result = SyncResult()
+    wanted = {a.key for a in desired}
+    kept_keys = set()
+    stale = []
+    for announcement in store.for_rotation(rotation):
+        if announcement.post_at <= now:
+            continue
+        if announcement.key in wanted and announcement.key not in kept_keys:
+            kept_keys.add(announcement.key)
+            result.kept.append(announcement)
+        else:
+            stale.append(announcement)
+    missing = [a for a in desired if a.key not in kept_keys]
+
+    if dry_run:
+        result.cancelled, result.scheduled = stale, missing
+        return result
+
+    try:
+        for announcement in stale:
+            target = (
+                result.cancelled if _cancel(client, announcement) else result.failed
+            )
+            target.append(announcement)
+        for announcement in missing:
+            target = (
+                result.scheduled if _schedule(client, announcement) else result.failed
+            )
+            target.append(announcement)
+    finally:
+        still_pending = [a for a in stale if a not in result.cancelled]
+        store.replace(rotation, result.kept + still_pending + result.scheduled)
+        store.save()
+    return result
+
+
+def cancel_announcements(client, store, rotation=None, now=None):
+    """
+    Cancel every pending announcement recorded for ``rotation`` (or for all
+    rotations). Returns how many were cancelled; ones Slack refused to
+    cancel stay recorded.
+    """
+    done = []
+    cancelled = 0
+    try:
+        for announcement in store.for_rotation(rotation):
+            if now is not None and announcement.post_at <= now:
+                done.append(announcement)
+            elif _cancel(client, announcement):
+                done.append(announcement)
+                cancelled += 1
+    finally:
+        store.announcements = [a for a in store.announcements if a not in done]
+        store.save()
+    return cancelled
@@ -1,11 +1,42 @@
-from slack_sdk import WebClient
+import asyncio
+import sys
+
 from slack_sdk.errors import SlackApiError
+from goaliebot.slack_api.client import (
+    create_async_web_client,
+    get_client,
+    pooled_session,
+)
+from goaliebot.slack_api.resilience import SlackUnavailableError
+from goaliebot.slack_api.state import SlackStateReader
+from goaliebot.telemetry.logs import get_logger
+from goaliebot.telemetry.metrics import get_metrics
 from .slack_helpers import (
-    compose_goalie_notification,
     perform_slack_rotation_updates,
+    perform_slack_rotation_updates_async,
+    plan_slack_rotation_updates,
+    record_rotation_writes,
+    render_goalie_notification,
 )
 from .summary import print_success_summary
-import sys
+
+
+def create_async_client(slack_token):
+    try:
+        import aiohttp  # noqa: F401
+    except ImportError:
+        get_logger().error(
+            "missing_dependency",
+            "❌ '--concurrency' requires aiohttp. Install it with: pip install 'goaliebot[async]'",
+            error="aiohttp not installed",
+        )
+        sys.exit(1)
+    return create_async_web_client(slack_token)
+
+
+async def _perform_pooled_updates_async(client, *args, **kwargs):
+    async with pooled_session(client):
+        return await perform_slack_rotation_updates_async(client, *args, **kwargs)
 
 
 def run_slack_commands(
@@ -16,27 +47,105 @@ def run_slack_commands(
     user_group_id,
     commands,
     cadence,
+    concurrency=None,
+    client=None,
+    async_client=None,
+    reconcile=False,
+    state=None,
+    template=None,
+    upcoming_goalie=None,
 ):
-    client = WebClient(token=slack_token)
-    message = compose_goalie_notification(
-        next_goalie, next_deputy, user_group_id, cadence
+    """
+    Apply the rotation to Slack.
+
+    With ``concurrency`` set, the commands run concurrently on an
+    AsyncWebClient and per-channel calls fan out up to that many at a time;
+    otherwise every call is made in turn on a blocking WebClient. ``client``
+    and ``async_client`` reuse existing clients.
+
+    With ``reconcile`` set, Slack's current state is read first (through
+    ``state``, a SlackStateReader that may be shared between rotations) and
+    writes that would not change anything are skipped. The writes that
+    succeed are recorded in ``state``.
+
+    The message is rendered from ``template`` (a NotificationTemplate), or
+    the built-in one; ``upcoming_goalie`` fills its ``next_goalie`` variable.
+    """
+    notification = render_goalie_notification(
+        next_goalie, next_deputy, user_group_id, cadence, template, upcoming_goalie
     )
+    message = notification.text
+    plan = None
     try:
-        perform_slack_rotation_updates(
-            client,
-            slack_channels,
-            user_group_id,
+        if reconcile or not concurrency:
+            client = client or get_client(slack_token)
+        if reconcile:
+            state = state or SlackStateReader()
+            with get_metrics().phase("reconcile_plan"):
+                plan = plan_slack_rotation_updates(
+                    client,
+                    state,
+                    slack_channels,
+                    user_group_id,
+                    next_goalie,
+                    next_deputy,
+                    message,
+                    commands,
+                    cadence,
+                )
+
+        if concurrency:
+            writes = asyncio.run(
+                _perform_pooled_updates_async(
+                    async_client or create_async_client(slack_token),
+                    slack_channels,
+                    user_group_id,
+                    next_goalie,
+                    next_deputy,
+                    message,
+                    commands,
+                    concurrency,
+                    plan=plan,
+                    blocks=notification.blocks,
+                )
+            )
+        else:
+            writes = perform_slack_rotation_updates(
+                client,
+                slack_channels,
+                user_group_id,
+                next_goalie,
+                next_deputy,
+                message,
+                commands,
+                plan=plan,
+                blocks=notification.blocks,
+            )
+        if plan:
+            record_rotation_writes(state, plan, writes, user_group_id, message)
+        print_success_summary(
             next_goalie,
             next_deputy,
-            message,
-            commands,
-        )
-        print_success_summary(
-            next_goalie, next_deputy, slack_channels, user_group_id, commands, cadence
+            slack_channels,
+            user_group_id,
+            cadence,
+            writes,
+            skipped=plan.skipped if plan else None,
         )
     except SlackApiError as e:
-        print(
-            "❌ Failed to update Slack state (user group, channel description, or goaliebot notification)."
+        get_logger().error(
+            "rotation_failed",
+            "❌ Failed to update Slack state (user group, channel description, "
+            f"or goaliebot notification).\nError: {e.response['error']}",
+            ok=False,
+            error=e.response["error"],
+        )
+        sys.exit(1)
+    except SlackUnavailableError as e:
+        get_logger().error(
+            "slack_unavailable",
+            f"❌ Slack is unavailable: {e}",
+            ok=False,
+            error=str(e),
         )
-        print(f"Error: {e.response['error']}")
         sys.exit(1)
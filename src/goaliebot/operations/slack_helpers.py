@@ -1,47 +1,263 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+
 from goaliebot.slack_api import (
     update_usergroup_with_goalie_and_deputy,
+    update_usergroup_with_goalie_and_deputy_async,
     update_channel_description,
+    update_channel_description_async,
     send_goalie_notification,
+    send_goalie_notification_async,
+    get_directory,
 )
+from goaliebot.slack_api.state import read_or_none
 from goaliebot.core.models import Command
+from goaliebot.core.templates import (  # noqa: F401
+    default_template,
+    format_cadence_text,
+    notification_context,
+)
+from goaliebot.telemetry.metrics import get_metrics
 
+CADENCE_SECONDS = {
+    "day": 24 * 60 * 60,
+    "week": 7 * 24 * 60 * 60,
+    "month": 31 * 24 * 60 * 60,
+}
 
-def format_cadence_text(cadence):
-    cadence_str = cadence.value if hasattr(cadence, "value") else cadence
-    if cadence_str == "day":
-        return "today"
-    elif cadence_str == "week":
-        return "this week"
-    elif cadence_str == "month":
-        return "this month"
-    else:
-        return f"this {cadence_str}"
-
-
-def compose_goalie_notification(next_goalie, next_deputy, user_group_id, cadence):
-    cadence_text = format_cadence_text(cadence)
-    if next_deputy:
-        return (
-            f"🎉 <@{next_goalie.user_id}> is the goalie {cadence_text}! "
-            f"👮‍♂️ Your trusty deputy is <@{next_deputy.user_id}> 🙌. "
-            f"Give the team a nudge with <!subteam^{user_group_id}>! 🎉"
-        )
-    return (
-        f"🎉 <@{next_goalie.user_id}> is the goalie {cadence_text}! No deputy assigned. "
-        f"Use <!subteam^{user_group_id}> to reach out. 🎯"
+
+def render_goalie_notification(
+    next_goalie,
+    next_deputy,
+    user_group_id,
+    cadence,
+    template=None,
+    upcoming_goalie=None,
+):
+    """Render the rotation's Notification with ``template`` or the default one."""
+    context = notification_context(
+        next_goalie, next_deputy, user_group_id, cadence, upcoming_goalie
     )
+    return (template or default_template()).render(context)
+
+
+def compose_goalie_notification(
+    next_goalie,
+    next_deputy,
+    user_group_id,
+    cadence,
+    template=None,
+    upcoming_goalie=None,
+):
+    return render_goalie_notification(
+        next_goalie, next_deputy, user_group_id, cadence, template, upcoming_goalie
+    ).text
+
+
+@dataclass
+class ReconciliationPlan:
+    """The writes a rotation still needs, and the ones already in place."""
+
+    update_user_group: bool = True
+    topic_channels: list = field(default_factory=list)
+    message_channels: list = field(default_factory=list)
+    skipped: list = field(default_factory=list)
+    members: set = None
+    channel_ids: dict = field(default_factory=dict)
+
+
+@dataclass
+class RotationWrites:
+    """The writes Slack accepted during a rotation."""
+
+    user_group: bool = False
+    topic_channels: list = field(default_factory=list)
+    message_channels: list = field(default_factory=list)
+
+
+def plan_slack_rotation_updates(
+    client,
+    state,
+    slack_channels,
+    user_group_id,
+    next_goalie,
+    next_deputy,
+    message,
+    commands,
+    cadence,
+):
+    """
+    Compare the desired rotation with Slack's current state and keep only
+    the writes that change something. Anything that cannot be read is
+    written as usual. Once the writes are made, record_rotation_writes
+    records the ones that succeeded in ``state``.
+    """
+    plan = ReconciliationPlan(update_user_group=Command.UPDATE_USER_GROUP in commands)
+
+    if plan.update_user_group:
+        desired = {next_goalie.user_id}
+        if next_deputy:
+            desired.add(next_deputy.user_id)
+        members = read_or_none(state.usergroup_members, client, user_group_id)
+        if members == desired:
+            plan.update_user_group = False
+            plan.skipped.append(f"user group {user_group_id}")
+        else:
+            plan.members = desired
+
+    wants_topic = Command.UPDATE_TOPIC_DESCRIPTION in commands
+    wants_message = Command.SEND_SLACK_MESSAGE in commands
+    if not (wants_topic or wants_message):
+        return plan
+
+    directory = get_directory()
+    channel_ids = plan.channel_ids = {
+        channel: read_or_none(directory.channel_id, client, channel)
+        for channel in slack_channels
+    }
+    known_ids = [channel_id for channel_id in channel_ids.values() if channel_id]
+
+    if wants_topic:
+        topics = read_or_none(state.channel_topics, client, known_ids) or {}
+        for channel in slack_channels:
+            channel_id = channel_ids[channel]
+            if channel_id and topics.get(channel_id) == message:
+                plan.skipped.append(f"topic of {channel}")
+                continue
+            plan.topic_channels.append(channel)
+
+    if wants_message:
+        cadence_str = cadence.value if hasattr(cadence, "value") else cadence
+        oldest = time.time() - CADENCE_SECONDS.get(cadence_str, CADENCE_SECONDS["week"])
+        for channel in slack_channels:
+            channel_id = channel_ids[channel]
+            recent = channel_id and read_or_none(
+                state.recent_messages, client, channel_id, oldest
+            )
+            if recent and message in recent:
+                plan.skipped.append(f"message to {channel}")
+                continue
+            plan.message_channels.append(channel)
+
+    return plan
+
+
+def record_rotation_writes(state, plan, writes, user_group_id, message):
+    """
+    Record in ``state`` the writes of ``plan`` that Slack accepted, so later
+    rotations sharing it see them. Failed writes leave ``state`` as it was.
+    """
+    if writes.user_group and plan.members is not None:
+        state.record_members(user_group_id, plan.members)
+    for channel in writes.topic_channels:
+        if plan.channel_ids.get(channel):
+            state.record_topic(plan.channel_ids[channel], message)
+    for channel in writes.message_channels:
+        if plan.channel_ids.get(channel):
+            state.record_message(plan.channel_ids[channel], message)
 
 
 def perform_slack_rotation_updates(
-    client, slack_channels, user_group_id, next_goalie, next_deputy, message, commands
+    client,
+    slack_channels,
+    user_group_id,
+    next_goalie,
+    next_deputy,
+    message,
+    commands,
+    plan=None,
+    blocks=None,
 ):
-    if Command.UPDATE_USER_GROUP in commands:
-        update_usergroup_with_goalie_and_deputy(
-            client, user_group_id, next_goalie, next_deputy
-        )
+    """
+    Run the selected commands in turn, limited to ``plan`` when given.
+    ``blocks`` are posted with the message, which stays the topic text.
+    Returns the RotationWrites that succeeded.
+    """
+    metrics = get_metrics()
+    writes = RotationWrites()
+    if Command.UPDATE_USER_GROUP in commands and (
+        plan is None or plan.update_user_group
+    ):
+        with metrics.phase(Command.UPDATE_USER_GROUP.value):
+            writes.user_group = update_usergroup_with_goalie_and_deputy(
+                client, user_group_id, next_goalie, next_deputy
+            )
 
     if Command.UPDATE_TOPIC_DESCRIPTION in commands:
-        update_channel_description(client, slack_channels, message)
+        topic_channels = slack_channels if plan is None else plan.topic_channels
+        with metrics.phase(Command.UPDATE_TOPIC_DESCRIPTION.value):
+            writes.topic_channels = update_channel_description(
+                client, topic_channels, message
+            )
+
+    if Command.SEND_SLACK_MESSAGE in commands:
+        message_channels = slack_channels if plan is None else plan.message_channels
+        with metrics.phase(Command.SEND_SLACK_MESSAGE.value):
+            writes.message_channels = send_goalie_notification(
+                client, message_channels, message, blocks
+            )
+    return writes
+
+
+async def _timed(command, coroutine):
+    with get_metrics().phase(command.value):
+        return await coroutine
+
 
+async def perform_slack_rotation_updates_async(
+    client,
+    slack_channels,
+    user_group_id,
+    next_goalie,
+    next_deputy,
+    message,
+    commands,
+    concurrency,
+    plan=None,
+    blocks=None,
+):
+    """
+    Run the selected commands concurrently on an AsyncWebClient, limited to
+    ``plan`` when given. The commands share one bound of ``concurrency``
+    requests in flight. Returns the RotationWrites that succeeded.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    writes = RotationWrites()
+
+    async def user_group():
+        writes.user_group = await update_usergroup_with_goalie_and_deputy_async(
+            client, user_group_id, next_goalie, next_deputy, semaphore
+        )
+
+    async def topics():
+        writes.topic_channels = await update_channel_description_async(
+            client,
+            slack_channels if plan is None else plan.topic_channels,
+            message,
+            concurrency,
+            semaphore=semaphore,
+        )
+
+    async def messages():
+        writes.message_channels = await send_goalie_notification_async(
+            client,
+            slack_channels if plan is None else plan.message_channels,
+            message,
+            concurrency,
+            blocks,
+            semaphore=semaphore,
+        )
+
+    tasks = []
+    if Command.UPDATE_USER_GROUP in commands and (
+        plan is None or plan.update_user_group
+    ):
+        tasks.append(_timed(Command.UPDATE_USER_GROUP, user_group()))
+    if Command.UPDATE_TOPIC_DESCRIPTION in commands:
+        tasks.append(_timed(Command.UPDATE_TOPIC_DESCRIPTION, topics()))
     if Command.SEND_SLACK_MESSAGE in commands:
-        send_goalie_notification(client, slack_channels, message)
+        tasks.append(_timed(Command.SEND_SLACK_MESSAGE, messages()))
+
+    await asyncio.gather(*tasks)
+    return writes
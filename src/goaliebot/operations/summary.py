@@ -1,25 +1,44 @@
-from goaliebot.core.models import Command
+from goaliebot.telemetry.logs import get_logger
+
+
+def describe_writes(writes):
+    """The writes Slack accepted (a RotationWrites), one phrase each."""
+    updates = []
+    if writes.user_group:
+        updates.append("user group updated")
+    if writes.topic_channels:
+        updates.append(f"topic updated in {', '.join(writes.topic_channels)}")
+    if writes.message_channels:
+        updates.append(f"message sent to {', '.join(writes.message_channels)}")
+    return updates
 
 
 def print_success_summary(
-    next_goalie, next_deputy, slack_channels, user_group_id, commands, cadence
+    next_goalie,
+    next_deputy,
+    slack_channels,
+    user_group_id,
+    cadence,
+    writes,
+    skipped=None,
 ):
-    print("\n✅ Goalie rotation complete!")
-    print(f"ℹ️ Cadence: {cadence}")
-    print(f"👮 Goalie      : {next_goalie.handle} (<@{next_goalie.user_id}>)")
+    """
+    Report the rotation, listing the writes Slack accepted (``writes``) and,
+    in reconcile mode, the ones ``skipped`` as already up to date.
+    """
+    lines = ["\n✅ Goalie rotation complete!", f"ℹ️ Cadence: {cadence}"]
+    lines.append(f"👮 Goalie      : {next_goalie.handle} (<@{next_goalie.user_id}>)")
     if next_deputy:
-        print(f"🛡️ Deputy      : {next_deputy.handle} (<@{next_deputy.user_id}>)")
+        lines.append(
+            f"🛡️ Deputy      : {next_deputy.handle} (<@{next_deputy.user_id}>)"
+        )
     else:
-        print("🛡️ Deputy      : None")
-    print(f"📢 Channels    : {', '.join(slack_channels)}")
-    print(f"👥 User Group  : {user_group_id}")
-
-    updates = ["user group updated"]
-
-    if commands:
-        if Command.UPDATE_TOPIC_DESCRIPTION in commands:
-            updates.append("channel topic updated")
-        if Command.SEND_SLACK_MESSAGE in commands:
-            updates.append("message sent")
+        lines.append("🛡️ Deputy      : None")
+    lines.append(f"📢 Channels    : {', '.join(slack_channels)}")
+    lines.append(f"👥 User Group  : {user_group_id}")
 
-    print(f"🎯 Slack updates: {', '.join(updates)}.")
+    updates = describe_writes(writes)
+    lines.append(f"🎯 Slack updates: {', '.join(updates) or 'none'}.")
+    if skipped:
+        lines.append(f"⏭️ Already up to date, skipped: {', '.join(skipped)}.")
+    get_logger().info("rotation_complete", "\n".join(lines), ok=True)
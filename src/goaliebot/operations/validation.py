@@ -0,0 +1,99 @@
+from dataclasses import dataclass
+
+from goaliebot.core.models import SlackUser
+from goaliebot.slack_api.usergroup import is_valid_user_id
+
+
+@dataclass
+class RosterIssue:
+    file: str
+    line: int
+    role: str
+    handle: str
+    user_id: str
+    problem: str
+
+
+def email_index(users):
+    """Lower-cased e-mail address -> user ID, for active users with an address."""
+    return {
+        record["email"].lower(): user_id
+        for user_id, record in users.items()
+        if record.get("email") and not record.get("deleted")
+    }
+
+
+def _handle_matches(handle, record):
+    handle = handle.lstrip("@").lower()
+    names = (record.get("name"), record.get("display_name"))
+    return any(name and name.lower() == handle for name in names)
+
+
+def check_user(user, users):
+    """The problem with one roster person, or None if Slack knows them as written."""
+    if not is_valid_user_id(user.user_id):
+        if "@" in user.user_id:
+            return "e-mail address instead of a user ID (use --resolve-emails)"
+        return "invalid user ID format"
+    record = users.get(user.user_id)
+    if record is None:
+        return "unknown user ID"
+    if record.get("deleted"):
+        return "deactivated user"
+    if not _handle_matches(user.handle, record):
+        return (
+            f"handle does not match Slack user {record.get('name')!r}"
+            f" (display name {record.get('display_name')!r})"
+        )
+    return None
+
+
+def roster_people(roster):
+    """``(position, role, user)`` for every goalie and paired deputy in a Roster."""
+    for position, goalie in enumerate(roster.users):
+        yield position, "goalie", goalie
+        if roster.deputies:
+            yield position, "deputy", roster.deputies[position]
+
+
+def resolve_emails(roster, emails):
+    """
+    Replace e-mail addresses in the user ID column of ``roster`` with the
+    IDs they belong to. Returns ``(position, role, email, user_id)`` for
+    each replacement.
+    """
+    resolved = []
+    for position, role, user in list(roster_people(roster)):
+        user_id = emails.get(user.user_id.lower()) if "@" in user.user_id else None
+        if user_id is None:
+            continue
+        replacement = SlackUser(user.handle, user_id)
+        if role == "goalie":
+            roster.replace(position, goalie=replacement)
+        else:
+            roster.replace(position, deputy=replacement)
+        resolved.append((position, role, user.user_id, user_id))
+    return resolved
+
+
+def validate_roster(file_path, roster, users):
+    """Check every person in ``roster`` against the workspace's user index."""
+    issues = []
+    # Rosters repeat the same people, so each distinct person is checked once.
+    checked = {}
+    for position, role, user in roster_people(roster):
+        if user not in checked:
+            checked[user] = check_user(user, users)
+        problem = checked[user]
+        if problem:
+            issues.append(
+                RosterIssue(
+                    file=file_path,
+                    line=roster.line_indexes[position] + 1,
+                    role=role,
+                    handle=user.handle,
+                    user_id=user.user_id,
+                    problem=problem,
+                )
+            )
+    return issues
@@ -1,16 +1,40 @@
 import sys
+from contextlib import closing, contextmanager
+from datetime import date
+
 import click
 from goaliebot.core.parser import parse_commands
 from goaliebot.core.models import Command
 from goaliebot.core.models import Cadence
+from goaliebot.core.models import MODES
 
-from goaliebot.core.file_ops import (
-    get_goalie_and_users,
-    get_next_goalie_and_deputy,
-    update_goalie_file,
+from goaliebot.core.availability import AvailabilityCalendar
+from goaliebot.core.file_ops import load_roster, write_rotated_roster
+from goaliebot.core.patching import FileChangedError
+from goaliebot.core.schedule import period_start
+from goaliebot.core.templates import load_template
+from goaliebot.slack_api.directory import (
+    DEFAULT_TTL,
+    configure_directory,
+    default_cache_path,
+)
+from goaliebot.slack_api.ratelimit import configure_scheduler
+from goaliebot.slack_api.resilience import (
+    DEFAULT_BREAKER_THRESHOLD,
+    DEFAULT_RETRIES,
+    Resilience,
+    RetryPolicy,
+    SlackUnavailableError,
+)
+from goaliebot.slack_api.client import (
+    BASE_URL_ENV,
+    DEFAULT_POOL_SIZE,
+    DEFAULT_TIMEOUT,
+    configure_client,
 )
-from goaliebot.operations.command_runner import run_slack_commands
-from goaliebot.slack_api.usergroup import get_user_group_id
+from goaliebot.telemetry.logs import FORMATS, LEVELS, configure_logging, get_logger
+from goaliebot.telemetry.metrics import configure_metrics, get_metrics
+from goaliebot.telemetry.tracing import configure_tracing, get_tracer
 
 
 def validate_commands(ctx, param, value):
@@ -35,40 +59,391 @@ def validate_required_inputs(effective_commands, slack_channels, user_group_hand
     requires_channels = {Command.SEND_SLACK_MESSAGE, Command.UPDATE_TOPIC_DESCRIPTION}
     if any(cmd in effective_commands for cmd in requires_channels):
         if not slack_channels:
-            print(
-                "❌ '--slack-channels' must be set if using 'send_slack_message' or 'update_topic_description' commands."
+            get_logger().error(
+                "invalid_inputs",
+                "❌ '--slack-channels' must be set if using 'send_slack_message' or 'update_topic_description' commands.",
             )
             sys.exit(1)
 
     if Command.UPDATE_USER_GROUP in effective_commands:
         if not user_group_handle:
-            print(
-                "❌ '--user-group-handle' must be set if using 'update_user_group' command."
+            get_logger().error(
+                "invalid_inputs",
+                "❌ '--user-group-handle' must be set if using 'update_user_group' command.",
             )
             sys.exit(1)
 
 
-def resolve_goalie_rotation(file_path, mode):
-    current_goalie, users, current_goalie_index = get_goalie_and_users(
-        file_path, mode=mode
-    )
-    if not current_goalie:
-        print("❌ No current goalie marked with '**' in the file.")
+def availability_for_period(availability, cadence, today=None):
+    """
+    Predicate telling who is available for the whole period starting today,
+    or None without an availability calendar.
+    """
+    if availability is None:
+        return None
+    start = today or date.today()
+    return availability.available_during(start, period_start(start, cadence, 1))
+
+
+def load_availability(file_path):
+    """Load an availability calendar, exiting on an unreadable file."""
+    if not file_path:
+        return None
+    try:
+        return AvailabilityCalendar.load(file_path)
+    except (OSError, ValueError) as e:
+        get_logger().error(
+            "invalid_availability", f"❌ Invalid availability file {file_path}: {e}"
+        )
         sys.exit(1)
-    next_goalie, next_deputy = get_next_goalie_and_deputy(
-        file_path, users, current_goalie, current_goalie_index, mode=mode
-    )
-    return next_goalie, next_deputy
 
 
-def resolve_user_group_id(slack_token, handle):
-    user_group_id = get_user_group_id(slack_token, handle)
+def load_notification_template(file_path):
+    """Compile a notification template, exiting on an unreadable file."""
+    if not file_path:
+        return None
+    try:
+        return load_template(file_path)
+    except (OSError, ValueError) as e:
+        get_logger().error("invalid_template", f"❌ Invalid template {file_path}: {e}")
+        sys.exit(1)
+
+
+def resolve_goalie_rotation(file_path, mode, roster_cache=None, available=None):
+    """
+    Load the roster once and work out who is next. The caller closes the
+    returned roster.
+    """
+    metrics = get_metrics()
+    with metrics.phase("parse_roster"):
+        load = roster_cache.load if roster_cache else load_roster
+        # Skipping unavailable people may look past the entries a
+        # streamed roster keeps.
+        roster = load(file_path, mode=mode, stream=available is None)
+    if not roster.current_goalie:
+        roster.close()
+        get_logger().error(
+            "no_current_goalie", "❌ No current goalie marked with '**' in the file."
+        )
+        sys.exit(1)
+    with metrics.phase("resolve_rotation"):
+        next_goalie, next_deputy = roster.next_goalie_and_deputy(available)
+    return roster, next_goalie, next_deputy
+
+
+def resolve_user_group_id(slack_token, handle, client=None):
+    from goaliebot.slack_api.usergroup import get_user_group_id
+
+    with get_metrics().phase("lookup_user_group"):
+        user_group_id = get_user_group_id(slack_token, handle, client=client)
     if not user_group_id:
-        print(f"❌ Could not find Slack user group ID for handle: {handle}")
+        get_logger().error(
+            "user_group_not_found",
+            f"❌ Could not find Slack user group ID for handle: {handle}",
+        )
         sys.exit(1)
     return user_group_id
 
 
+def configure_slack_runtime(
+    directory_cache,
+    directory_cache_ttl,
+    rate_limit_state,
+    slack_base_url=None,
+    slack_timeout=DEFAULT_TIMEOUT,
+    slack_pool_size=DEFAULT_POOL_SIZE,
+    slack_retries=DEFAULT_RETRIES,
+    circuit_breaker_threshold=DEFAULT_BREAKER_THRESHOLD,
+    run_deadline=None,
+    log_level="info",
+    log_format="text",
+    trace_file=None,
+):
+    """
+    Set up the process-wide Slack client, directory cache, rate-limit
+    scheduler (with its retries, circuit breakers and run deadline),
+    logger, metrics and tracer. The run deadline's clock and the run's
+    root span start here.
+    """
+    configure_logging(level=log_level, fmt=log_format)
+    configure_tracing(trace_file)
+    ctx = click.get_current_context(silent=True)
+    get_tracer().start_run(ctx.command_path if ctx else "goaliebot")
+    configure_client(
+        base_url=slack_base_url, timeout=slack_timeout, pool_size=slack_pool_size
+    )
+    configure_metrics()
+    configure_directory(
+        cache_path=directory_cache or default_cache_path(), ttl=directory_cache_ttl
+    )
+    configure_scheduler(
+        state_file=rate_limit_state,
+        resilience=Resilience(
+            retry=RetryPolicy(retries=slack_retries),
+            breaker_threshold=circuit_breaker_threshold,
+            run_deadline=run_deadline,
+        ),
+    )
+
+
+def run_rotation(
+    file_path,
+    slack_token,
+    slack_channels,
+    user_group_handle,
+    commands,
+    mode,
+    cadence,
+    concurrency=None,
+    client=None,
+    async_client=None,
+    reconcile=False,
+    state=None,
+    roster_cache=None,
+    availability=None,
+    template=None,
+):
+    """
+    Rotate one roster and apply it to Slack.
+
+    ``client`` (and ``async_client`` when ``concurrency`` is set) let several
+    rotations share Slack clients, and ``state`` lets them share the reads
+    made by ``reconcile``; by default each run creates its own. A
+    ``roster_cache`` keeps the parsed roster for the next run. With an
+    ``availability`` calendar, people away during the coming period are
+    skipped. A ``template`` (a NotificationTemplate) replaces the built-in
+    message. Returns the new goalie and deputy.
+    """
+    with get_metrics().phase("rotation"):
+        effective_commands = resolve_effective_commands(commands)
+        validate_required_inputs(effective_commands, slack_channels, user_group_handle)
+
+        available = availability_for_period(availability, cadence)
+        roster, next_goalie, next_deputy = resolve_goalie_rotation(
+            file_path, mode, roster_cache, available
+        )
+        with closing(roster):
+            get_logger().info(
+                "next_goalie",
+                f"✅ Next goalie: {next_goalie.handle} ({next_goalie.user_id})",
+            )
+
+            user_group_id = resolve_user_group_id(
+                slack_token, user_group_handle, client
+            )
+
+            # Deferred so runs that stop before talking to Slack never load slack_sdk.
+            from goaliebot.operations.command_runner import run_slack_commands
+
+            run_slack_commands(
+                slack_token=slack_token,
+                slack_channels=slack_channels,
+                next_goalie=next_goalie,
+                next_deputy=next_deputy,
+                user_group_id=user_group_id,
+                commands=effective_commands,
+                cadence=cadence,
+                concurrency=concurrency,
+                client=client,
+                async_client=async_client,
+                reconcile=reconcile,
+                state=state,
+                template=template,
+                upcoming_goalie=roster.upcoming_goalie(available),
+            )
+
+            with get_metrics().phase("write_roster"):
+                try:
+                    write_rotated_roster(roster, file_path, available)
+                except (FileChangedError, OSError) as e:
+                    get_logger().error(
+                        "roster_not_written",
+                        f"❌ Slack was updated, but the goalie file was not: {e}",
+                    )
+                    sys.exit(1)
+                finally:
+                    # Drops the cached roster too if the write failed.
+                    if roster_cache:
+                        roster_cache.remember(file_path, roster)
+            return next_goalie, next_deputy
+
+
+def write_run_metrics(metrics_json, metrics_textfile):
+    """Write this run's metrics and trace, if asked for, even when the run failed."""
+    try:
+        get_metrics().write(json_path=metrics_json, prometheus_path=metrics_textfile)
+    except OSError as e:
+        get_logger().warning("metrics_not_written", f"⚠️ Could not write metrics: {e}")
+    try:
+        get_tracer().export()
+    except OSError as e:
+        get_logger().warning("trace_not_written", f"⚠️ Could not write trace: {e}")
+
+
+@contextmanager
+def profiled_run(profile_dir):
+    """
+    Profile the enclosed run into ``profile_dir``, if given, even when the
+    run fails.
+    """
+    if not profile_dir:
+        yield
+        return
+    from goaliebot.telemetry.profiling import RunProfiler
+
+    profiler = RunProfiler(profile_dir)
+    profiler.start()
+    try:
+        yield
+    finally:
+        profiler.stop()
+        try:
+            paths = profiler.write()
+        except OSError as e:
+            get_logger().warning(
+                "profiles_not_written", f"⚠️ Could not write profiles: {e}"
+            )
+        else:
+            get_logger().info(
+                "profiles_written",
+                f"📊 Profiles written to {', '.join(paths.values())}",
+            )
+
+
+profile_option = click.option(
+    "--profile",
+    "profile_dir",
+    default=None,
+    help="Profile the run's CPU time and memory and write a pstats file, collapsed stacks for flamegraphs and an allocation report to this directory",
+)
+
+
+def _apply_options(command, options):
+    for option in reversed(options):
+        command = option(command)
+    return command
+
+
+def slack_client_options(command):
+    """Options shared by every command that talks to Slack."""
+    return _apply_options(
+        command,
+        [
+            click.option(
+                "--directory-cache",
+                default=None,
+                help="File caching Slack channel and user group IDs (default: ~/.cache/goaliebot/slack_directory.json)",
+            ),
+            click.option(
+                "--directory-cache-ttl",
+                default=DEFAULT_TTL,
+                type=int,
+                show_default=True,
+                help="Seconds before cached Slack channel and user group IDs are refetched",
+            ),
+            click.option(
+                "--rate-limit-state",
+                default=None,
+                help="File holding Slack rate-limit buckets, shared by every goaliebot process that uses it",
+            ),
+            click.option(
+                "--slack-base-url",
+                default=None,
+                envvar=BASE_URL_ENV,
+                help=f"Slack Web API base URL, e.g. a local 'goaliebot slack-stub' (or set {BASE_URL_ENV})",
+            ),
+            click.option(
+                "--slack-timeout",
+                default=DEFAULT_TIMEOUT,
+                type=click.IntRange(min=1),
+                show_default=True,
+                help="Seconds to wait for each Slack API response",
+            ),
+            click.option(
+                "--slack-pool-size",
+                default=DEFAULT_POOL_SIZE,
+                type=click.IntRange(min=1),
+                show_default=True,
+                help="Keep-alive connections to Slack kept open and shared by every call in the run",
+            ),
+            click.option(
+                "--slack-retries",
+                default=DEFAULT_RETRIES,
+                type=click.IntRange(min=0),
+                show_default=True,
+                help="Retries of a Slack call after a 5xx or network error, with jittered exponential backoff",
+            ),
+            click.option(
+                "--circuit-breaker-threshold",
+                default=DEFAULT_BREAKER_THRESHOLD,
+                type=click.IntRange(min=1),
+                show_default=True,
+                help="Consecutive failures of a Slack method after which its calls fail at once for a while",
+            ),
+            click.option(
+                "--run-deadline",
+                default=None,
+                type=click.FloatRange(min=0, min_open=True),
+                help="Seconds the run may spend before Slack calls stop being made (default: no limit)",
+            ),
+            click.option(
+                "--log-level",
+                default="info",
+                envvar="GOALIEBOT_LOG_LEVEL",
+                type=click.Choice(list(LEVELS)),
+                show_default=True,
+                help="Least severe events logged; 'debug' logs every Slack call with its (truncated) response",
+            ),
+            click.option(
+                "--log-format",
+                default="text",
+                envvar="GOALIEBOT_LOG_FORMAT",
+                type=click.Choice(FORMATS),
+                show_default=True,
+                help="'json' writes one JSON object per event (method, channel, latency, ok/error)",
+            ),
+            click.option(
+                "--metrics-json",
+                default=None,
+                help="Write per-phase timings and per-method Slack API metrics to this JSON file",
+            ),
+            click.option(
+                "--metrics-textfile",
+                default=None,
+                help="Write the same metrics as a Prometheus textfile (e.g. for the node exporter textfile collector)",
+            ),
+            click.option(
+                "--trace-file",
+                default=None,
+                envvar="GOALIEBOT_TRACE_FILE",
+                help="Append the run's spans (parsing, rotation, each Slack call and page) to this file as OTLP JSON",
+            ),
+        ],
+    )
+
+
+def slack_runtime_options(command):
+    """Slack options plus the ones that shape how a rotation is applied."""
+    command = _apply_options(
+        command,
+        [
+            click.option(
+                "--concurrency",
+                type=click.IntRange(min=1),
+                default=None,
+                help="Run Slack commands concurrently with at most this many requests in flight (requires aiohttp)",
+            ),
+            click.option(
+                "--reconcile",
+                is_flag=True,
+                default=False,
+                help="Read the current user group, topics and recent messages first and skip writes that change nothing",
+            ),
+        ],
+    )
+    return slack_client_options(command)
+
+
 @click.command()
 @click.option(
     "--file-path",
@@ -96,14 +471,7 @@ def resolve_user_group_id(slack_token, handle):
 @click.option(
     "--mode",
     default="next_as_deputy",
-    type=click.Choice(
-        [
-            "next_as_deputy",
-            "former_goalie_is_deputy",
-            "no_deputy",
-            "fixed_full",
-        ]
-    ),
+    type=click.Choice(MODES),
     help="Mode of deputy assignment",
 )
 @click.option(
@@ -113,36 +481,81 @@ def resolve_user_group_id(slack_token, handle):
     callback=validate_cadence,
     help="Cadence of rotation: day, week, month (default: week)",
 )
+@click.option(
+    "--availability",
+    default=None,
+    help="File of out-of-office ranges ('person, first day, last day'); people away during the coming period are skipped",
+)
+@click.option(
+    "--template",
+    default=None,
+    help="Notification template: a text file, or a .json file of Block Kit blocks",
+)
+@profile_option
+@slack_runtime_options
 def main(
-    file_path, slack_token, slack_channels, user_group_handle, commands, mode, cadence
+    file_path,
+    slack_token,
+    slack_channels,
+    user_group_handle,
+    commands,
+    mode,
+    cadence,
+    availability,
+    template,
+    directory_cache,
+    directory_cache_ttl,
+    concurrency,
+    reconcile,
+    rate_limit_state,
+    slack_base_url,
+    slack_timeout,
+    slack_pool_size,
+    slack_retries,
+    circuit_breaker_threshold,
+    run_deadline,
+    log_level,
+    log_format,
+    metrics_json,
+    metrics_textfile,
+    trace_file,
+    profile_dir,
 ):
     """Notify Slack about the goalie rotation."""
-    effective_commands = resolve_effective_commands(commands)
-    validate_required_inputs(effective_commands, slack_channels, user_group_handle)
-
-    next_goalie, next_deputy = resolve_goalie_rotation(file_path, mode)
-    print(f"✅ Next goalie: {next_goalie.handle} ({next_goalie.user_id})")
-
-    user_group_id = resolve_user_group_id(slack_token, user_group_handle)
-
-    slack_channels_list = slack_channels.split() if slack_channels else []
-
-    run_slack_commands(
-        slack_token=slack_token,
-        slack_channels=slack_channels_list,
-        next_goalie=next_goalie,
-        next_deputy=next_deputy,
-        user_group_id=user_group_id,
-        commands=effective_commands,
-        cadence=cadence,
-    )
-
-    update_goalie_file(
-        file_path=file_path,
-        next_goalie=next_goalie,
-        deputy=next_deputy,
-        mode=mode,
-    )
+    with profiled_run(profile_dir):
+        configure_slack_runtime(
+            directory_cache,
+            directory_cache_ttl,
+            rate_limit_state,
+            slack_base_url,
+            slack_timeout,
+            slack_pool_size,
+            slack_retries,
+            circuit_breaker_threshold,
+            run_deadline,
+            log_level,
+            log_format,
+            trace_file,
+        )
+        try:
+            run_rotation(
+                file_path=file_path,
+                slack_token=slack_token,
+                slack_channels=slack_channels.split() if slack_channels else [],
+                user_group_handle=user_group_handle,
+                commands=commands,
+                mode=mode,
+                cadence=cadence,
+                concurrency=concurrency,
+                reconcile=reconcile,
+                availability=load_availability(availability),
+                template=load_notification_template(template),
+            )
+        except SlackUnavailableError as e:
+            get_logger().error("slack_unavailable", f"❌ Slack is unavailable: {e}")
+            sys.exit(1)
+        finally:
+            write_run_metrics(metrics_json, metrics_textfile)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,228 @@
+import csv
+import io
+import re
+import sys
+from datetime import date, datetime, timezone
+
+import click
+
+from goaliebot.core.availability import AvailabilityCalendar
+from goaliebot.core.compact import CompactRoster
+from goaliebot.core.manifest import load_manifest
+from goaliebot.core.models import MODES, Cadence
+from goaliebot.core.schedule import RotationSchedule
+
+CSV_COLUMNS = (
+    "rotation",
+    "period",
+    "start",
+    "end",
+    "goalie",
+    "goalie_id",
+    "deputy",
+    "deputy_id",
+)
+
+
+def project_rotation(
+    name, file_path, mode, cadence, anchor, periods, availability_path=None
+):
+    """
+    ``(name, assignment)`` rows for the next ``periods`` periods of one
+    roster, skipping people away according to ``availability_path``.
+    """
+    roster = CompactRoster.load(file_path, mode=mode)
+    if roster.current_index < 0:
+        raise ValueError(f"No current goalie marked with '**' in {file_path}")
+    availability = None
+    if availability_path:
+        availability = AvailabilityCalendar.load(availability_path)
+    schedule = RotationSchedule.from_roster(roster, cadence, anchor, availability)
+    return [(name, assignment) for assignment in schedule.periods(periods)]
+
+
+def render_csv(rows):
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator="\n")
+    writer.writerow(CSV_COLUMNS)
+    for name, a in rows:
+        writer.writerow(
+            [
+                name,
+                a.period,
+                a.start.isoformat(),
+                a.end.isoformat(),
+                a.goalie.handle,
+                a.goalie.user_id,
+                a.deputy.handle if a.deputy else "",
+                a.deputy.user_id if a.deputy else "",
+            ]
+        )
+    return out.getvalue()
+
+
+def _ics_text(value):
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\n", "\\n")
+    )
+
+
+def _fold(line):
+    """Fold a content line at 75 octets, as RFC 5545 requires."""
+    if len(line) <= 75 and (line.isascii() or len(line.encode("utf-8")) <= 75):
+        return line
+    parts, current = [], b""
+    for char in line:
+        octets = char.encode("utf-8")
+        if len(current) + len(octets) > (75 if not parts else 74):
+            parts.append(current.decode("utf-8"))
+            current = b""
+        current += octets
+    parts.append(current.decode("utf-8"))
+    return "\r\n ".join(parts)
+
+
+def render_ics(rows, generated_at=None):
+    """All-day VEVENTs, one per rotation period, in a single VCALENDAR."""
+    stamp = (generated_at or datetime.now(timezone.utc)).strftime("%Y%m%dT%H%M%SZ")
+    parts = [
+        "BEGIN:VCALENDAR\r\n"
+        "VERSION:2.0\r\n"
+        "PRODID:-//goaliebot//rotation schedule//EN\r\n"
+        "CALSCALE:GREGORIAN\r\n"
+    ]
+    # Rotations sharing a calendar mostly share period boundaries.
+    ics_dates = {}
+    uid_names = {}
+    for name, a in rows:
+        start = ics_dates.get(a.start) or ics_dates.setdefault(
+            a.start, a.start.isoformat().replace("-", "")
+        )
+        end = ics_dates.get(a.end) or ics_dates.setdefault(
+            a.end, a.end.isoformat().replace("-", "")
+        )
+        uid_name = uid_names.get(name) or uid_names.setdefault(
+            name, re.sub(r"[^A-Za-z0-9_.-]", "-", name or "rotation")
+        )
+        summary = f"Goalie: {a.goalie.handle}"
+        if a.deputy:
+            summary += f" (deputy: {a.deputy.handle})"
+        if name:
+            summary = f"[{name}] {summary}"
+        parts.append(
+            f"BEGIN:VEVENT\r\n"
+            f"UID:{uid_name}-{start}@goaliebot\r\n"
+            f"DTSTAMP:{stamp}\r\n"
+            f"DTSTART;VALUE=DATE:{start}\r\n"
+            f"DTEND;VALUE=DATE:{end}\r\n"
+            f"{_fold('SUMMARY:' + _ics_text(summary))}\r\n"
+            f"TRANSP:TRANSPARENT\r\n"
+            f"END:VEVENT\r\n"
+        )
+    parts.append("END:VCALENDAR\r\n")
+    return "".join(parts)
+
+
+def _write(path, text):
+    if path == "-":
+        sys.stdout.write(text)
+        return
+    with open(path, "w", newline="") as f:
+        f.write(text)
+
+
+@click.command()
+@click.option(
+    "--file-path",
+    type=click.Path(exists=True, dir_okay=False),
+    help="Roster to project (or use --manifest)",
+)
+@click.option(
+    "--manifest",
+    type=click.Path(exists=True, dir_okay=False),
+    help="TOML manifest listing many rosters to project at once",
+)
+@click.option(
+    "--mode",
+    default="next_as_deputy",
+    type=click.Choice(MODES),
+    help="Mode of deputy assignment (with --file-path)",
+)
+@click.option(
+    "--cadence",
+    default="week",
+    type=click.Choice([c.value for c in Cadence]),
+    help="Cadence of rotation (with --file-path)",
+)
+@click.option(
+    "--anchor",
+    type=click.DateTime(formats=["%Y-%m-%d"]),
+    default=None,
+    help="Start date of the current goalie's period (default: today; manifest rotations may set 'anchor')",
+)
+@click.option(
+    "--periods",
+    type=click.IntRange(min=1),
+    default=12,
+    show_default=True,
+    help="Number of periods to project, starting with the current one",
+)
+@click.option(
+    "--availability",
+    type=click.Path(exists=True, dir_okay=False),
+    default=None,
+    help="File of out-of-office ranges (with --file-path; manifest rotations may set 'availability')",
+)
+@click.option("--csv", "csv_path", default=None, help="Write CSV here ('-' for stdout)")
+@click.option("--ics", "ics_path", default=None, help="Write ICS here ('-' for stdout)")
+def schedule(
+    file_path,
+    manifest,
+    mode,
+    cadence,
+    anchor,
+    periods,
+    availability,
+    csv_path,
+    ics_path,
+):
+    """Export upcoming goalie assignments as CSV and/or ICS."""
+    if bool(file_path) == bool(manifest):
+        print("❌ Pass exactly one of '--file-path' or '--manifest'.")
+        sys.exit(1)
+    default_anchor = anchor.date() if anchor else date.today()
+
+    try:
+        if manifest:
+            rows = []
+            for spec in load_manifest(manifest):
+                rows += project_rotation(
+                    spec.name,
+                    spec.file_path,
+                    spec.mode,
+                    spec.cadence,
+                    spec.anchor or default_anchor,
+                    periods,
+                    spec.availability,
+                )
+        else:
+            rows = project_rotation(
+                "", file_path, mode, cadence, default_anchor, periods, availability
+            )
+    except (OSError, ValueError) as e:
+        print(f"❌ Could not project the rotation schedule: {e}")
+        sys.exit(1)
+
+    if not (csv_path or ics_path):
+        csv_path = "-"
+    if csv_path:
+        _write(csv_path, render_csv(rows))
+    if ics_path:
+        _write(ics_path, render_ics(rows))
+
+
+if __name__ == "__main__":
+    schedule()
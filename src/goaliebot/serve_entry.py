@@ -0,0 +1,267 @@
+import heapq
+import signal
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+import click
+
+from goaliebot.batch_entry import run_spec
+from goaliebot.core.file_ops import RosterCache
+from goaliebot.core.manifest import load_manifest
+from goaliebot.core.triggers import DEFAULT_AT, load_zone, next_trigger
+from goaliebot.rotation_entry import (
+    configure_slack_runtime,
+    slack_runtime_options,
+    write_run_metrics,
+)
+from goaliebot.telemetry.logs import get_logger
+from goaliebot.telemetry.tracing import get_tracer
+
+
+def next_fire_time(spec, after):
+    """Unix time of the next rotation of ``spec`` after Unix time ``after``."""
+    return next_trigger(
+        spec.cadence,
+        datetime.fromtimestamp(after, timezone.utc),
+        at=spec.at or DEFAULT_AT,
+        zone=load_zone(spec.timezone),
+        anchor=spec.anchor,
+    ).timestamp()
+
+
+def _describe(fire_at):
+    return datetime.fromtimestamp(fire_at).strftime("%Y-%m-%d %H:%M:%S")
+
+
+class RotationDaemon:
+    """
+    Fires the rotations of a manifest at the start of each of their periods.
+
+    Rotations wait in a heap ordered by their next trigger time, so the
+    process sleeps until exactly the next one is due. Slack clients, the
+    directory cache and parsed rosters stay warm between rotations; a
+    roster is parsed again only when its file changes. ``reload`` re-reads
+    the manifest, e.g. on SIGHUP.
+    """
+
+    def __init__(
+        self,
+        manifest,
+        slack_token,
+        concurrency=None,
+        reconcile=False,
+        metrics_json=None,
+        metrics_textfile=None,
+        clock=time.time,
+    ):
+        self.manifest = manifest
+        self.slack_token = slack_token
+        self.concurrency = concurrency
+        self.reconcile = reconcile
+        self.metrics_json = metrics_json
+        self.metrics_textfile = metrics_textfile
+        self.clock = clock
+        self.roster_cache = RosterCache()
+        self.specs = []
+        self._queue = []
+        self._wake = threading.Event()
+        self._stopping = False
+        self._reload_requested = False
+        self._client = None
+        self._async_client = None
+        self.schedule(load_manifest(manifest))
+
+    def schedule(self, specs):
+        """
+        Replace the rotations being served and work out when each fires
+        next. Only triggers after now are considered: rotations that fell
+        due while no daemon was running are not caught up.
+        """
+        now = self.clock()
+        self.specs = specs
+        self._queue = [
+            (next_fire_time(spec, now), position) for position, spec in enumerate(specs)
+        ]
+        heapq.heapify(self._queue)
+        self._wake.set()
+
+    def reload(self):
+        """Re-read the manifest, keeping the current rotations if it is invalid."""
+        try:
+            specs = load_manifest(self.manifest)
+        except (OSError, ValueError) as e:
+            get_logger().error(
+                "invalid_manifest",
+                f"❌ Invalid manifest {self.manifest}, keeping the old one: {e}",
+            )
+            return
+        self.schedule(specs)
+        get_logger().info(
+            "manifest_reloaded",
+            f"🔁 Reloaded {len(specs)} rotations from {self.manifest}",
+        )
+
+    def upcoming(self):
+        """``(fire_at, spec)`` for every rotation, soonest first."""
+        return [
+            (fire_at, self.specs[position]) for fire_at, position in sorted(self._queue)
+        ]
+
+    def run_due(self):
+        """Fire every rotation that is due and return their RotationResults."""
+        results = []
+        while self._queue and self._queue[0][0] <= self.clock():
+            fire_at, position = heapq.heappop(self._queue)
+            spec = self.specs[position]
+            results.append(self._rotate(spec))
+            # A rotation missed while the process was asleep (a suspended
+            # host, a long rotation) fires once, not once per missed period.
+            after = max(fire_at, self.clock())
+            heapq.heappush(self._queue, (next_fire_time(spec, after), position))
+        return results
+
+    def _rotate(self, spec):
+        from goaliebot.slack_api.client import get_client
+        from goaliebot.slack_api.ratelimit import get_scheduler
+
+        # The run deadline applies to each rotation, not the whole daemon,
+        # and each rotation is traced on its own.
+        get_scheduler().resilience.start_run()
+        get_tracer().start_run("goaliebot serve", **{"goaliebot.rotation": spec.name})
+
+        if self._client is None:
+            self._client = get_client(self.slack_token)
+        if self.concurrency and self._async_client is None:
+            from goaliebot.operations.command_runner import create_async_client
+
+            self._async_client = create_async_client(self.slack_token)
+        state = None
+        if self.reconcile:
+            from goaliebot.slack_api.state import SlackStateReader
+
+            # Fresh per rotation: Slack's state moves on between triggers.
+            state = SlackStateReader()
+
+        result = run_spec(
+            spec,
+            self.slack_token,
+            self._client,
+            async_client=self._async_client,
+            concurrency=self.concurrency,
+            reconcile=self.reconcile,
+            state=state,
+            roster_cache=self.roster_cache,
+        )
+        if not result.ok:
+            get_logger().error(
+                "rotation_failed", f"❌ {spec.name}: {result.error}", error=result.error
+            )
+        write_run_metrics(self.metrics_json, self.metrics_textfile)
+        return result
+
+    def seconds_until_next(self):
+        if not self._queue:
+            return None
+        return max(self._queue[0][0] - self.clock(), 0.0)
+
+    def run(self):
+        """Serve until ``stop`` is called."""
+        while not self._stopping:
+            self._wake.clear()
+            if self._reload_requested:
+                self._reload_requested = False
+                self.reload()
+            self.run_due()
+            self._wake.wait(self.seconds_until_next())
+
+    def request_reload(self):
+        self._reload_requested = True
+        self._wake.set()
+
+    def stop(self):
+        self._stopping = True
+        self._wake.set()
+
+
+@click.command()
+@click.option(
+    "--manifest",
+    required=True,
+    type=click.Path(exists=True, dir_okay=False),
+    help="TOML file listing the rotations to serve (rotations may set 'timezone' and 'at')",
+)
+@click.option(
+    "--slack-token",
+    required=True,
+    envvar="SLACK_TOKEN",
+    help="Slack API token (or set SLACK_TOKEN)",
+)
+@slack_runtime_options
+def serve(
+    manifest,
+    slack_token,
+    directory_cache,
+    directory_cache_ttl,
+    concurrency,
+    reconcile,
+    rate_limit_state,
+    slack_base_url,
+    slack_timeout,
+    slack_pool_size,
+    slack_retries,
+    circuit_breaker_threshold,
+    run_deadline,
+    log_level,
+    log_format,
+    metrics_json,
+    metrics_textfile,
+    trace_file,
+):
+    """Run every rotation in a manifest on time from one long-running process."""
+    configure_slack_runtime(
+        directory_cache,
+        directory_cache_ttl,
+        rate_limit_state,
+        slack_base_url,
+        slack_timeout,
+        slack_pool_size,
+        slack_retries,
+        circuit_breaker_threshold,
+        run_deadline,
+        log_level,
+        log_format,
+        trace_file,
+    )
+    try:
+        daemon = RotationDaemon(
+            manifest,
+            slack_token,
+            concurrency=concurrency,
+            reconcile=reconcile,
+            metrics_json=metrics_json,
+            metrics_textfile=metrics_textfile,
+        )
+    except (OSError, ValueError) as e:
+        get_logger().error("invalid_manifest", f"❌ Invalid manifest {manifest}: {e}")
+        sys.exit(1)
+
+    signal.signal(signal.SIGTERM, lambda signum, frame: daemon.stop())
+    signal.signal(signal.SIGINT, lambda signum, frame: daemon.stop())
+    if hasattr(signal, "SIGHUP"):
+        signal.signal(signal.SIGHUP, lambda signum, frame: daemon.request_reload())
+
+    logger = get_logger()
+    logger.info("serving", f"👀 Serving {len(daemon.specs)} rotations from {manifest}")
+    for fire_at, spec in daemon.upcoming():
+        logger.info(
+            "rotation_scheduled",
+            f"⏰ {spec.name}: next rotation at {_describe(fire_at)}",
+        )
+    daemon.run()
+    logger.info("stopped", "👋 Stopped.")
+
+
+if __name__ == "__main__":
+    serve()
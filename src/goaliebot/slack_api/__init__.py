@@ -1,5 +1,41 @@
-# flake8: noqa: F401
+"""
+Slack Web API helpers.
 
-from .usergroup import get_user_group_id, update_usergroup_with_goalie_and_deputy
-from .messaging import send_goalie_notification
-from .channel import update_channel_description
+Names are resolved lazily (PEP 562) so that importing one light submodule,
+such as the directory cache or the rate-limit scheduler, does not pull in
+slack_sdk before a Slack call is actually made.
+"""
+
+from importlib import import_module
+
+_EXPORTS = {
+    "get_user_group_id": "usergroup",
+    "update_usergroup_with_goalie_and_deputy": "usergroup",
+    "update_usergroup_with_goalie_and_deputy_async": "usergroup",
+    "send_goalie_notification": "messaging",
+    "send_goalie_notification_async": "messaging",
+    "update_channel_description": "channel",
+    "update_channel_description_async": "channel",
+    "get_channel_id": "channel",
+    "schedule_message": "scheduled",
+    "delete_scheduled_message": "scheduled",
+    "SlackDirectory": "directory",
+    "configure_directory": "directory",
+    "get_directory": "directory",
+    "SlackStateReader": "state",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -1,7 +1,64 @@
+import asyncio
+
 from slack_sdk.errors import SlackApiError
 
+from goaliebot.telemetry.logs import get_logger
+
+from .directory import CHANNELS, get_directory, is_not_found_error
+from .ratelimit import aslack_call, slack_call
+
+
+def _report_updating(channel):
+    get_logger().info(
+        "topic_updating",
+        f"Updating description for channel: {channel}",
+        method="conversations_setTopic",
+        channel=channel,
+    )
+
+
+def _report_updated(channel, new_description):
+    get_logger().info(
+        "topic_updated",
+        f"Channel description updated to: {new_description}.",
+        method="conversations_setTopic",
+        channel=channel,
+        ok=True,
+    )
+
 
-def update_channel_description(client, slack_channels, new_description):
+def _report_update_failed(channel, error):
+    get_logger().error(
+        "topic_failed",
+        f"Error updating channel description: {error.response['error']}",
+        method="conversations_setTopic",
+        channel=channel,
+        ok=False,
+        error=error.response["error"],
+    )
+
+
+def _report_lookup_failed(channel, error):
+    get_logger().error(
+        "channel_lookup_failed",
+        f"Error fetching channels: {error.response['error']}",
+        method="conversations_list",
+        channel=channel,
+        ok=False,
+        error=error.response["error"],
+    )
+
+
+def _report_not_found(channel):
+    get_logger().warning(
+        "channel_not_found",
+        f"Channel {channel} not found.",
+        channel=channel,
+        error="channel_not_found",
+    )
+
+
+def update_channel_description(client, slack_channels, new_description, directory=None):
     """
     Update the description of a Slack channel.
 
@@ -9,39 +66,97 @@ def update_channel_description(client, slack_channels, new_description):
     - client: An instance of the Slack WebClient.
     - slack_channels: A list of Slack channel IDs or names to send the notification to.
     - new_description: The new description to set for the channel.
+    - directory: Optional SlackDirectory used to resolve channel names.
+
+    Returns the channels whose topic was set.
     """
+    directory = directory or get_directory()
+    updated = []
     for channel in slack_channels:
-        print(f"Updating description for channel: {channel}")
+        _report_updating(channel)
         try:
-            channel_id = get_channel_id(client, channel)
-            response = client.conversations_setTopic(
-                channel=channel_id, topic=new_description
-            )
-            print(
-                f"Channel description updated to: {new_description}. Response: {response}"
+            channel_id = get_channel_id(client, channel, directory=directory)
+            if channel_id is None:
+                continue
+            slack_call(
+                client,
+                "conversations_setTopic",
+                channel=channel_id,
+                topic=new_description,
             )
+            _report_updated(channel, new_description)
+            updated.append(channel)
 
         except SlackApiError as e:
-            print(f"Error updating channel description: {e.response['error']}")
+            if is_not_found_error(e):
+                directory.invalidate(client, CHANNELS, channel)
+            _report_update_failed(channel, e)
+    return updated
 
 
-def get_channel_id(client, channel_handle):
-    """Fetch the channel ID from the channel handle."""
+def get_channel_id(client, channel_handle, directory=None):
+    """Fetch the channel ID from the channel handle, using the cached directory."""
     try:
-        cursor = None
-        while True:
-            response = client.conversations_list(cursor=cursor)
-            for channel in response["channels"]:
-                if channel["name"] == channel_handle.strip("#"):
-                    return channel["id"]
-
-            cursor = response.get("response_metadata", {}).get("next_cursor")
-            if not cursor:
-                break
-
-        print(f"Channel {channel_handle} not found.")
-        return None
+        channel_id = (directory or get_directory()).channel_id(client, channel_handle)
+        if channel_id is None:
+            _report_not_found(channel_handle)
+        return channel_id
 
     except SlackApiError as e:
-        print(f"Error fetching channels: {e.response['error']}")
+        _report_lookup_failed(channel_handle, e)
         return None
+
+
+async def update_channel_description_async(
+    client,
+    slack_channels,
+    new_description,
+    concurrency,
+    directory=None,
+    semaphore=None,
+):
+    """
+    Async counterpart of update_channel_description.
+
+    Channel names are resolved first (one directory pass at most), then the
+    topic updates fan out with at most ``concurrency`` requests in flight,
+    or as many as ``semaphore`` (shared with other commands) lets through.
+    Returns the channels whose topic was set.
+    """
+    directory = directory or get_directory()
+    semaphore = semaphore or asyncio.Semaphore(concurrency)
+
+    channel_ids = {}
+    for channel in slack_channels:
+        try:
+            async with semaphore:
+                channel_ids[channel] = await directory.achannel_id(client, channel)
+        except SlackApiError as e:
+            _report_lookup_failed(channel, e)
+            channel_ids[channel] = None
+        if channel_ids[channel] is None:
+            _report_not_found(channel)
+
+    async def update(channel):
+        if channel_ids[channel] is None:
+            return False
+        async with semaphore:
+            _report_updating(channel)
+            try:
+                await aslack_call(
+                    client,
+                    "conversations_setTopic",
+                    channel=channel_ids[channel],
+                    topic=new_description,
+                )
+                _report_updated(channel, new_description)
+                return True
+
+            except SlackApiError as e:
+                if is_not_found_error(e):
+                    directory.invalidate(client, CHANNELS, channel)
+                _report_update_failed(channel, e)
+                return False
+
+    results = await asyncio.gather(*(update(channel) for channel in slack_channels))
+    return [channel for channel, ok in zip(slack_channels, results) if ok]
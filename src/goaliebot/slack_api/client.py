@@ -0,0 +1,91 @@
+import os
+from contextlib import asynccontextmanager
+
+BASE_URL_ENV = "GOALIEBOT_SLACK_BASE_URL"
+DEFAULT_BASE_URL = "https://slack.com/api/"
+DEFAULT_TIMEOUT = 30
+DEFAULT_POOL_SIZE = 10
+
+_base_url = None
+_timeout = DEFAULT_TIMEOUT
+_pool_size = DEFAULT_POOL_SIZE
+_clients = {}
+
+
+def configure_client(
+    base_url=None, timeout=DEFAULT_TIMEOUT, pool_size=DEFAULT_POOL_SIZE
+):
+    """
+    Set the endpoint, per-request timeout (seconds) and keep-alive pool size
+    of every Slack client goaliebot creates, dropping clients made before.
+    """
+    global _base_url, _timeout, _pool_size
+    _base_url = base_url
+    _timeout = timeout
+    _pool_size = pool_size
+    for client in _clients.values():
+        client.pool.close()
+    _clients.clear()
+
+
+def get_base_url():
+    """The configured Slack API base URL, then $GOALIEBOT_SLACK_BASE_URL, then Slack's."""
+    return _base_url or os.environ.get(BASE_URL_ENV) or DEFAULT_BASE_URL
+
+
+def get_client(slack_token):
+    """
+    The process-wide blocking client for ``slack_token``, created on first
+    use. Lookups and writes share it, and with it one keep-alive pool.
+    """
+    client = _clients.get(slack_token)
+    if client is None:
+        from .pool import PooledWebClient
+
+        # slack_sdk's own handlers resend any request whose connection
+        # dropped; the scheduler's retries know which methods that is safe for.
+        client = PooledWebClient(
+            token=slack_token,
+            base_url=get_base_url(),
+            timeout=_timeout,
+            pool_size=_pool_size,
+            retry_handlers=[],
+        )
+        _clients[slack_token] = client
+    return client
+
+
+def create_async_web_client(slack_token):
+    """AsyncWebClient for ``slack_token``; requires aiohttp."""
+    from slack_sdk.web.async_client import AsyncWebClient
+
+    return AsyncWebClient(
+        token=slack_token,
+        base_url=get_base_url(),
+        timeout=_timeout,
+        retry_handlers=[],
+    )
+
+
+@asynccontextmanager
+async def pooled_session(client):
+    """
+    Give an AsyncWebClient one keep-alive aiohttp session, limited to the
+    configured pool size, for the duration of the block. Without it the
+    client opens a new session, and connection, for every call.
+    """
+    import aiohttp
+    from slack_sdk.web.async_client import AsyncWebClient
+
+    if not isinstance(client, AsyncWebClient) or (
+        client.session is not None and not client.session.closed
+    ):
+        yield client
+        return
+    connector = aiohttp.TCPConnector(limit=_pool_size)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        client.session = session
+        try:
+            yield client
+        finally:
+            client.session = None
@@ -0,0 +1,317 @@
+import itertools
+import json
+import os
+import re
+import tempfile
+import time
+
+from goaliebot.telemetry.logs import get_logger
+from goaliebot.telemetry.tracing import page_span
+
+from .ratelimit import aslack_call, slack_call, workspace_key
+
+CHANNEL_ID_PATTERN = re.compile(r"^[CGD][A-Z0-9]{8,}$")
+USER_GROUP_ID_PATTERN = re.compile(r"^S[A-Z0-9]{8,}$")
+
+DEFAULT_TTL = 24 * 60 * 60
+CHANNELS = "channels"
+USER_GROUPS = "usergroups"
+USERS = "users"
+
+
+def default_cache_dir():
+    """Return the directory holding goaliebot's local caches."""
+    base = os.environ.get("GOALIEBOT_CACHE_DIR")
+    if not base:
+        xdg = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+        base = os.path.join(xdg, "goaliebot")
+    return base
+
+
+def default_cache_path():
+    """Return the on-disk location of the directory cache."""
+    return os.path.join(default_cache_dir(), "slack_directory.json")
+
+
+def _fetch_channels(client):
+    """Build a channel name -> ID index in a single paginated pass."""
+    index = {}
+    cursor = None
+    for page in itertools.count(1):
+        with page_span("conversations_list", page):
+            response = slack_call(
+                client,
+                "conversations_list",
+                cursor=cursor,
+                limit=1000,
+                exclude_archived=True,
+            )
+        for channel in response["channels"]:
+            index[channel["name"]] = channel["id"]
+
+        cursor = response.get("response_metadata", {}).get("next_cursor")
+        if not cursor:
+            return index
+
+
+def _fetch_user_groups(client):
+    """Build a user group handle -> ID index from a single usergroups.list call."""
+    response = slack_call(client, "usergroups_list")
+    return {group["handle"]: group["id"] for group in response["usergroups"]}
+
+
+def _user_record(member):
+    profile = member.get("profile") or {}
+    return {
+        "name": member.get("name", ""),
+        "display_name": profile.get("display_name", ""),
+        "real_name": profile.get("real_name") or member.get("real_name", ""),
+        "email": profile.get("email"),
+        "deleted": bool(member.get("deleted")),
+    }
+
+
+def _without_email(record):
+    return {field: value for field, value in record.items() if field != "email"}
+
+
+def _without_emails(state):
+    """The cache state with users' e-mail addresses left out, for writing."""
+    persisted = {}
+    for key, workspace in state.items():
+        persisted[key] = dict(workspace)
+        users = workspace.get(USERS)
+        if users:
+            persisted[key][USERS] = {
+                "fetched_at": users["fetched_at"],
+                "index": {
+                    user_id: _without_email(record)
+                    for user_id, record in users["index"].items()
+                },
+            }
+    return persisted
+
+
+def _fetch_users(client):
+    """Build a user ID -> profile index in a single paginated users.list pass."""
+    index = {}
+    cursor = None
+    for page in itertools.count(1):
+        with page_span("users_list", page):
+            response = slack_call(client, "users_list", cursor=cursor, limit=200)
+        for member in response["members"]:
+            index[member["id"]] = _user_record(member)
+
+        cursor = response.get("response_metadata", {}).get("next_cursor")
+        if not cursor:
+            return index
+
+
+async def _afetch_channels(client):
+    """Async counterpart of _fetch_channels for an AsyncWebClient."""
+    index = {}
+    cursor = None
+    for page in itertools.count(1):
+        with page_span("conversations_list", page):
+            response = await aslack_call(
+                client,
+                "conversations_list",
+                cursor=cursor,
+                limit=1000,
+                exclude_archived=True,
+            )
+        for channel in response["channels"]:
+            index[channel["name"]] = channel["id"]
+
+        cursor = response.get("response_metadata", {}).get("next_cursor")
+        if not cursor:
+            return index
+
+
+async def _afetch_user_groups(client):
+    """Async counterpart of _fetch_user_groups for an AsyncWebClient."""
+    response = await aslack_call(client, "usergroups_list")
+    return {group["handle"]: group["id"] for group in response["usergroups"]}
+
+
+FETCHERS = {
+    CHANNELS: _fetch_channels,
+    USER_GROUPS: _fetch_user_groups,
+    USERS: _fetch_users,
+}
+
+ASYNC_FETCHERS = {
+    CHANNELS: _afetch_channels,
+    USER_GROUPS: _afetch_user_groups,
+}
+
+
+class SlackDirectory:
+    """
+    Name -> ID index for Slack channels and user groups, and ID -> profile
+    index for users.
+
+    Each index is built with one paginated listing and persisted to
+    ``cache_path`` so later runs resolve names without touching the API.
+    Entries older than ``ttl`` seconds are refetched, and a name missing from
+    a cached index triggers a single refresh before it is reported as not
+    found. Pass ``cache_path=None`` to keep the index in memory only.
+    """
+
+    def __init__(self, cache_path=None, ttl=DEFAULT_TTL):
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self._state = self._load()
+        self._refreshed = set()
+
+    def channel_id(self, client, channel):
+        """Resolve a channel name (with or without ``#``) or ID to its ID."""
+        name = channel.strip().lstrip("#")
+        if CHANNEL_ID_PATTERN.match(name):
+            return name
+        return self._lookup(client, CHANNELS, name)
+
+    def user_group_id(self, client, handle):
+        """Resolve a user group handle (with or without ``@``) or ID to its ID."""
+        name = handle.strip().lstrip("@")
+        if USER_GROUP_ID_PATTERN.match(name):
+            return name
+        return self._lookup(client, USER_GROUPS, name)
+
+    def users(self, client, expected=(), refresh=False, emails=False):
+        """
+        User ID -> ``{name, display_name, real_name, deleted}`` for the
+        whole workspace, plus ``email`` with ``emails``. A cached index
+        missing any of the ``expected`` IDs is refetched once, and with
+        ``refresh`` the index is fetched anew unless this process already
+        did. E-mail addresses are never written to the cache file, so
+        ``emails`` always fetches unless this process already did.
+        """
+        key = workspace_key(client)
+        entry = None
+        if not (refresh or emails) or (key, USERS) in self._refreshed:
+            entry = self._fresh_entry(key, USERS)
+        if entry is None:
+            entry = self._refresh(client, key, USERS)
+        if (key, USERS) not in self._refreshed and any(
+            user_id not in entry["index"] for user_id in expected
+        ):
+            entry = self._refresh(client, key, USERS)
+        if emails:
+            return entry["index"]
+        return {
+            user_id: _without_email(record)
+            for user_id, record in entry["index"].items()
+        }
+
+    async def achannel_id(self, client, channel):
+        """Async counterpart of channel_id for an AsyncWebClient."""
+        name = channel.strip().lstrip("#")
+        if CHANNEL_ID_PATTERN.match(name):
+            return name
+        return await self._alookup(client, CHANNELS, name)
+
+    def invalidate(self, client, kind, name=None):
+        """Drop one cached entry, or the whole index when ``name`` is None."""
+        workspace = self._state.get(workspace_key(client), {})
+        if name is None:
+            workspace.pop(kind, None)
+        else:
+            entry = workspace.get(kind)
+            if entry:
+                entry["index"].pop(name.strip().lstrip("#@"), None)
+        self._save()
+
+    def _lookup(self, client, kind, name):
+        key = workspace_key(client)
+        entry = self._fresh_entry(key, kind)
+        if entry is None:
+            entry = self._refresh(client, key, kind)
+
+        found = entry["index"].get(name)
+        if found is None and (key, kind) not in self._refreshed:
+            # The cached index may predate the channel or group: refetch once.
+            found = self._refresh(client, key, kind)["index"].get(name)
+        return found
+
+    async def _alookup(self, client, kind, name):
+        key = workspace_key(client)
+        entry = self._fresh_entry(key, kind)
+        if entry is None:
+            entry = self._store(key, kind, await ASYNC_FETCHERS[kind](client))
+
+        found = entry["index"].get(name)
+        if found is None and (key, kind) not in self._refreshed:
+            entry = self._store(key, kind, await ASYNC_FETCHERS[kind](client))
+            found = entry["index"].get(name)
+        return found
+
+    def _fresh_entry(self, key, kind):
+        entry = self._state.get(key, {}).get(kind)
+        if not entry or time.time() - entry["fetched_at"] > self.ttl:
+            return None
+        return entry
+
+    def _refresh(self, client, key, kind):
+        return self._store(key, kind, FETCHERS[kind](client))
+
+    def _store(self, key, kind, index):
+        entry = {"fetched_at": time.time(), "index": index}
+        self._state.setdefault(key, {})[kind] = entry
+        self._refreshed.add((key, kind))
+        self._save()
+        return entry
+
+    def _load(self):
+        if not self.cache_path:
+            return {}
+        try:
+            with open(self.cache_path, "r") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return state if isinstance(state, dict) else {}
+
+    def _save(self):
+        if not self.cache_path:
+            return
+        try:
+            directory = os.path.dirname(self.cache_path) or "."
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(_without_emails(self._state), f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            get_logger().warning(
+                "directory_cache_write_failed",
+                f"⚠️ Could not write Slack directory cache: {e}",
+                error=str(e),
+            )
+
+
+_default_directory = None
+
+
+def configure_directory(cache_path=None, ttl=DEFAULT_TTL):
+    """Replace the process-wide directory, e.g. to point it at another file."""
+    global _default_directory
+    _default_directory = SlackDirectory(cache_path=cache_path, ttl=ttl)
+    return _default_directory
+
+
+def get_directory():
+    """Return the process-wide directory, creating it on first use."""
+    global _default_directory
+    if _default_directory is None:
+        _default_directory = SlackDirectory(cache_path=default_cache_path())
+    return _default_directory
+
+
+def is_not_found_error(error):
+    """True when a SlackApiError means a cached ID no longer exists."""
+    from slack_sdk.errors import SlackApiError
+
+    if not isinstance(error, SlackApiError):
+        return False
+    return error.response.get("error") in ("channel_not_found", "no_such_subteam")
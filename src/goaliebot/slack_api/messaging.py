@@ -1,7 +1,34 @@
+import asyncio
+
 from slack_sdk.errors import SlackApiError
 
+from goaliebot.telemetry.logs import get_logger
+
+from .ratelimit import aslack_call, slack_call
+
+
+def _report_sent(channel):
+    get_logger().info(
+        "message_sent",
+        f"Message sent to {channel}.",
+        method="chat_postMessage",
+        channel=channel,
+        ok=True,
+    )
 
-def send_goalie_notification(client, slack_channels, message):
+
+def _report_failed(channel, error):
+    get_logger().error(
+        "message_failed",
+        f"Error sending message to Slack channel {channel}: {error.response['error']}",
+        method="chat_postMessage",
+        channel=channel,
+        ok=False,
+        error=error.response["error"],
+    )
+
+
+def send_goalie_notification(client, slack_channels, message, blocks=None):
     """
     Send a notification to Slack channels announcing the new goaliebot and deputy.
 
@@ -11,16 +38,59 @@ def send_goalie_notification(client, slack_channels, message):
     - next_goalie: The next User object to be assigned as the goaliebot.
     - deputy: The current goaliebot User object who becomes the deputy.
     - user_group_id: The Slack user group ID that represents the team or group.
+    - blocks: Optional Block Kit blocks; ``message`` is then the notification fallback.
+
+    Returns the channels the message was posted to.
     """
+    extra = {} if blocks is None else {"blocks": blocks}
 
+    sent = []
     for channel in slack_channels:
         try:
-            response = client.chat_postMessage(
-                type="mrkdown", channel=channel, text=message
+            slack_call(
+                client,
+                "chat_postMessage",
+                type="mrkdown",
+                channel=channel,
+                text=message,
+                **extra,
             )
-            print(f"Message sent to {channel}. Response: {response}")
+            _report_sent(channel)
+            sent.append(channel)
 
         except SlackApiError as e:
-            print(
-                f"Error sending message to Slack channel {channel}: {e.response['error']}"
-            )
+            _report_failed(channel, e)
+    return sent
+
+
+async def send_goalie_notification_async(
+    client, slack_channels, message, concurrency, blocks=None, semaphore=None
+):
+    """
+    Async counterpart of send_goalie_notification, posting to at most
+    ``concurrency`` channels at a time, or as many as ``semaphore`` (shared
+    with other commands) lets through. Returns the channels posted to.
+    """
+    extra = {} if blocks is None else {"blocks": blocks}
+    semaphore = semaphore or asyncio.Semaphore(concurrency)
+
+    async def send(channel):
+        async with semaphore:
+            try:
+                await aslack_call(
+                    client,
+                    "chat_postMessage",
+                    type="mrkdown",
+                    channel=channel,
+                    text=message,
+                    **extra,
+                )
+                _report_sent(channel)
+                return True
+
+            except SlackApiError as e:
+                _report_failed(channel, e)
+                return False
+
+    results = await asyncio.gather(*(send(channel) for channel in slack_channels))
+    return [channel for channel, ok in zip(slack_channels, results) if ok]
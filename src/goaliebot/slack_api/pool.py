@@ -0,0 +1,198 @@
+import http.client
+import inspect
+import io
+import threading
+import time
+from urllib.error import HTTPError, URLError
+
+from slack_sdk import WebClient
+
+from goaliebot.telemetry.logs import get_logger
+
+from .ratelimit import get_scheduler
+from .resilience import NON_IDEMPOTENT_METHODS
+
+# Connections idle for longer than this are closed rather than reused, to
+# stay well inside the keep-alive timeouts of Slack's load balancers.
+MAX_IDLE_SECONDS = 30
+
+# The slack_sdk method PooledWebClient overrides to send requests over the
+# pool. It is private, so its signature is checked when this module loads
+# and slack_sdk's own transport is used if it has changed.
+TRANSPORT_HOOK = "_perform_urllib_http_request_internal"
+TRANSPORT_HOOK_PARAMETERS = ["self", "url", "req"]
+
+# Errors that mean a reused keep-alive connection had been closed by the
+# server. Raised while sending, the request never arrived and is sent again.
+# Raised while reading the response, the server may have acted on it, so it
+# is only sent again for idempotent methods.
+STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+
+class ConnectionPool:
+    """
+    Keep-alive HTTP(S) connections, shared by threads.
+
+    At most ``size`` idle connections are kept per host. A request that finds
+    none idle opens a new one rather than waiting, and it is closed instead of
+    returned if the pool is already full.
+    """
+
+    def __init__(self, size=10, timeout=30, ssl_context=None):
+        self.size = size
+        self.timeout = timeout
+        self.ssl_context = ssl_context
+        self.connections_opened = 0
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def _connect(self, scheme, host):
+        self.connections_opened += 1
+        if scheme == "https":
+            return http.client.HTTPSConnection(
+                host, timeout=self.timeout, context=self.ssl_context
+            )
+        return http.client.HTTPConnection(host, timeout=self.timeout)
+
+    def _acquire(self, key):
+        now = time.monotonic()
+        with self._lock:
+            idle = self._idle.get(key, [])
+            while idle:
+                connection, last_used = idle.pop()
+                if now - last_used <= MAX_IDLE_SECONDS:
+                    return connection, True
+                connection.close()
+        return self._connect(*key), False
+
+    def _release(self, key, connection):
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.size:
+                idle.append((connection, time.monotonic()))
+                return
+        connection.close()
+
+    def request(self, req, timeout=None):
+        """
+        Send a urllib Request over a pooled connection, waiting at most
+        ``timeout`` seconds (default: the pool's) on the socket.
+
+        Returns ``(status, reason, headers, body)``, where ``headers`` is an
+        ``http.client.HTTPMessage`` and ``body`` is bytes.
+        """
+        key = (req.type, req.host)
+        timeout = self.timeout if timeout is None else timeout
+        while True:
+            connection, reused = self._acquire(key)
+            connection.timeout = timeout
+            if connection.sock is not None:
+                connection.sock.settimeout(timeout)
+            try:
+                connection.request(
+                    req.get_method(),
+                    req.selector,
+                    body=req.data,
+                    headers=dict(req.header_items()),
+                )
+            except BaseException as e:
+                connection.close()
+                if reused and isinstance(e, STALE_CONNECTION_ERRORS):
+                    continue
+                if isinstance(e, OSError):
+                    # As urlopen does, so callers know it was never sent.
+                    raise URLError(e) from e
+                raise
+            try:
+                response = connection.getresponse()
+                body = response.read()
+            except STALE_CONNECTION_ERRORS:
+                connection.close()
+                if reused and is_idempotent(req):
+                    continue
+                raise
+            except BaseException:
+                connection.close()
+                raise
+
+            if response.will_close:
+                connection.close()
+            else:
+                self._release(key, connection)
+            return response.status, response.reason, response.headers, body
+
+    def close(self):
+        with self._lock:
+            for idle in self._idle.values():
+                for connection, _ in idle:
+                    connection.close()
+            self._idle.clear()
+
+
+def is_idempotent(req):
+    """Whether the Slack method ``req`` calls has the same effect when repeated."""
+    method = req.selector.split("?")[0].rsplit("/", 1)[-1]
+    return method.replace(".", "_") not in NON_IDEMPOTENT_METHODS
+
+
+def transport_hook_supported(client_class=WebClient):
+    """Whether slack_sdk has the method pooling overrides, with the expected signature."""
+    hook = getattr(client_class, TRANSPORT_HOOK, None)
+    if not callable(hook):
+        return False
+    try:
+        parameters = list(inspect.signature(hook).parameters)
+    except (TypeError, ValueError):
+        return False
+    return parameters == TRANSPORT_HOOK_PARAMETERS
+
+
+POOLED_TRANSPORT = transport_hook_supported()
+
+
+class PooledWebClient(WebClient):
+    """
+    WebClient that sends requests over a keep-alive ConnectionPool instead
+    of opening a new connection (and TLS handshake) with ``urlopen`` for
+    every call. Responses, including HTTP errors, are handed back to
+    slack_sdk exactly as ``urlopen`` would, so its retry handling and
+    SlackResponse parsing are unchanged. Requests through a proxy fall
+    back to slack_sdk's own transport, as do all requests if the slack_sdk
+    installed has changed the method this overrides. Each request's
+    timeout is cut to the time left before the run deadline.
+    """
+
+    def __init__(self, *args, pool_size=10, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool = ConnectionPool(
+            size=pool_size, timeout=self.timeout, ssl_context=self.ssl
+        )
+        self.pooled_transport = POOLED_TRANSPORT
+        if not self.pooled_transport:
+            get_logger().warning(
+                "slack_transport",
+                f"⚠️ This slack_sdk version has no {TRANSPORT_HOOK}(url, req); "
+                f"Slack requests will not reuse connections.",
+            )
+
+    def _perform_urllib_http_request_internal(self, *args, **kwargs):
+        if not self.pooled_transport:
+            return super()._perform_urllib_http_request_internal(*args, **kwargs)
+        return self._pooled_request(*args, **kwargs)
+
+    def _pooled_request(self, url, req):
+        if self.proxy is not None or not url.lower().startswith("http"):
+            return super()._perform_urllib_http_request_internal(url, req)
+
+        timeout = get_scheduler().resilience.call_timeout(self.timeout)
+        status, reason, headers, body = self.pool.request(req, timeout)
+        if status >= 400:
+            raise HTTPError(req.full_url, status, reason, headers, io.BytesIO(body))
+        if headers.get_content_type() == "application/gzip":
+            return {"status": status, "headers": headers, "body": body}
+        charset = headers.get_content_charset() or "utf-8"
+        return {"status": status, "headers": headers, "body": body.decode(charset)}
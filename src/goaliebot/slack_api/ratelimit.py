@@ -0,0 +1,322 @@
+import hashlib
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from goaliebot.telemetry.logs import get_logger
+from goaliebot.telemetry.metrics import get_metrics
+from goaliebot.telemetry.tracing import SPAN_KIND_CLIENT, get_tracer
+
+from .resilience import Resilience, describe_error
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+# Slack's published rate-limit tiers as (requests per minute, burst size).
+TIERS = {
+    1: (1, 1),
+    2: (20, 5),
+    3: (50, 10),
+    4: (100, 20),
+    # chat.postMessage: roughly one message per second per channel.
+    "special": (60, 1),
+}
+
+METHOD_TIERS = {
+    "conversations_history": 3,
+    "conversations_info": 3,
+    "conversations_list": 2,
+    "conversations_setTopic": 2,
+    "usergroups_list": 2,
+    "usergroups_users_update": 2,
+    "users_list": 2,
+    "chat_postMessage": "special",
+    "chat_scheduleMessage": 3,
+    "chat_deleteScheduledMessage": 3,
+}
+
+DEFAULT_TIER = 3
+DEFAULT_MAX_RETRIES = 10
+
+# Methods whose limit applies per channel rather than per workspace.
+PER_CHANNEL_METHODS = {"chat_postMessage"}
+
+
+def workspace_key(client):
+    """Digest of the client's token, used to keep workspaces apart in shared state."""
+    token = getattr(client, "token", None) or ""
+    return hashlib.sha256(token.encode()).hexdigest()[:16]
+
+
+def _retry_after(error):
+    """Seconds to wait when a SlackApiError is a 429, otherwise None."""
+    response = error.response
+    if getattr(response, "status_code", None) != 429:
+        return None
+    headers = getattr(response, "headers", None) or {}
+    value = headers.get("retry-after", headers.get("Retry-After", 1))
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        return 1.0
+
+
+def _call_span(method, kwargs):
+    return get_tracer().span(
+        f"slack.{method}",
+        kind=SPAN_KIND_CLIENT,
+        **{"slack.method": method, "slack.channel": kwargs.get("channel")},
+    )
+
+
+def _log_call(method, kwargs, elapsed, response, error=None):
+    get_logger().slack_call(
+        method,
+        elapsed,
+        response,
+        channel=kwargs.get("channel"),
+        error=None if error is None else describe_error(error),
+    )
+
+
+class RateLimitScheduler:
+    """
+    Token-bucket scheduler that every Slack Web API call goes through.
+
+    Each method gets a bucket sized by its Slack rate-limit tier, keyed by
+    workspace (and by channel for per-channel methods). Callers that find the
+    bucket empty reserve the next free slot and sleep until then, so calls
+    queue instead of failing. A 429 blocks the bucket for ``Retry-After``
+    seconds and the call is retried up to ``max_retries`` times.
+
+    With ``state_file`` set, bucket state lives in that file behind an
+    ``flock`` so several processes on one host share the same budget.
+
+    Other transient failures are retried with backoff, and every call is
+    held to the per-method circuit breakers and run deadline of
+    ``resilience``.
+    """
+
+    def __init__(
+        self,
+        state_file=None,
+        max_retries=DEFAULT_MAX_RETRIES,
+        throttle=True,
+        resilience=None,
+    ):
+        self.state_file = state_file
+        self.max_retries = max_retries
+        self.throttle = throttle
+        self.resilience = resilience or Resilience()
+        self._lock = threading.Lock()
+        self._state = {}
+
+    def call(self, client, method, **kwargs):
+        """Call ``client.<method>(**kwargs)`` within the method's rate limit."""
+        with _call_span(method, kwargs) as span:
+            return self._call(client, method, kwargs, span)
+
+    def _call(self, client, method, kwargs, span):
+        from slack_sdk.errors import SlackApiError
+
+        key = self._bucket_key(client, method, kwargs)
+        metrics = get_metrics()
+        guard = self.resilience.guard(method)
+        attempt = 0
+        for attempts in itertools.count(1):
+            span.set_attribute("slack.attempts", attempts)
+            guard.before_attempt()
+            wait = self.reserve(key, method)
+            guard.check_wait(wait)
+            metrics.record_throttle(method, wait)
+            time.sleep(wait)
+            started = time.perf_counter()
+            try:
+                response = getattr(client, method)(**kwargs)
+            except Exception as e:
+                elapsed = time.perf_counter() - started
+                response = e.response if isinstance(e, SlackApiError) else None
+                metrics.record_call(method, elapsed, response, error=True)
+                _log_call(method, kwargs, elapsed, response, e)
+                if response is not None and _retry_after(e) is not None:
+                    attempt = self._handle_error(e, key, method, attempt)
+                    continue
+                time.sleep(guard.failed(e))
+            else:
+                elapsed = time.perf_counter() - started
+                guard.succeeded()
+                metrics.record_call(method, elapsed, response)
+                _log_call(method, kwargs, elapsed, response)
+                return response
+
+    async def acall(self, client, method, **kwargs):
+        """Async counterpart of call for an AsyncWebClient."""
+        with _call_span(method, kwargs) as span:
+            return await self._acall(client, method, kwargs, span)
+
+    async def _acall(self, client, method, kwargs, span):
+        import asyncio
+
+        from slack_sdk.errors import SlackApiError
+
+        key = self._bucket_key(client, method, kwargs)
+        metrics = get_metrics()
+        guard = self.resilience.guard(method)
+        attempt = 0
+        for attempts in itertools.count(1):
+            span.set_attribute("slack.attempts", attempts)
+            guard.before_attempt()
+            wait = self.reserve(key, method)
+            guard.check_wait(wait)
+            metrics.record_throttle(method, wait)
+            await asyncio.sleep(wait)
+            started = time.perf_counter()
+            try:
+                # The client's own timeout still applies; this only cuts
+                # the call short at the run deadline.
+                response = await asyncio.wait_for(
+                    getattr(client, method)(**kwargs),
+                    self.resilience.call_timeout(None),
+                )
+            except Exception as e:
+                elapsed = time.perf_counter() - started
+                response = e.response if isinstance(e, SlackApiError) else None
+                metrics.record_call(method, elapsed, response, error=True)
+                _log_call(method, kwargs, elapsed, response, e)
+                if response is not None and _retry_after(e) is not None:
+                    attempt = self._handle_error(e, key, method, attempt)
+                    continue
+                await asyncio.sleep(guard.failed(e))
+            else:
+                elapsed = time.perf_counter() - started
+                guard.succeeded()
+                metrics.record_call(method, elapsed, response)
+                _log_call(method, kwargs, elapsed, response)
+                return response
+
+    def reserve(self, key, method):
+        """Take a token from the bucket and return how long to wait for it."""
+        if not self.throttle:
+            return self._blocked_for(key)
+        per_minute, burst = TIERS[METHOD_TIERS.get(method, DEFAULT_TIER)]
+        rate = per_minute / 60.0
+        with self._locked_state() as state:
+            now = time.time()
+            tokens, updated_at = state["buckets"].get(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated_at) * rate) - 1
+            state["buckets"][key] = (tokens, now)
+            wait = -tokens / rate if tokens < 0 else 0.0
+            return max(wait, state["blocked"].get(key, 0) - now)
+
+    def block(self, key, seconds):
+        """Hold every call on ``key`` for ``seconds`` (e.g. after a 429)."""
+        with self._locked_state() as state:
+            until = time.time() + seconds
+            state["blocked"][key] = max(state["blocked"].get(key, 0), until)
+
+    def _blocked_for(self, key):
+        with self._locked_state() as state:
+            return max(0.0, state["blocked"].get(key, 0) - time.time())
+
+    def _handle_error(self, error, key, method, attempt):
+        retry_after = _retry_after(error)
+        if retry_after is None or attempt >= self.max_retries:
+            raise error
+        get_logger().warning(
+            "rate_limited",
+            f"⏳ Rate limited on {method}; retrying in {retry_after:g}s.",
+            method=method,
+            error="ratelimited",
+        )
+        get_metrics().record_retry(method)
+        self.block(key, retry_after)
+        return attempt + 1
+
+    def _bucket_key(self, client, method, kwargs):
+        key = f"{workspace_key(client)}:{method}"
+        if method in PER_CHANNEL_METHODS and kwargs.get("channel"):
+            key = f"{key}:{kwargs['channel']}"
+        return key
+
+    @contextmanager
+    def _locked_state(self):
+        with self._lock:
+            if not self.state_file or fcntl is None:
+                self._state.setdefault("buckets", {})
+                self._state.setdefault("blocked", {})
+                yield self._state
+                return
+
+            os.makedirs(os.path.dirname(self.state_file) or ".", exist_ok=True)
+            with open(self.state_file + ".lock", "a") as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                try:
+                    state = self._read_shared_state()
+                    yield state
+                    self._write_shared_state(state)
+                finally:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _read_shared_state(self):
+        try:
+            with open(self.state_file, "r") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = {}
+        now = time.time()
+        # Idle buckets and expired blocks are dropped so the file stays small.
+        state["buckets"] = {
+            key: tuple(value)
+            for key, value in state.get("buckets", {}).items()
+            if now - value[1] < 3600
+        }
+        state["blocked"] = {
+            key: until for key, until in state.get("blocked", {}).items() if until > now
+        }
+        return state
+
+    def _write_shared_state(self, state):
+        tmp_path = f"{self.state_file}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_file)
+
+
+_default_scheduler = None
+
+
+def configure_scheduler(
+    state_file=None, max_retries=DEFAULT_MAX_RETRIES, throttle=True, resilience=None
+):
+    """Replace the process-wide scheduler, e.g. to share state across processes."""
+    global _default_scheduler
+    _default_scheduler = RateLimitScheduler(
+        state_file=state_file,
+        max_retries=max_retries,
+        throttle=throttle,
+        resilience=resilience,
+    )
+    return _default_scheduler
+
+
+def get_scheduler():
+    """Return the process-wide scheduler, creating it on first use."""
+    global _default_scheduler
+    if _default_scheduler is None:
+        _default_scheduler = RateLimitScheduler()
+    return _default_scheduler
+
+
+def slack_call(client, method, **kwargs):
+    """Make a Slack Web API call through the process-wide scheduler."""
+    return get_scheduler().call(client, method, **kwargs)
+
+
+async def aslack_call(client, method, **kwargs):
+    """Async counterpart of slack_call."""
+    return await get_scheduler().acall(client, method, **kwargs)
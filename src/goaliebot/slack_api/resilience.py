@@ -0,0 +1,322 @@
+import http.client
+import random
+import socket
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from urllib.error import HTTPError, URLError
+
+from goaliebot.telemetry.logs import get_logger
+from goaliebot.telemetry.metrics import get_metrics
+
+DEFAULT_RETRIES = 3
+DEFAULT_BASE_DELAY = 0.5
+DEFAULT_MAX_DELAY = 8.0
+DEFAULT_BREAKER_THRESHOLD = 5
+DEFAULT_BREAKER_COOLDOWN = 30.0
+
+# Slack error codes that mean Slack, not the request, is at fault.
+RETRYABLE_SLACK_ERRORS = {
+    "internal_error",
+    "fatal_error",
+    "service_unavailable",
+    "request_timeout",
+}
+
+NETWORK_ERRORS = (
+    ConnectionError,
+    TimeoutError,
+    socket.timeout,
+    URLError,
+    http.client.HTTPException,
+)
+
+# Errors raised while connecting, before any of the request was sent.
+# urllib wraps every failure of sending a request in a URLError.
+NOT_SENT_ERRORS = (
+    ConnectionRefusedError,
+    socket.gaierror,
+    URLError,
+)
+
+# Slack methods that repeat their effect when sent twice: a second message,
+# or a second "set the channel topic" notice.
+NON_IDEMPOTENT_METHODS = {
+    "chat_postMessage",
+    "chat_scheduleMessage",
+    "conversations_setTopic",
+}
+
+
+class SlackUnavailableError(Exception):
+    """Slack could not be reached within the run's retry, breaker and deadline limits."""
+
+
+class CircuitOpenError(SlackUnavailableError):
+    pass
+
+
+class DeadlineExceededError(SlackUnavailableError):
+    pass
+
+
+def is_retryable(error, method=None):
+    """
+    Whether ``error`` is transient: a 5xx, a Slack-side error code or a
+    network failure. A non-idempotent ``method`` is only retried when the
+    request never reached Slack, since after a read timeout or a dropped
+    connection Slack may already have acted on it.
+    """
+    if isinstance(error, SlackUnavailableError):
+        return False
+    if method in NON_IDEMPOTENT_METHODS:
+        return was_not_sent(error)
+    if isinstance(error, NETWORK_ERRORS):
+        return True
+
+    from slack_sdk.errors import SlackApiError
+
+    if isinstance(error, SlackApiError):
+        response = error.response
+        status = getattr(response, "status_code", None) or 0
+        data = getattr(response, "data", None)
+        code = data.get("error") if isinstance(data, dict) else None
+        return status >= 500 or code in RETRYABLE_SLACK_ERRORS
+    # Async clients raise their own errors; they can only occur once loaded.
+    asyncio = sys.modules.get("asyncio")
+    if asyncio is not None and isinstance(error, asyncio.TimeoutError):
+        return True
+    aiohttp = sys.modules.get("aiohttp")
+    return aiohttp is not None and isinstance(error, aiohttp.ClientError)
+
+
+def was_not_sent(error):
+    """Whether ``error`` was raised before the request was sent."""
+    if isinstance(error, NOT_SENT_ERRORS) and not isinstance(error, HTTPError):
+        return True
+    aiohttp = sys.modules.get("aiohttp")
+    return aiohttp is not None and isinstance(error, aiohttp.ClientConnectorError)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How often, and after how long, a transient failure is retried."""
+
+    retries: int = DEFAULT_RETRIES
+    base_delay: float = DEFAULT_BASE_DELAY
+    max_delay: float = DEFAULT_MAX_DELAY
+
+    def delay(self, attempt, rng=random.random):
+        """
+        Seconds to wait before retry number ``attempt`` (from 0): full
+        jitter over an exponentially growing, capped window, so callers
+        that failed together do not retry together.
+        """
+        return rng() * min(self.max_delay, self.base_delay * 2**attempt)
+
+
+class CircuitBreaker:
+    """
+    Stops calling a Slack method that keeps failing.
+
+    After ``threshold`` consecutive transient failures the circuit opens and
+    calls fail at once for ``cooldown`` seconds. Then calls are let through
+    again (half open): a success closes the circuit and a single failure
+    opens it for another ``cooldown``.
+    """
+
+    def __init__(
+        self,
+        threshold=DEFAULT_BREAKER_THRESHOLD,
+        cooldown=DEFAULT_BREAKER_COOLDOWN,
+        clock=time.monotonic,
+    ):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.clock = clock
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if self.clock() - self.opened_at < self.cooldown:
+            return "open"
+        return "half_open"
+
+    def allow(self):
+        """Whether a call may be made now."""
+        return self.state != "open"
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.opened_at is not None or self.failures >= self.threshold:
+                self.opened_at = self.clock()
+
+
+class Resilience:
+    """
+    Retry policy, per-method circuit breakers and the run deadline shared
+    by every Slack call of a run.
+
+    ``run_deadline`` is the number of seconds, from ``start_run``, after
+    which no further call is started and waits that would run past it fail
+    at once. Each call's timeout is cut to the time left.
+    """
+
+    def __init__(
+        self,
+        retry=None,
+        breaker_threshold=DEFAULT_BREAKER_THRESHOLD,
+        breaker_cooldown=DEFAULT_BREAKER_COOLDOWN,
+        run_deadline=None,
+        clock=time.monotonic,
+    ):
+        self.retry = retry or RetryPolicy()
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+        self.run_deadline = run_deadline
+        self.clock = clock
+        self._breakers = {}
+        self._lock = threading.Lock()
+        self.start_run()
+
+    def start_run(self):
+        """Start the run deadline's clock, e.g. for each rotation a daemon fires."""
+        self.deadline = None
+        if self.run_deadline is not None:
+            self.deadline = self.clock() + self.run_deadline
+
+    def remaining(self):
+        """Seconds left before the run deadline, or None without one."""
+        if self.deadline is None:
+            return None
+        return self.deadline - self.clock()
+
+    def breaker(self, method):
+        with self._lock:
+            breaker = self._breakers.get(method)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    self.breaker_threshold, self.breaker_cooldown, self.clock
+                )
+                self._breakers[method] = breaker
+            return breaker
+
+    def call_timeout(self, timeout):
+        """``timeout`` cut to the time left before the deadline."""
+        remaining = self.remaining()
+        if remaining is None:
+            return timeout
+        if remaining <= 0:
+            raise DeadlineExceededError(
+                f"Run deadline of {self.run_deadline:g}s reached"
+            )
+        return remaining if timeout is None else min(timeout, remaining)
+
+    def guard(self, method):
+        return CallGuard(self, method)
+
+
+class CallGuard:
+    """The resilience state of one Slack call across its attempts."""
+
+    def __init__(self, resilience, method):
+        self.resilience = resilience
+        self.method = method
+        self.breaker = resilience.breaker(method)
+        self.failures = 0
+
+    def before_attempt(self):
+        if not self.breaker.allow():
+            raise CircuitOpenError(
+                f"{self.method} failed {self.breaker.failures} times in a row; "
+                f"not calling it for {self.breaker.cooldown:g}s"
+            )
+
+    def check_wait(self, seconds):
+        """Fail now rather than wait past the run deadline."""
+        remaining = self.resilience.remaining()
+        if remaining is not None and seconds >= remaining:
+            raise DeadlineExceededError(
+                f"Run deadline of {self.resilience.run_deadline:g}s reached "
+                f"before {self.method} could be called"
+            )
+
+    def succeeded(self):
+        self.breaker.record_success()
+
+    def failed(self, error):
+        """
+        Record a failed attempt and return how long to wait before the
+        next one, or raise when the error is not transient or the call has
+        run out of retries or time.
+        """
+        if not is_retryable(error, self.method):
+            if is_retryable(error):
+                self.breaker.record_failure()
+                self._not_retried(error)
+            # Slack answered, so the method itself is working.
+            if not isinstance(error, SlackUnavailableError):
+                self.breaker.record_success()
+            raise error
+        self.breaker.record_failure()
+        remaining = self.resilience.remaining()
+        if remaining is not None and remaining <= 0:
+            raise DeadlineExceededError(
+                f"Run deadline of {self.resilience.run_deadline:g}s reached "
+                f"while calling {self.method}: {error}"
+            ) from error
+        if self.failures >= self.resilience.retry.retries or not self.breaker.allow():
+            self._give_up(error)
+        delay = self.resilience.retry.delay(self.failures)
+        self.failures += 1
+        self.check_wait(delay)
+        get_logger().warning(
+            "retry",
+            f"⏳ {self.method} failed ({describe_error(error)}); "
+            f"retrying in {delay:.1f}s.",
+            method=self.method,
+            error=describe_error(error),
+        )
+        get_metrics().record_retry(self.method)
+        return delay
+
+    def _give_up(self, error):
+        from slack_sdk.errors import SlackApiError
+
+        # Slack errors keep their type so callers report them as before.
+        if isinstance(error, SlackApiError):
+            raise error
+        raise SlackUnavailableError(
+            f"{self.method} failed after {self.failures + 1} attempts: "
+            f"{describe_error(error)}"
+        ) from error
+
+    def _not_retried(self, error):
+        from slack_sdk.errors import SlackApiError
+
+        if isinstance(error, SlackApiError):
+            raise error
+        raise SlackUnavailableError(
+            f"{self.method} failed and was not retried, as Slack may have "
+            f"acted on it: {describe_error(error)}"
+        ) from error
+
+
+def describe_error(error):
+    """A Slack error's code, or the message of any other error."""
+    response = getattr(error, "response", None)
+    data = getattr(response, "data", None)
+    if isinstance(data, dict) and data.get("error"):
+        return data["error"]
+    return str(error) or type(error).__name__
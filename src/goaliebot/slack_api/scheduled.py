@@ -0,0 +1,43 @@
+from slack_sdk.errors import SlackApiError
+
+from .ratelimit import slack_call
+
+# Errors meaning a scheduled message is no longer pending: it was already
+# posted, or deleted by someone else.
+GONE_ERRORS = ("invalid_scheduled_message_id", "message_not_found")
+
+
+def schedule_message(client, channel_id, text, post_at, blocks=None):
+    """
+    Queue ``text`` (the fallback of ``blocks``, if given) for ``channel_id``
+    at Unix time ``post_at``; returns its ID.
+    """
+    extra = {} if blocks is None else {"blocks": blocks}
+    response = slack_call(
+        client,
+        "chat_scheduleMessage",
+        channel=channel_id,
+        text=text,
+        post_at=int(post_at),
+        **extra,
+    )
+    return response["scheduled_message_id"]
+
+
+def delete_scheduled_message(client, channel_id, scheduled_message_id):
+    """
+    Cancel a scheduled message. Returns False, rather than raising, when it
+    is no longer pending.
+    """
+    try:
+        slack_call(
+            client,
+            "chat_deleteScheduledMessage",
+            channel=channel_id,
+            scheduled_message_id=scheduled_message_id,
+        )
+    except SlackApiError as e:
+        if e.response.get("error") in GONE_ERRORS:
+            return False
+        raise
+    return True
@@ -0,0 +1,108 @@
+from slack_sdk.errors import SlackApiError
+
+from goaliebot.telemetry.logs import get_logger
+from goaliebot.telemetry.tracing import page_span
+
+from .ratelimit import slack_call
+
+# Above this many channels one paged conversations.list pass is cheaper than
+# a conversations.info call per channel.
+TOPIC_LISTING_THRESHOLD = 20
+
+
+class SlackStateReader:
+    """
+    Reads, and caches for the lifetime of the reader, the Slack state that
+    reconciliation compares against: user group members, channel topics
+    and recent channel messages.
+
+    Members of every user group come from a single ``usergroups.list`` call,
+    so a batch of rotations sharing one reader pays for it once.
+    """
+
+    def __init__(self):
+        self._members = None
+        self._topics = {}
+        self._recent_messages = {}
+
+    def usergroup_members(self, client, user_group_id):
+        """Current member IDs of a user group, or None if unknown."""
+        if self._members is None:
+            response = slack_call(client, "usergroups_list", include_users=True)
+            self._members = {
+                group["id"]: set(group.get("users", []))
+                for group in response["usergroups"]
+            }
+        return self._members.get(user_group_id)
+
+    def channel_topics(self, client, channel_ids):
+        """Current topic of each channel ID, as a dict."""
+        missing = [c for c in channel_ids if c not in self._topics]
+        if len(missing) >= TOPIC_LISTING_THRESHOLD:
+            self._list_topics(client, set(missing))
+        for channel_id in missing:
+            if channel_id not in self._topics:
+                response = slack_call(client, "conversations_info", channel=channel_id)
+                self._topics[channel_id] = response["channel"]["topic"]["value"]
+        return {c: self._topics.get(c) for c in channel_ids}
+
+    def recent_messages(self, client, channel_id, oldest):
+        """Texts posted to a channel since ``oldest`` (a Unix timestamp)."""
+        if channel_id not in self._recent_messages:
+            response = slack_call(
+                client,
+                "conversations_history",
+                channel=channel_id,
+                oldest=str(oldest),
+                limit=200,
+            )
+            self._recent_messages[channel_id] = [
+                message.get("text") for message in response["messages"]
+            ]
+        return self._recent_messages[channel_id]
+
+    def record_members(self, user_group_id, user_ids):
+        if self._members is not None:
+            self._members[user_group_id] = set(user_ids)
+
+    def record_topic(self, channel_id, topic):
+        self._topics[channel_id] = topic
+
+    def record_message(self, channel_id, text):
+        self._recent_messages.setdefault(channel_id, []).append(text)
+
+    def _list_topics(self, client, wanted):
+        cursor = None
+        page = 0
+        while wanted:
+            page += 1
+            with page_span("conversations_list", page):
+                response = slack_call(
+                    client,
+                    "conversations_list",
+                    cursor=cursor,
+                    limit=1000,
+                    exclude_archived=True,
+                )
+            for channel in response["channels"]:
+                if channel["id"] in wanted:
+                    self._topics[channel["id"]] = channel["topic"]["value"]
+                    wanted.discard(channel["id"])
+
+            cursor = response.get("response_metadata", {}).get("next_cursor")
+            if not cursor:
+                break
+
+
+def read_or_none(read, *args):
+    """Run a state read, treating a Slack error as "state unknown"."""
+    try:
+        return read(*args)
+    except SlackApiError as e:
+        get_logger().warning(
+            "state_read_failed",
+            f"⚠️ Could not read current Slack state: {e.response['error']}",
+            ok=False,
+            error=e.response["error"],
+        )
+        return None
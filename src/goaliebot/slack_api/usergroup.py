@@ -1,18 +1,30 @@
-from slack_sdk import WebClient
-from slack_sdk.errors import SlackApiError
+import asyncio
 import re
 
+from slack_sdk.errors import SlackApiError
+
+from goaliebot.telemetry.logs import get_logger
+
+from .client import get_client
+from .directory import get_directory
+from .ratelimit import aslack_call, slack_call
 
-def get_user_group_id(slack_token, user_group_handle):
-    """Fetch the user group ID from the user group handle."""
-    client = WebClient(token=slack_token)
+
+def get_user_group_id(slack_token, user_group_handle, directory=None, client=None):
+    """Fetch the user group ID from the user group handle, using the cached directory."""
+    if not user_group_handle:
+        return None
+    client = client or get_client(slack_token)
     try:
-        response = client.usergroups_list()
-        for group in response["usergroups"]:
-            if group["handle"] == user_group_handle:
-                return group["id"]
+        return (directory or get_directory()).user_group_id(client, user_group_handle)
     except SlackApiError as e:
-        print(f"Error fetching user groups: {e.response['error']}")
+        get_logger().error(
+            "user_group_lookup_failed",
+            f"Error fetching user groups: {e.response['error']}",
+            method="usergroups_list",
+            ok=False,
+            error=e.response["error"],
+        )
     return None
 
 
@@ -21,6 +33,47 @@ def is_valid_user_id(user_id):
     return bool(user_id) and re.match(r"^[UW][A-Z0-9]{2,}$", user_id)
 
 
+def _collect_user_ids(next_goalie, deputy):
+    """Return the validated user IDs for the goalie and optional deputy."""
+    user_ids = []
+
+    if is_valid_user_id(next_goalie.user_id):
+        user_ids.append(next_goalie.user_id)
+    else:
+        raise ValueError(f"Invalid goaliebot user_id: {next_goalie.user_id}")
+
+    if deputy:
+        if is_valid_user_id(deputy.user_id):
+            user_ids.append(deputy.user_id)
+        else:
+            raise ValueError(f"Invalid deputy user_id: {deputy.user_id}")
+
+    return user_ids
+
+
+def _report_usergroup_update(user_group_id, next_goalie, deputy):
+    message = (
+        f"✅ User {next_goalie.handle} (ID: {next_goalie.user_id}) is now the "
+        f"goaliebot and added to group {user_group_id}."
+    )
+    if deputy:
+        message += f"\n✅ Deputy is {deputy.handle} (ID: {deputy.user_id})."
+    get_logger().info(
+        "user_group_updated", message, method="usergroups_users_update", ok=True
+    )
+
+
+def _report_usergroup_failed(error):
+    reason = error.response["error"] if isinstance(error, SlackApiError) else None
+    get_logger().error(
+        "user_group_failed",
+        f"❌ Error updating user group in Slack: {error}",
+        method="usergroups_users_update",
+        ok=False,
+        error=reason or str(error),
+    )
+
+
 def update_usergroup_with_goalie_and_deputy(client, user_group_id, next_goalie, deputy):
     """
     Update the Slack user group with the next goaliebot and optionally a deputy.
@@ -30,31 +83,44 @@ def update_usergroup_with_goalie_and_deputy(client, user_group_id, next_goalie,
     - user_group_id: The ID of the Slack user group to update.
     - next_goalie: The next User object to be assigned as the goaliebot.
     - deputy: The current goaliebot User object who becomes the deputy (can be None).
+
+    Returns whether the user group was updated.
     """
     try:
-        user_ids = []
-
-        if is_valid_user_id(next_goalie.user_id):
-            user_ids.append(next_goalie.user_id)
-        else:
-            raise ValueError(f"Invalid goaliebot user_id: {next_goalie.user_id}")
+        user_ids = _collect_user_ids(next_goalie, deputy)
+        slack_call(
+            client,
+            "usergroups_users_update",
+            usergroup=user_group_id,
+            users=",".join(user_ids),
+        )
+        _report_usergroup_update(user_group_id, next_goalie, deputy)
+        return True
 
-        if deputy:
-            if is_valid_user_id(deputy.user_id):
-                user_ids.append(deputy.user_id)
-            else:
-                raise ValueError(f"Invalid deputy user_id: {deputy.user_id}")
+    except (SlackApiError, ValueError) as e:
+        _report_usergroup_failed(e)
+        return False
 
-        response = client.usergroups_users_update(
-            usergroup=user_group_id, users=",".join(user_ids)
-        )
 
-        print(
-            f"✅ User {next_goalie.handle} (ID: {next_goalie.user_id}) is now the goaliebot and added to group {user_group_id}."
-        )
-        if deputy:
-            print(f"✅ Deputy is {deputy.handle} (ID: {deputy.user_id}).")
-        print(f"Slack API response: {response}")
+async def update_usergroup_with_goalie_and_deputy_async(
+    client, user_group_id, next_goalie, deputy, semaphore=None
+):
+    """
+    Async counterpart of update_usergroup_with_goalie_and_deputy, holding
+    ``semaphore`` (shared with other commands) during the call.
+    """
+    try:
+        user_ids = _collect_user_ids(next_goalie, deputy)
+        async with semaphore or asyncio.Semaphore(1):
+            await aslack_call(
+                client,
+                "usergroups_users_update",
+                usergroup=user_group_id,
+                users=",".join(user_ids),
+            )
+        _report_usergroup_update(user_group_id, next_goalie, deputy)
+        return True
 
     except (SlackApiError, ValueError) as e:
-        print(f"❌ Error updating user group in Slack: {e}")
+        _report_usergroup_failed(e)
+        return False
@@ -0,0 +1,5 @@
+# flake8: noqa: F401
+
+from .logs import RunLogger, configure_logging, get_logger
+from .metrics import RunMetrics, configure_metrics, get_metrics
+from .tracing import Tracer, configure_tracing, get_tracer
@@ -0,0 +1,73 @@
+import re
+import subprocess
+import sys
+from dataclasses import dataclass
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)\s*$")
+
+
+@dataclass
+class ImportTiming:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(stderr):
+    """
+    Split ``python -X importtime`` output into per-module timings and the
+    rest of stderr. Modules are listed in the order their imports finished.
+    """
+    timings, other = [], []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            timings.append(
+                ImportTiming(module, int(self_us), int(cumulative_us), len(indent) // 2)
+            )
+        elif not line.startswith("import time:"):
+            other.append(line)
+    return timings, other
+
+
+def run_with_importtime(args):
+    """
+    Run ``python -m goaliebot.cli <args>`` with ``-X importtime`` in a fresh
+    interpreter. Its stdout passes through; returns its exit status and the
+    import timings.
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "goaliebot.cli", *args],
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    timings, other = parse_importtime(completed.stderr)
+    if other:
+        print("\n".join(other), file=sys.stderr)
+    return completed.returncode, timings
+
+
+def package_totals(timings):
+    """Self import time summed per top-level package, largest first."""
+    totals = {}
+    for timing in timings:
+        package = timing.module.split(".", 1)[0]
+        totals[package] = totals.get(package, 0) + timing.self_us
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+
+def print_import_report(timings, top=20):
+    total_us = sum(timing.self_us for timing in timings)
+    print(f"\n📦 Imported {len(timings)} modules in {total_us / 1000:.1f} ms")
+
+    print(f"\n{'self ms':>9}  package")
+    for package, self_us in package_totals(timings)[:top]:
+        print(f"{self_us / 1000:9.1f}  {package}")
+
+    print(f"\n{'self ms':>9} {'cumul ms':>9}  module")
+    for timing in sorted(timings, key=lambda t: t.self_us, reverse=True)[:top]:
+        print(
+            f"{timing.self_us / 1000:9.1f} {timing.cumulative_us / 1000:9.1f}  {timing.module}"
+        )
@@ -0,0 +1,147 @@
+import json
+import sys
+import threading
+import time
+
+LEVELS = {"debug": 10, "info": 20, "warning": 30, "error": 40}
+FORMATS = ("text", "json")
+
+# Every JSON line has exactly these keys, plus "response" at debug level.
+FIELDS = (
+    "ts",
+    "level",
+    "event",
+    "message",
+    "method",
+    "channel",
+    "latency_ms",
+    "ok",
+    "error",
+)
+
+# Longest response body, in characters, kept when payloads are captured.
+MAX_PAYLOAD_CHARS = 2000
+
+
+def payload_text(response, limit=MAX_PAYLOAD_CHARS):
+    """A Slack response body as JSON text, cut to ``limit`` characters."""
+    data = getattr(response, "data", response)
+    if isinstance(data, bytes):
+        data = data.decode("utf-8", "replace")
+    text = data if isinstance(data, str) else json.dumps(data, default=str)
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit]}… ({len(text) - limit} more characters)"
+
+
+class RunLogger:
+    """
+    Leveled log of one goaliebot run.
+
+    The ``text`` format writes each event's message as goaliebot always
+    has. The ``json`` format writes one object per line with the FIELDS
+    keys (unset ones are null), for log pipelines. Slack response bodies
+    are never logged at ``info``; at ``debug`` every Slack call is logged
+    with its body cut to ``max_payload`` characters.
+    """
+
+    def __init__(
+        self, level="info", fmt="text", stream=None, max_payload=MAX_PAYLOAD_CHARS
+    ):
+        if level not in LEVELS:
+            raise ValueError(f"Unknown log level {level!r}")
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown log format {fmt!r}")
+        self.level = level
+        self.fmt = fmt
+        self.stream = stream
+        self.max_payload = max_payload
+        self._threshold = LEVELS[level]
+        self._lock = threading.Lock()
+
+    def enabled(self, level):
+        return LEVELS[level] >= self._threshold
+
+    def log(
+        self,
+        level,
+        event,
+        message,
+        method=None,
+        channel=None,
+        latency=None,
+        ok=None,
+        error=None,
+        response=None,
+    ):
+        if not self.enabled(level):
+            return
+        if self.fmt == "text":
+            line = message
+            if response is not None and self.enabled("debug"):
+                line = f"{line} {payload_text(response, self.max_payload)}"
+        else:
+            record = {
+                "ts": round(time.time(), 3),
+                "level": level,
+                "event": event,
+                "message": message.strip(),
+                "method": method,
+                "channel": channel,
+                "latency_ms": None if latency is None else round(latency * 1000, 1),
+                "ok": ok,
+                "error": error,
+            }
+            if response is not None and self.enabled("debug"):
+                record["response"] = payload_text(response, self.max_payload)
+            line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            # Looked up on each write so redirected stdout is honored.
+            print(line, file=self.stream or sys.stdout, flush=True)
+
+    def debug(self, event, message, **fields):
+        self.log("debug", event, message, **fields)
+
+    def info(self, event, message, **fields):
+        self.log("info", event, message, **fields)
+
+    def warning(self, event, message, **fields):
+        self.log("warning", event, message, **fields)
+
+    def error(self, event, message, **fields):
+        self.log("error", event, message, **fields)
+
+    def slack_call(self, method, latency, response=None, channel=None, error=None):
+        """Log one Slack API call at debug level, with its response body."""
+        if not self.enabled("debug"):
+            return
+        where = f" {channel}" if channel else ""
+        outcome = f"failed ({error})" if error else "ok"
+        self.debug(
+            "slack_call",
+            f"🔎 {method}{where}: {outcome} in {latency * 1000:.0f} ms",
+            method=method,
+            channel=channel,
+            latency=latency,
+            ok=error is None,
+            error=error,
+            response=response,
+        )
+
+
+_default_logger = None
+
+
+def configure_logging(level="info", fmt="text", stream=None):
+    """Replace the process-wide logger."""
+    global _default_logger
+    _default_logger = RunLogger(level=level, fmt=fmt, stream=stream)
+    return _default_logger
+
+
+def get_logger():
+    """Return the process-wide logger, creating it on first use."""
+    global _default_logger
+    if _default_logger is None:
+        _default_logger = RunLogger()
+    return _default_logger
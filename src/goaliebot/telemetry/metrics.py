@@ -0,0 +1,234 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from .tracing import get_tracer
+
+# Upper bounds, in seconds, of the Slack call latency histogram buckets.
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# MethodMetrics field -> Prometheus counter name and help text.
+METHOD_COUNTERS = {
+    "calls": ("goaliebot_slack_api_calls_total", "Slack API calls made."),
+    "errors": ("goaliebot_slack_api_errors_total", "Slack API calls that failed."),
+    "retries": (
+        "goaliebot_slack_api_retries_total",
+        "Slack API calls retried after a 429 or a transient error.",
+    ),
+    "response_bytes": (
+        "goaliebot_slack_api_response_bytes_total",
+        "Bytes received from the Slack API.",
+    ),
+    "throttle_seconds": (
+        "goaliebot_slack_api_throttle_seconds_total",
+        "Time spent waiting on Slack rate limits.",
+    ),
+}
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram in the Prometheus style."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds):
+        self.count += 1
+        self.sum += seconds
+        for i, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                self.counts[i] += 1
+
+    def to_dict(self):
+        return {
+            "buckets": {f"{bound:g}": n for bound, n in zip(self.buckets, self.counts)},
+            "count": self.count,
+            "sum": round(self.sum, 6),
+        }
+
+
+class MethodMetrics:
+    """Totals for one Slack API method."""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.response_bytes = 0
+        self.throttle_seconds = 0.0
+        self.latency = Histogram()
+
+    def to_dict(self):
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "retries": self.retries,
+            "response_bytes": self.response_bytes,
+            "throttle_seconds": round(self.throttle_seconds, 6),
+            "latency_seconds": self.latency.to_dict(),
+        }
+
+
+def response_size(response):
+    """Size in bytes of a Slack response body, from Content-Length if sent."""
+    headers = getattr(response, "headers", None) or {}
+    length = headers.get("content-length", headers.get("Content-Length"))
+    if length is not None:
+        return int(length)
+    data = getattr(response, "data", response)
+    if isinstance(data, (bytes, str)):
+        return len(data)
+    try:
+        return len(json.dumps(data))
+    except TypeError:
+        return 0
+
+
+class RunMetrics:
+    """
+    Metrics for one goaliebot run: how long each phase took (summed when a
+    phase repeats, as in a batch) and, per Slack method, the calls, errors,
+    retries, response bytes, time spent throttled and a latency histogram.
+    """
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.phases = {}
+        self.methods = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name):
+        """Time the enclosed block as phase ``name``, traced as a span of that name."""
+        started = time.perf_counter()
+        try:
+            with get_tracer().span(name):
+                yield
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                phase = self.phases.setdefault(name, {"count": 0, "seconds": 0.0})
+                phase["count"] += 1
+                phase["seconds"] += elapsed
+
+    def _method(self, method):
+        return self.methods.setdefault(method, MethodMetrics())
+
+    def record_call(self, method, seconds, response=None, error=False):
+        with self._lock:
+            metrics = self._method(method)
+            metrics.calls += 1
+            metrics.errors += bool(error)
+            metrics.latency.observe(seconds)
+            if response is not None:
+                metrics.response_bytes += response_size(response)
+
+    def record_retry(self, method):
+        with self._lock:
+            self._method(method).retries += 1
+
+    def record_throttle(self, method, seconds):
+        if seconds > 0:
+            with self._lock:
+                self._method(method).throttle_seconds += seconds
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "started_at": self.started_at,
+                "phases": {
+                    name: {"count": p["count"], "seconds": round(p["seconds"], 6)}
+                    for name, p in self.phases.items()
+                },
+                "slack_methods": {
+                    method: metrics.to_dict()
+                    for method, metrics in sorted(self.methods.items())
+                },
+            }
+
+    def to_prometheus(self):
+        """The metrics in the Prometheus text exposition format."""
+        data = self.to_dict()
+        lines = []
+
+        def family(name, kind, help_text):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        family(
+            "goaliebot_run_start_timestamp_seconds", "gauge", "When the run started."
+        )
+        lines.append(f"goaliebot_run_start_timestamp_seconds {data['started_at']:.3f}")
+
+        family("goaliebot_phase_seconds", "gauge", "Time spent in each run phase.")
+        for name, phase in data["phases"].items():
+            lines.append(
+                f'goaliebot_phase_seconds{{phase="{name}"}} {phase["seconds"]}'
+            )
+        family("goaliebot_phase_runs", "gauge", "Times each run phase was entered.")
+        for name, phase in data["phases"].items():
+            lines.append(f'goaliebot_phase_runs{{phase="{name}"}} {phase["count"]}')
+
+        methods = data["slack_methods"]
+        for field, (name, help_text) in METHOD_COUNTERS.items():
+            family(name, "counter", help_text)
+            for method, metrics in methods.items():
+                lines.append(f'{name}{{method="{method}"}} {metrics[field]}')
+
+        name = "goaliebot_slack_api_latency_seconds"
+        family(name, "histogram", "Slack API call latency.")
+        for method, metrics in methods.items():
+            latency = metrics["latency_seconds"]
+            for bound, count in latency["buckets"].items():
+                lines.append(f'{name}_bucket{{method="{method}",le="{bound}"}} {count}')
+            lines.append(
+                f'{name}_bucket{{method="{method}",le="+Inf"}} {latency["count"]}'
+            )
+            lines.append(f'{name}_sum{{method="{method}"}} {latency["sum"]}')
+            lines.append(f'{name}_count{{method="{method}"}} {latency["count"]}')
+        return "\n".join(lines) + "\n"
+
+    def write(self, json_path=None, prometheus_path=None):
+        """Write the metrics as JSON and/or a Prometheus textfile."""
+        if json_path:
+            _write_atomically(json_path, json.dumps(self.to_dict(), indent=2) + "\n")
+        if prometheus_path:
+            _write_atomically(prometheus_path, self.to_prometheus())
+
+
+def _write_atomically(path, text):
+    # The node exporter textfile collector must never see a partial file.
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+_default_metrics = None
+
+
+def configure_metrics():
+    """Start a fresh process-wide set of run metrics."""
+    global _default_metrics
+    _default_metrics = RunMetrics()
+    return _default_metrics
+
+
+def get_metrics():
+    """Return the process-wide run metrics, creating them on first use."""
+    global _default_metrics
+    if _default_metrics is None:
+        _default_metrics = RunMetrics()
+    return _default_metrics
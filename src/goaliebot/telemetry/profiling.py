@@ -0,0 +1,158 @@
+import cProfile
+import linecache
+import os
+import sys
+import threading
+import tracemalloc
+
+PSTATS_FILE = "goaliebot.pstats"
+COLLAPSED_FILE = "goaliebot.collapsed"
+ALLOCATIONS_FILE = "allocations.txt"
+
+# Allocation sites listed in the allocation report.
+DEFAULT_TOP = 25
+
+# Seconds between two samples of the profiled thread's stack.
+DEFAULT_SAMPLE_INTERVAL = 0.001
+
+_UNTRACED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, threading.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def frame_label(code):
+    """``function (dir/file.py:line)`` for a code object, as shown in flamegraphs."""
+    filename = code.co_filename
+    short = os.path.join(
+        os.path.basename(os.path.dirname(filename)), os.path.basename(filename)
+    )
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({short}:{code.co_firstlineno})".replace(";", ":")
+
+
+def collapse(frame):
+    """A frame's stack, outermost first, as one collapsed-stack line key."""
+    labels = []
+    while frame is not None:
+        labels.append(frame_label(frame.f_code))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class StackSampler:
+    """
+    Counts the stacks of one thread, sampled every ``interval`` seconds
+    from a background thread.
+
+    cProfile only keeps caller -> callee edges, which cannot tell which
+    caller a shared helper's time belongs to, so flamegraphs are built
+    from sampled stacks instead.
+    """
+
+    def __init__(self, thread_id, interval=DEFAULT_SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="goaliebot-sampler", daemon=True
+        )
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                stack = collapse(frame)
+                self.stacks[stack] = self.stacks.get(stack, 0) + 1
+            del frame
+
+
+def allocation_report(snapshot, peak, top=DEFAULT_TOP):
+    """Text listing the ``top`` source lines holding the most traced memory."""
+    statistics = snapshot.filter_traces(_UNTRACED).statistics("lineno")
+    lines = [
+        f"Peak traced memory: {peak / 1024 / 1024:.2f} MiB",
+        f"Traced memory still held at the end: "
+        f"{sum(stat.size for stat in statistics) / 1024 / 1024:.2f} MiB",
+        "",
+        f"Top {min(top, len(statistics))} allocation sites:",
+    ]
+    for stat in statistics[:top]:
+        frame = stat.traceback[0]
+        lines.append(
+            f"{stat.size / 1024:10.1f} KiB {stat.count:8,} blocks  "
+            f"{frame.filename}:{frame.lineno}"
+        )
+        source = linecache.getline(frame.filename, frame.lineno).strip()
+        if source:
+            lines.append(f"{'':29}{source}")
+    return "\n".join(lines) + "\n"
+
+
+class RunProfiler:
+    """
+    CPU and memory profile of one goaliebot run.
+
+    Between ``start`` and ``stop`` the calling thread is profiled with
+    cProfile, its stack is sampled every millisecond, and allocations are
+    traced with tracemalloc. ``write`` then puts three files in
+    ``directory``: the cProfile stats (for ``python -m pstats`` or
+    snakeviz), the sampled stacks in collapsed form with one count per
+    sample (for flamegraph.pl or speedscope), and a report of the ``top``
+    allocation sites. Profiling slows the run down, so its timings are only
+    useful relative to each other.
+    """
+
+    def __init__(self, directory, top=DEFAULT_TOP, interval=DEFAULT_SAMPLE_INTERVAL):
+        self.directory = directory
+        self.top = top
+        self._profile = cProfile.Profile()
+        self._sampler = StackSampler(threading.get_ident(), interval)
+        self._snapshot = None
+        self._peak = 0
+        self._stop_tracing = False
+
+    def start(self):
+        self._stop_tracing = not tracemalloc.is_tracing()
+        if self._stop_tracing:
+            tracemalloc.start()
+        elif hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        self._sampler.start()
+        self._profile.enable()
+
+    def stop(self):
+        self._profile.disable()
+        self._sampler.stop()
+        self._snapshot = tracemalloc.take_snapshot()
+        self._peak = tracemalloc.get_traced_memory()[1]
+        if self._stop_tracing:
+            tracemalloc.stop()
+
+    def write(self):
+        """Write the profiles and return their paths."""
+        os.makedirs(self.directory, exist_ok=True)
+        paths = {
+            "pstats": os.path.join(self.directory, PSTATS_FILE),
+            "collapsed": os.path.join(self.directory, COLLAPSED_FILE),
+            "allocations": os.path.join(self.directory, ALLOCATIONS_FILE),
+        }
+        self._profile.dump_stats(paths["pstats"])
+        with open(paths["collapsed"], "w") as f:
+            for stack, samples in sorted(self._sampler.stacks.items()):
+                f.write(f"{stack} {samples}\n")
+        with open(paths["allocations"], "w") as f:
+            f.write(allocation_report(self._snapshot, self._peak, self.top))
+        return paths
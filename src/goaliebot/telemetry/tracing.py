@@ -0,0 +1,233 @@
+import contextvars
+import json
+import os
+import secrets
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+# OpenTelemetry span kinds and status codes, as numbered in OTLP.
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_CLIENT = 3
+STATUS_UNSET = 0
+STATUS_ERROR = 2
+
+SERVICE_NAME = "goaliebot"
+
+_current_span = contextvars.ContextVar("goaliebot_current_span", default=None)
+
+
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        # OTLP JSON carries 64-bit integers as strings.
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes):
+    return [
+        {"key": key, "value": _otlp_value(value)} for key, value in attributes.items()
+    ]
+
+
+class Span:
+    """One timed operation; ``parent_id`` links it into its trace."""
+
+    __slots__ = (
+        "name",
+        "kind",
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "attributes",
+        "start_ns",
+        "end_ns",
+        "status_code",
+        "status_message",
+    )
+
+    def __init__(self, name, trace_id, parent_id=None, kind=SPAN_KIND_INTERNAL):
+        self.name = name
+        self.kind = kind
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.attributes = {}
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.status_code = STATUS_UNSET
+        self.status_message = None
+
+    def set_attribute(self, key, value):
+        if value is not None:
+            self.attributes[key] = value
+
+    def record_error(self, error):
+        self.status_code = STATUS_ERROR
+        self.status_message = str(error) or type(error).__name__
+
+    def finish(self):
+        if self.end_ns is None:
+            self.end_ns = time.time_ns()
+
+    def to_otlp(self):
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": _otlp_attributes(self.attributes),
+            "status": {"code": self.status_code},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        if self.status_message:
+            span["status"]["message"] = self.status_message
+        return span
+
+
+class _NoopSpan:
+    def set_attribute(self, key, value):
+        pass
+
+    def record_error(self, error):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+def _is_failure(error):
+    return not (isinstance(error, SystemExit) and not error.code)
+
+
+class Tracer:
+    """
+    Nested spans for one goaliebot run, exported to a local file.
+
+    The current span is tracked in a context variable, so spans opened in
+    asyncio tasks nest under the span that started them. ``export`` appends
+    the finished spans to ``path`` as one line of OTLP JSON (the format of
+    the OpenTelemetry Collector's file exporter), which tools that read
+    OTLP can open offline. Without a ``path`` every span is a no-op.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.enabled = path is not None
+        self._finished = []
+        self._root = None
+        self._lock = threading.Lock()
+
+    def start_run(self, name, **attributes):
+        """
+        Open the root span of a new trace, finishing the previous one; every
+        span opened afterwards in this context nests under it.
+        """
+        if not self.enabled:
+            return
+        self._finish_root()
+        self._root = Span(name, secrets.token_hex(16))
+        for key, value in attributes.items():
+            self._root.set_attribute(key, value)
+        _current_span.set(self._root)
+
+    def span(self, name, kind=SPAN_KIND_INTERNAL, **attributes):
+        """Context manager timing the enclosed block as a child of the current span."""
+        if not self.enabled:
+            return nullcontext(NOOP_SPAN)
+        return self._span(name, kind, attributes)
+
+    @contextmanager
+    def _span(self, name, kind, attributes):
+        parent = _current_span.get()
+        span = Span(
+            name,
+            parent.trace_id if parent else secrets.token_hex(16),
+            parent.span_id if parent else None,
+            kind,
+        )
+        for key, value in attributes.items():
+            span.set_attribute(key, value)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            if _is_failure(e):
+                span.record_error(e)
+            raise
+        finally:
+            span.finish()
+            _current_span.reset(token)
+            with self._lock:
+                self._finished.append(span)
+
+    def _finish_root(self):
+        if self._root is None:
+            return
+        self._root.finish()
+        with self._lock:
+            self._finished.append(self._root)
+        self._root = None
+        _current_span.set(None)
+
+    def export(self):
+        """Finish the run's root span and append every finished span to the file."""
+        if not self.enabled:
+            return
+        self._finish_root()
+        with self._lock:
+            spans, self._finished = self._finished, []
+        if not spans:
+            return
+        document = {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": _otlp_attributes(
+                            {"service.name": SERVICE_NAME, "process.pid": os.getpid()}
+                        )
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": SERVICE_NAME},
+                            "spans": [span.to_otlp() for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "a") as f:
+            f.write(json.dumps(document) + "\n")
+
+
+def page_span(method, page):
+    """Span around fetching page ``page`` (from 1) of a paginated Slack listing."""
+    return get_tracer().span(
+        f"{method} page", **{"slack.method": method, "slack.page": page}
+    )
+
+
+_default_tracer = None
+
+
+def configure_tracing(path=None):
+    """Replace the process-wide tracer; spans are only kept with a ``path``."""
+    global _default_tracer
+    _default_tracer = Tracer(path)
+    return _default_tracer
+
+
+def get_tracer():
+    """Return the process-wide tracer, creating a disabled one on first use."""
+    global _default_tracer
+    if _default_tracer is None:
+        _default_tracer = Tracer()
+    return _default_tracer
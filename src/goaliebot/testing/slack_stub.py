@@ -0,0 +1,371 @@
+"""
+Local stand-in for the Slack Web API, for load and failure testing.
+
+Implements the methods goaliebot calls, keeps their state in memory and can
+inject latency, 429 rate limits (with ``Retry-After``) and server errors.
+Point goaliebot at it with ``--slack-base-url`` or $GOALIEBOT_SLACK_BASE_URL.
+"""
+
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import click
+
+API_PREFIX = "/api/"
+STATS_PATH = "/_stub/stats"
+
+
+class SlackStub:
+    """
+    In-memory Slack workspace with fault injection, shared by the server's
+    request threads.
+
+    ``rate_limit_rate`` and ``error_rate`` are the probabilities that a call
+    is answered with a 429 (``Retry-After: retry_after``) or a 503 instead
+    of being served. ``conversations.list`` and ``users.list`` return at
+    most ``page_size`` channels or users per page.
+    """
+
+    def __init__(
+        self,
+        channels=10,
+        user_groups=("goalies",),
+        users=10,
+        page_size=100,
+        latency=0.0,
+        rate_limit_rate=0.0,
+        retry_after=1,
+        error_rate=0.0,
+        seed=None,
+    ):
+        self.channels = [
+            {"id": f"C{i:08d}", "name": f"channel-{i}", "topic": {"value": ""}}
+            for i in range(channels)
+        ]
+        self.user_groups = [
+            {"id": f"S{i:08d}", "handle": handle, "users": []}
+            for i, handle in enumerate(user_groups)
+        ]
+        self.users = [
+            {
+                "id": f"U{i:08d}",
+                "name": f"user-{i}",
+                "deleted": False,
+                "profile": {
+                    "display_name": f"user-{i}",
+                    "real_name": f"User {i}",
+                    "email": f"user-{i}@example.com",
+                },
+            }
+            for i in range(users)
+        ]
+        self.messages = {}
+        self.scheduled_messages = {}
+        self.page_size = page_size
+        self.latency = latency
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.error_rate = error_rate
+        self.calls = Counter()
+        self.rate_limited = Counter()
+        self.errors = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._methods = {
+            "conversations.list": self._conversations_list,
+            "conversations.info": self._conversations_info,
+            "conversations.history": self._conversations_history,
+            "conversations.setTopic": self._conversations_set_topic,
+            "chat.postMessage": self._chat_post_message,
+            "chat.scheduleMessage": self._chat_schedule_message,
+            "chat.deleteScheduledMessage": self._chat_delete_scheduled_message,
+            "usergroups.list": self._usergroups_list,
+            "usergroups.users.update": self._usergroups_users_update,
+            "users.list": self._users_list,
+        }
+
+    def handle(self, method, params):
+        """Serve one API call. Returns ``(status, body, headers)``."""
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.calls[method] += 1
+            roll = self._random.random()
+            if roll < self.rate_limit_rate:
+                self.rate_limited[method] += 1
+                headers = {"Retry-After": str(self.retry_after)}
+                return 429, {"ok": False, "error": "ratelimited"}, headers
+            if roll < self.rate_limit_rate + self.error_rate:
+                self.errors[method] += 1
+                return 503, {"ok": False, "error": "service_unavailable"}, {}
+
+            handler = self._methods.get(method)
+            if handler is None:
+                return 200, {"ok": False, "error": "unknown_method"}, {}
+            return 200, handler(params), {}
+
+    def stats(self):
+        with self._lock:
+            return {
+                "calls": dict(self.calls),
+                "rate_limited": dict(self.rate_limited),
+                "errors": dict(self.errors),
+            }
+
+    def _channel(self, channel):
+        channel = (channel or "").lstrip("#")
+        for candidate in self.channels:
+            if channel in (candidate["id"], candidate["name"]):
+                return candidate
+        return None
+
+    def _page(self, items, key, params):
+        start = int(params.get("cursor") or 0)
+        limit = min(int(params.get("limit") or self.page_size), self.page_size)
+        end = start + limit
+        next_cursor = str(end) if end < len(items) else ""
+        return {
+            "ok": True,
+            key: items[start:end],
+            "response_metadata": {"next_cursor": next_cursor},
+        }
+
+    def _conversations_list(self, params):
+        return self._page(self.channels, "channels", params)
+
+    def _users_list(self, params):
+        return self._page(self.users, "members", params)
+
+    def _conversations_info(self, params):
+        channel = self._channel(params.get("channel"))
+        if channel is None:
+            return {"ok": False, "error": "channel_not_found"}
+        return {"ok": True, "channel": channel}
+
+    def _conversations_history(self, params):
+        channel = self._channel(params.get("channel"))
+        if channel is None:
+            return {"ok": False, "error": "channel_not_found"}
+        oldest = float(params.get("oldest") or 0)
+        messages = [
+            message
+            for message in self.messages.get(channel["id"], [])
+            if float(message["ts"]) >= oldest
+        ]
+        return {"ok": True, "messages": list(reversed(messages))}
+
+    def _conversations_set_topic(self, params):
+        channel = self._channel(params.get("channel"))
+        if channel is None:
+            return {"ok": False, "error": "channel_not_found"}
+        channel["topic"] = {"value": params.get("topic", "")}
+        return {"ok": True, "channel": channel}
+
+    def _chat_post_message(self, params):
+        channel = self._channel(params.get("channel"))
+        if channel is None:
+            return {"ok": False, "error": "channel_not_found"}
+        message = {"ts": f"{time.time():.6f}", "text": params.get("text", "")}
+        self.messages.setdefault(channel["id"], []).append(message)
+        return {"ok": True, "channel": channel["id"], "ts": message["ts"]}
+
+    def _chat_schedule_message(self, params):
+        channel = self._channel(params.get("channel"))
+        if channel is None:
+            return {"ok": False, "error": "channel_not_found"}
+        post_at = int(params.get("post_at") or 0)
+        if post_at <= time.time():
+            return {"ok": False, "error": "time_in_past"}
+        message_id = f"Q{self.calls['chat.scheduleMessage']:08d}"
+        self.scheduled_messages[message_id] = {
+            "id": message_id,
+            "channel_id": channel["id"],
+            "post_at": post_at,
+            "text": params.get("text", ""),
+            "blocks": params.get("blocks"),
+        }
+        return {
+            "ok": True,
+            "channel": channel["id"],
+            "scheduled_message_id": message_id,
+            "post_at": post_at,
+        }
+
+    def _chat_delete_scheduled_message(self, params):
+        message = self.scheduled_messages.get(params.get("scheduled_message_id"))
+        if message is None or message["channel_id"] != params.get("channel"):
+            return {"ok": False, "error": "invalid_scheduled_message_id"}
+        del self.scheduled_messages[message["id"]]
+        return {"ok": True}
+
+    def _usergroups_list(self, params):
+        include_users = str(params.get("include_users")).lower() in ("1", "true")
+        groups = [
+            group if include_users else {k: v for k, v in group.items() if k != "users"}
+            for group in self.user_groups
+        ]
+        return {"ok": True, "usergroups": groups}
+
+    def _usergroups_users_update(self, params):
+        for group in self.user_groups:
+            if group["id"] == params.get("usergroup"):
+                group["users"] = [u for u in params.get("users", "").split(",") if u]
+                return {"ok": True, "usergroup": group}
+        return {"ok": False, "error": "no_such_subteam"}
+
+
+class _StubRequestHandler(BaseHTTPRequestHandler):
+    # Keep connections alive between requests, like Slack does.
+    protocol_version = "HTTP/1.1"
+    stub = None
+    verbose = False
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == STATS_PATH:
+            self._reply(200, self.stub.stats(), {})
+            return
+        self._serve(dict(parse_qsl(url.query)))
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        params = dict(parse_qsl(url.query))
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length).decode("utf-8") if length else ""
+        if self.headers.get("Content-Type", "").startswith("application/json"):
+            params.update(json.loads(body or "{}"))
+        else:
+            params.update(parse_qsl(body))
+        self._serve(params)
+
+    def _serve(self, params):
+        path = urlsplit(self.path).path
+        if not path.startswith(API_PREFIX):
+            self._reply(404, {"ok": False, "error": "not_found"}, {})
+            return
+        if not self.headers.get("Authorization", "").startswith("Bearer "):
+            self._reply(200, {"ok": False, "error": "not_authed"}, {})
+            return
+        method = path.split(API_PREFIX, 1)[1].strip("/")
+        self._reply(*self.stub.handle(method, params))
+
+    def _reply(self, status, body, headers):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        if self.verbose:
+            super().log_message(format, *args)
+
+
+def create_stub_server(stub=None, host="127.0.0.1", port=0, verbose=False):
+    """HTTP server for ``stub``; ``port=0`` picks a free port."""
+    handler = type(
+        "StubRequestHandler",
+        (_StubRequestHandler,),
+        {"stub": stub or SlackStub(), "verbose": verbose},
+    )
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def start_stub_server(stub=None, host="127.0.0.1", port=0):
+    """Serve ``stub`` on a background thread; stop it with ``server.shutdown()``."""
+    server = create_stub_server(stub, host, port)
+    threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+    ).start()
+    return server
+
+
+def stub_base_url(server):
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}{API_PREFIX}"
+
+
+@click.command()
+@click.option("--host", default="127.0.0.1", show_default=True)
+@click.option("--port", default=8089, type=int, show_default=True)
+@click.option("--channels", default=10, type=int, show_default=True)
+@click.option(
+    "--user-groups",
+    default="goalies",
+    show_default=True,
+    help="Space-separated user group handles",
+)
+@click.option("--users", default=10, type=int, show_default=True)
+@click.option("--page-size", default=100, type=int, show_default=True)
+@click.option("--latency", default=0.0, type=float, help="Seconds added to every call")
+@click.option(
+    "--rate-limit-rate",
+    default=0.0,
+    type=click.FloatRange(0, 1),
+    help="Fraction of calls answered with a 429",
+)
+@click.option(
+    "--retry-after",
+    default=1,
+    type=int,
+    show_default=True,
+    help="Retry-After seconds sent with each 429",
+)
+@click.option(
+    "--error-rate",
+    default=0.0,
+    type=click.FloatRange(0, 1),
+    help="Fraction of calls answered with a 503",
+)
+@click.option("--seed", default=None, type=int, help="Seed for fault injection")
+@click.option("--verbose", is_flag=True, default=False, help="Log every request")
+def main(
+    host,
+    port,
+    channels,
+    user_groups,
+    users,
+    page_size,
+    latency,
+    rate_limit_rate,
+    retry_after,
+    error_rate,
+    seed,
+    verbose,
+):
+    """Run a local Slack Web API stand-in for load and failure testing."""
+    stub = SlackStub(
+        channels=channels,
+        user_groups=user_groups.split(),
+        users=users,
+        page_size=page_size,
+        latency=latency,
+        rate_limit_rate=rate_limit_rate,
+        retry_after=retry_after,
+        error_rate=error_rate,
+        seed=seed,
+    )
+    server = create_stub_server(stub, host, port, verbose=verbose)
+    print(f"🧪 Slack stub listening on {stub_base_url(server)}")
+    print(f"   Point goaliebot at it with --slack-base-url {stub_base_url(server)}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"📊 Calls served: {json.dumps(stub.stats())}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,10 @@
+import pytest
+
+from goaliebot.slack_api.ratelimit import configure_scheduler
+
+
+@pytest.fixture(autouse=True)
+def unthrottled_scheduler():
+    """Keep fake clients from waiting on Slack's real rate-limit budgets."""
+    yield configure_scheduler(throttle=False)
+    configure_scheduler()
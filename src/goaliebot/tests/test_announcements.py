@@ -0,0 +1,266 @@
+import json
+from datetime import date, datetime, time, timedelta
+
+import pytest
+from click.testing import CliRunner
+
+from goaliebot.announcements_entry import announcements, plan_rotation_announcements
+from goaliebot.core.announcements import plan_announcements, post_timestamp
+from goaliebot.core.roster import Roster
+from goaliebot.core.schedule import RotationSchedule
+from goaliebot.core.templates import Notification
+from goaliebot.operations.announcements import AnnouncementStore
+from goaliebot.slack_api.client import get_client
+from goaliebot.slack_api.client import configure_client
+from goaliebot.slack_api.directory import configure_directory
+from goaliebot.testing.slack_stub import SlackStub, start_stub_server, stub_base_url
+
+ROSTER = "alice, U001\nbob **, U002\ncarol, U003\ndan, U004\n"
+
+
+def compose(assignment):
+    return Notification(f"{assignment.goalie.handle}/{assignment.deputy.handle}")
+
+
+class TestPlanAnnouncements:
+    def schedule(self, cadence="week", anchor=date(2026, 1, 5)):
+        roster = Roster.from_text(ROSTER, mode="next_as_deputy")
+        return RotationSchedule.from_roster(roster, cadence, anchor)
+
+    def test_upcoming_periods_for_every_channel(self):
+        now = datetime(2026, 1, 5, 12, 0).timestamp()
+
+        planned = plan_announcements(
+            "team", self.schedule(), ["#a", "#b"], 2, time(9, 0), compose, now
+        )
+
+        assert [(a.channel, a.period, a.text) for a in planned] == [
+            ("#a", 1, "carol/dan"),
+            ("#b", 1, "carol/dan"),
+            ("#a", 2, "dan/alice"),
+            ("#b", 2, "dan/alice"),
+        ]
+        assert planned[0].post_at == post_timestamp(date(2026, 1, 12), time(9, 0))
+
+    def test_starts_from_the_period_in_progress(self):
+        # Three weeks after the anchor, before that week's post time.
+        now = datetime(2026, 1, 26, 8, 0).timestamp()
+
+        planned = plan_announcements(
+            "team", self.schedule(), ["#a"], 2, time(9, 0), compose, now
+        )
+
+        assert [a.period for a in planned] == [3, 4]
+
+    def test_stops_at_slacks_scheduling_horizon(self):
+        now = datetime(2026, 1, 5, 12, 0).timestamp()
+
+        planned = plan_announcements(
+            "team", self.schedule("month"), ["#a"], 10, time(9, 0), compose, now
+        )
+
+        assert [a.period for a in planned] == [1, 2, 3, 4]
+
+
+@pytest.fixture
+def stub():
+    stub = SlackStub(channels=2)
+    server = start_stub_server(stub)
+    stub.base_url = stub_base_url(server)
+    yield stub
+    configure_client()
+    configure_directory()
+    server.shutdown()
+    server.server_close()
+
+
+def invoke(tmp_path, *args):
+    return CliRunner().invoke(
+        announcements,
+        [*args, "--store", str(tmp_path / "store.json")],
+        env={"GOALIEBOT_CACHE_DIR": str(tmp_path)},
+    )
+
+
+def plan(stub, tmp_path, roster, *args):
+    return invoke(
+        tmp_path,
+        "plan",
+        *args,
+        "--file-path",
+        str(roster),
+        "--slack-token",
+        "xoxb-stub",
+        "--slack-channels",
+        "#channel-0 #channel-1",
+        "--user-group-handle",
+        "goalies",
+        "--cadence",
+        "day",
+        "--anchor",
+        date.today().isoformat(),
+        "--count",
+        "3",
+        "--post-time",
+        "09:00",
+        "--slack-base-url",
+        stub.base_url,
+    )
+
+
+def test_plan_replan_list_and_cancel(stub, tmp_path):
+    roster = tmp_path / "roster.txt"
+    roster.write_text(ROSTER)
+
+    result = plan(stub, tmp_path, roster)
+    assert result.exit_code == 0, result.output
+    assert "0 kept, 6 scheduled, 0 cancelled, 0 failed" in result.output
+    assert len(stub.scheduled_messages) == 6
+
+    result = plan(stub, tmp_path, roster)
+    assert "6 kept, 0 scheduled, 0 cancelled, 0 failed" in result.output
+    assert stub.calls["chat.scheduleMessage"] == 6
+
+    # Only the last period's goalie and deputy are unaffected.
+    roster.write_text(ROSTER.replace("dan, U004", "erin, U005"))
+    result = plan(stub, tmp_path, roster)
+    assert "2 kept, 4 scheduled, 4 cancelled, 0 failed" in result.output
+    assert len(stub.scheduled_messages) == 6
+    texts = {m["text"] for m in stub.scheduled_messages.values()}
+    assert not any("U004" in text for text in texts)
+
+    recorded = json.loads((tmp_path / "store.json").read_text())["announcements"]
+    assert {a["scheduled_message_id"] for a in recorded} == set(stub.scheduled_messages)
+
+    result = invoke(tmp_path, "list", "--file-path", str(roster))
+    assert result.output.count("pending") == 6
+
+    result = invoke(
+        tmp_path,
+        "cancel",
+        "--slack-token",
+        "xoxb-stub",
+        "--slack-base-url",
+        stub.base_url,
+    )
+    assert result.exit_code == 0, result.output
+    assert stub.scheduled_messages == {}
+    assert "No scheduled announcements" in invoke(tmp_path, "list").output
+
+
+def test_dry_run_writes_nothing(stub, tmp_path):
+    roster = tmp_path / "roster.txt"
+    roster.write_text(ROSTER)
+
+    result = plan(stub, tmp_path, roster, "--dry-run")
+
+    assert result.exit_code == 0, result.output
+    assert result.output.count("Would schedule") == 6
+    assert stub.calls["chat.scheduleMessage"] == 0
+    assert "No scheduled announcements" in invoke(tmp_path, "list").output
+
+
+def test_cancel_limited_to_one_roster(stub, tmp_path):
+    roster = tmp_path / "roster.txt"
+    roster.write_text(ROSTER)
+    plan(stub, tmp_path, roster)
+
+    result = invoke(
+        tmp_path,
+        "cancel",
+        "--slack-token",
+        "xoxb-stub",
+        "--file-path",
+        str(tmp_path / "other.txt"),
+        "--slack-base-url",
+        stub.base_url,
+    )
+
+    assert result.exit_code == 0, result.output
+    assert len(stub.scheduled_messages) == 6
+    tomorrow = (date.today() + timedelta(days=1)).isoformat()
+    assert tomorrow in invoke(tmp_path, "list").output
+
+
+def test_plan_with_block_kit_template(stub, tmp_path):
+    roster = tmp_path / "roster.txt"
+    roster.write_text(ROSTER)
+    template = tmp_path / "goalie.json"
+    template.write_text(
+        json.dumps(
+            {
+                "text": "{goalie_handle}, then {next_goalie_handle}",
+                "blocks": [
+                    {
+                        "type": "section",
+                        "text": {"type": "mrkdwn", "text": "*Goalie:* {goalie}"},
+                    }
+                ],
+            }
+        )
+    )
+
+    result = plan(stub, tmp_path, roster, "--template", str(template))
+
+    assert result.exit_code == 0, result.output
+    messages = sorted(stub.scheduled_messages.values(), key=lambda m: m["post_at"])
+    assert [m["text"] for m in messages[::2]] == [
+        "carol, then dan",
+        "dan, then alice",
+        "alice, then bob",
+    ]
+    assert messages[0]["blocks"][0]["text"]["text"] == "*Goalie:* <@U003>"
+
+    # A changed template re-plans the announcements it no longer matches.
+    template.write_text(json.dumps({"blocks": [{"type": "divider"}]}))
+    result = plan(stub, tmp_path, roster, "--template", str(template))
+    assert "0 kept, 6 scheduled, 6 cancelled, 0 failed" in result.output
+
+
+def test_plan_skips_people_away(stub, tmp_path):
+    roster = tmp_path / "roster.txt"
+    roster.write_text(ROSTER)
+    away = tmp_path / "away.txt"
+    away.write_text(f"carol, {date.today() + timedelta(days=1)}\n")
+
+    result = plan(stub, tmp_path, roster, "--availability", str(away))
+
+    assert result.exit_code == 0, result.output
+    messages = sorted(stub.scheduled_messages.values(), key=lambda m: m["post_at"])
+    goalies = [m["text"].split()[1] for m in messages[::2]]
+    assert goalies == ["<@U004>", "<@U001>", "<@U002>"]
+
+
+def test_replanning_on_a_later_day_keeps_the_periods(stub, tmp_path):
+    roster = tmp_path / "roster.txt"
+    roster.write_text(ROSTER)
+    configure_client(base_url=stub.base_url)
+    configure_directory()
+    store_path = str(tmp_path / "store.json")
+
+    def plan_on(now):
+        return plan_rotation_announcements(
+            file_path=str(roster),
+            slack_token="xoxb-stub",
+            slack_channels=["#channel-0"],
+            user_group_handle="goalies",
+            mode="next_as_deputy",
+            cadence="week",
+            anchor=None,
+            count=3,
+            post_time=time(9, 0),
+            store=AnnouncementStore(store_path),
+            now=now,
+            client=get_client("xoxb-stub"),
+        )
+
+    first = datetime.now().timestamp()
+    assert len(plan_on(first).scheduled) == 3
+
+    result = plan_on(first + timedelta(days=2).total_seconds())
+    assert (len(result.kept), len(result.scheduled), len(result.cancelled)) == (3, 0, 0)
+
+    # Once the roster has rotated, its goalie's period is the current one.
+    roster.write_text(ROSTER.replace("bob **", "bob").replace("carol", "carol **"))
+    result = plan_on(first + timedelta(days=8).total_seconds())
+    assert result.cancelled == [] and len(result.kept) == 2
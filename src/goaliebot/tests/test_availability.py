@@ -0,0 +1,168 @@
+from datetime import date
+
+import pytest
+
+from goaliebot.core.availability import AvailabilityCalendar
+from goaliebot.core.file_ops import StreamingRoster, get_next_goalie_and_deputy
+from goaliebot.core.models import Cadence, SlackUser
+from goaliebot.core.roster import Roster, next_goalie_and_deputy
+from goaliebot.rotation_entry import availability_for_period, resolve_goalie_rotation
+
+ROSTER = "alice, U001\nbob **, U002\ncarol, U003\ndan, U004\nerin, U005\n"
+FIXED_FULL_ROSTER = (
+    "alice, U001 | bob, U002\n"
+    "bob **, U002 | carol, U003\n"
+    "carol, U003 | dan, U004\n"
+    "dan, U004 | erin, U005\n"
+)
+
+ALICE, BOB, CAROL, DAN, ERIN = (
+    SlackUser(handle, f"U00{i}")
+    for i, handle in enumerate(["alice", "bob", "carol", "dan", "erin"], start=1)
+)
+
+
+def away(*people):
+    """Availability predicate with ``people`` away."""
+    return lambda user: user not in people
+
+
+@pytest.fixture
+def calendar_file(tmp_path):
+    path = tmp_path / "availability.txt"
+    path.write_text(
+        "# person, first day, last day\n"
+        "carol, 2026-03-02, 2026-03-06\n"
+        "carol, 2026-03-05, 2026-03-13  # extended\n"
+        "U004, 2026-03-20\n"
+    )
+    return str(path)
+
+
+class TestAvailabilityCalendar:
+    def test_ranges_by_handle_or_user_id(self, calendar_file):
+        calendar = AvailabilityCalendar.load(calendar_file)
+
+        assert not calendar.is_available(CAROL, date(2026, 3, 9), date(2026, 3, 16))
+        assert calendar.is_available(CAROL, date(2026, 3, 14), date(2026, 3, 21))
+        assert not calendar.is_available(DAN, date(2026, 3, 16), date(2026, 3, 23))
+        assert calendar.is_available(DAN, date(2026, 3, 21), date(2026, 3, 22))
+        assert calendar.is_available(ALICE, date(2026, 3, 2), date(2026, 3, 9))
+
+    def test_nested_ranges_merged(self):
+        calendar = AvailabilityCalendar()
+        calendar.add("alice", date(2026, 1, 1), date(2026, 1, 31))
+        calendar.add("alice", date(2026, 1, 5), date(2026, 1, 6))
+
+        assert not calendar.is_available(ALICE, date(2026, 1, 10), date(2026, 1, 11))
+        assert calendar.is_available(ALICE, date(2026, 2, 1), date(2026, 2, 2))
+
+    def test_ranges_added_after_lookup(self):
+        calendar = AvailabilityCalendar()
+        calendar.add("alice", date(2026, 1, 1), date(2026, 1, 1))
+        assert calendar.is_available(ALICE, date(2026, 2, 1), date(2026, 2, 2))
+
+        calendar.add("alice", date(2026, 2, 1), date(2026, 2, 3))
+
+        assert not calendar.is_available(ALICE, date(2026, 1, 1), date(2026, 1, 2))
+        assert not calendar.is_available(ALICE, date(2026, 2, 2), date(2026, 2, 3))
+
+    @pytest.mark.parametrize(
+        "line, message",
+        [
+            ("alice\n", "expected 'person"),
+            ("alice, 2026-13-01\n", "invalid date"),
+            ("alice, 2026-03-05, 2026-03-01\n", "range ends before it starts"),
+        ],
+    )
+    def test_invalid_lines(self, tmp_path, line, message):
+        path = tmp_path / "availability.txt"
+        path.write_text("# header\n" + line)
+
+        with pytest.raises(ValueError, match=f"Line 2: {message}"):
+            AvailabilityCalendar.load(str(path))
+
+
+class TestAvailabilityAwareRotation:
+    @pytest.mark.parametrize(
+        "mode, deputy",
+        [
+            ("no_deputy", None),
+            ("next_as_deputy", ERIN),
+            ("former_goalie_is_deputy", BOB),
+        ],
+    )
+    def test_goalie_skips_people_away(self, mode, deputy):
+        users = [ALICE, BOB, CAROL, DAN, ERIN]
+
+        assert next_goalie_and_deputy(users, 1, mode, available=away(CAROL)) == (
+            DAN,
+            deputy,
+        )
+
+    def test_deputy_follows_the_same_rule(self):
+        users = [ALICE, BOB, CAROL, DAN, ERIN]
+
+        assert next_goalie_and_deputy(
+            users, 1, "next_as_deputy", available=away(DAN)
+        ) == (CAROL, ERIN)
+        assert next_goalie_and_deputy(
+            users, 1, "former_goalie_is_deputy", available=away(BOB)
+        ) == (CAROL, DAN)
+
+    def test_fixed_full_substitutes_from_paired_deputies(self):
+        roster = Roster.from_text(FIXED_FULL_ROSTER, mode="fixed_full")
+
+        # carol is away: dan is goalie with his partner erin.
+        assert roster.next_goalie_and_deputy(away(CAROL)) == (DAN, ERIN)
+        # dan, carol's partner, is away: the next paired deputy stands in.
+        assert roster.next_goalie_and_deputy(away(DAN)) == (CAROL, ERIN)
+
+    def test_nobody_available_falls_back_to_plain_rotation(self):
+        users = [ALICE, BOB, CAROL]
+
+        assert next_goalie_and_deputy(
+            users, 0, "next_as_deputy", available=away(*users)
+        ) == (BOB, CAROL)
+
+    def test_rotate_marks_the_chosen_entry_and_keeps_pairs(self):
+        roster = Roster.from_text(FIXED_FULL_ROSTER, mode="fixed_full")
+
+        assert roster.rotate(away(DAN)) == (CAROL, ERIN)
+
+        assert roster.dumps() == FIXED_FULL_ROSTER.replace("bob **", "bob").replace(
+            "carol, U003 |", "carol **, U003 |"
+        )
+
+    def test_legacy_helper(self, tmp_path):
+        path = tmp_path / "roster.txt"
+        path.write_text(ROSTER)
+        users = [ALICE, BOB, CAROL, DAN, ERIN]
+
+        assert get_next_goalie_and_deputy(
+            str(path), users, BOB, 1, available=away(CAROL, DAN)
+        ) == (ERIN, ALICE)
+
+    def test_streamed_rosters_loaded_whole(self, tmp_path, monkeypatch):
+        path = tmp_path / "roster.txt"
+        path.write_text(ROSTER)
+        monkeypatch.setattr("goaliebot.core.file_ops.STREAMING_THRESHOLD_BYTES", 1)
+
+        roster, goalie, deputy = resolve_goalie_rotation(
+            str(path), "next_as_deputy", available=away(CAROL)
+        )
+
+        assert isinstance(roster, Roster)
+        assert (goalie, deputy) == (DAN, ERIN)
+        with pytest.raises(ValueError, match="cannot be streamed"):
+            StreamingRoster(str(path)).next_goalie_and_deputy(away(CAROL))
+
+    def test_period_follows_cadence(self, calendar_file):
+        calendar = AvailabilityCalendar.load(calendar_file)
+
+        available = availability_for_period(calendar, Cadence.WEEK, date(2026, 3, 14))
+        assert available(CAROL)
+        assert not available(DAN)
+        available = availability_for_period(calendar, Cadence.DAY, date(2026, 3, 14))
+        assert available(DAN)
+        assert availability_for_period(None, Cadence.DAY) is None
@@ -0,0 +1,139 @@
+import json
+
+import pytest
+from click.testing import CliRunner
+
+import goaliebot.batch_entry as batch_entry
+from goaliebot.batch_entry import batch, run_batch
+from goaliebot.cli import cli
+from goaliebot.core.manifest import load_manifest
+from goaliebot.core.models import Cadence, Command, SlackUser
+
+MANIFEST = """
+[defaults]
+cadence = "day"
+commands = ["update_user_group", "send_slack_message"]
+
+[[rotations]]
+name = "payments"
+file = "rosters/payments.txt"
+mode = "fixed_full"
+channels = ["payments", "C00000001"]
+user_group_handle = "payments-goalie"
+
+[[rotations]]
+file = "rosters/search.txt"
+channels = "search search-alerts"
+commands = "send_slack_message"
+"""
+
+
+@pytest.fixture
+def manifest_path(tmp_path):
+    path = tmp_path / "rotations.toml"
+    path.write_text(MANIFEST)
+    return str(path)
+
+
+class TestLoadManifest:
+    """Test manifest parsing."""
+
+    def test_rotations_loaded_with_defaults(self, manifest_path, tmp_path):
+        payments, search = load_manifest(manifest_path)
+
+        assert payments.name == "payments"
+        assert payments.file_path == str(tmp_path / "rosters/payments.txt")
+        assert payments.mode == "fixed_full"
+        assert payments.cadence == Cadence.DAY
+        assert payments.channels == ["payments", "C00000001"]
+        assert payments.commands == [
+            Command.UPDATE_USER_GROUP,
+            Command.SEND_SLACK_MESSAGE,
+        ]
+
+        assert search.name == "search"
+        assert search.mode == "next_as_deputy"
+        assert search.channels == ["search", "search-alerts"]
+        assert search.commands == [Command.SEND_SLACK_MESSAGE]
+
+    @pytest.mark.parametrize(
+        "content, message",
+        [
+            ("[defaults]\n", "does not list any"),
+            ('[[rotations]]\nmode = "no_deputy"\n', "'file' is required"),
+            ('[[rotations]]\nfile = "a.txt"\nmode = "bogus"\n', "unknown mode"),
+            ('[[rotations]]\nfile = "a.txt"\nteam = "x"\n', "unknown keys team"),
+            ('[[rotations]]\nfile = "a.txt"\ncommands = "nope"\n', "Invalid command"),
+        ],
+    )
+    def test_invalid_manifests(self, tmp_path, content, message):
+        path = tmp_path / "rotations.toml"
+        path.write_text(content)
+
+        with pytest.raises(ValueError, match=message):
+            load_manifest(str(path))
+
+
+class TestRunBatch:
+    """Test running several rotations in one process."""
+
+    def test_failures_recorded_and_batch_continues(self, manifest_path, monkeypatch):
+        clients = []
+
+        def fake_run_rotation(**kwargs):
+            clients.append(kwargs["client"])
+            if kwargs["mode"] == "fixed_full":
+                raise SystemExit(1)
+            return SlackUser("alice", "U123"), None
+
+        monkeypatch.setattr(batch_entry, "run_rotation", fake_run_rotation)
+
+        results = run_batch(load_manifest(manifest_path), "xoxp-test")
+
+        assert [result.ok for result in results] == [False, True]
+        assert results[0].error == "exited with status 1"
+        assert results[1].goalie == "alice"
+        assert clients[0] is clients[1]  # one shared client
+
+    def test_cli_writes_report(self, manifest_path, tmp_path, monkeypatch):
+        monkeypatch.setattr(
+            batch_entry,
+            "run_rotation",
+            lambda **kwargs: (SlackUser("bob", "U456"), SlackUser("carol", "U789")),
+        )
+        report_path = tmp_path / "report.json"
+
+        result = CliRunner().invoke(
+            cli,
+            [
+                "batch",
+                "--manifest",
+                manifest_path,
+                "--slack-token",
+                "xoxp-test",
+                "--report",
+                str(report_path),
+                "--directory-cache",
+                str(tmp_path / "directory.json"),
+            ],
+        )
+
+        assert result.exit_code == 0, result.output
+        report = json.loads(report_path.read_text())
+        assert [entry["deputy"] for entry in report] == ["carol", "carol"]
+
+    def test_cli_rejects_invalid_manifest(self, tmp_path):
+        path = tmp_path / "rotations.toml"
+        path.write_text("[defaults]\n")
+
+        result = CliRunner().invoke(
+            batch, ["--manifest", str(path), "--slack-token", "xoxp-test"]
+        )
+
+        assert result.exit_code == 1
+        assert "Invalid manifest" in result.output
+
+
+def test_cli_defaults_to_rotate():
+    result = CliRunner().invoke(cli, ["--file-path", "roster.txt"])
+    assert "Missing option '--slack-token'" in result.output
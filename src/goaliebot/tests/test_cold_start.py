@@ -0,0 +1,90 @@
+import os
+import subprocess
+import sys
+
+from goaliebot.telemetry.imports import parse_importtime
+
+# Import time allowed for the CLI entry point; override on slow machines.
+IMPORT_BUDGET_MS = float(os.environ.get("GOALIEBOT_IMPORT_BUDGET_MS", 200))
+HEAVY_MODULES = ("slack_sdk", "aiohttp", "asyncio", "http.server")
+
+
+def importtime(*args):
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    return completed, parse_importtime(completed.stderr)[0]
+
+
+def heavy_imports(timings):
+    return [
+        t.module
+        for t in timings
+        if any(t.module == m or t.module.startswith(m + ".") for m in HEAVY_MODULES)
+    ]
+
+
+def cli_import_ms():
+    _, timings = importtime("-c", "import goaliebot.cli")
+    return next(t for t in timings if t.module == "goaliebot.cli").cumulative_us / 1000
+
+
+def test_cli_import_within_budget():
+    best_ms = min(cli_import_ms() for _ in range(3))
+    assert best_ms <= IMPORT_BUDGET_MS
+
+
+def test_cli_import_skips_slack_sdk():
+    _, timings = importtime("-c", "import goaliebot.cli")
+    assert heavy_imports(timings) == []
+
+
+def test_failed_validation_skips_slack_sdk(tmp_path):
+    roster = tmp_path / "roster.txt"
+    roster.write_text("alice **, U001\nbob, U002\n")
+
+    completed, timings = importtime(
+        "-m",
+        "goaliebot.cli",
+        "--file-path",
+        str(roster),
+        "--slack-token",
+        "xoxb-test",
+        "--commands",
+        "send_slack_message",
+    )
+
+    assert completed.returncode == 1
+    assert heavy_imports(timings) == []
+
+
+def test_import_profile_reports_modules():
+    completed = subprocess.run(
+        [sys.executable, "-m", "goaliebot.cli", "--import-profile", "--help"],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+
+    assert completed.returncode == 0
+    assert "Goalie rotation for Slack." in completed.stdout
+    assert "goaliebot.cli" in completed.stdout
+
+
+def test_parse_importtime():
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   goaliebot.core.models\n"
+        "import time:       300 |        420 | goaliebot.core\n"
+        "some warning\n"
+    )
+
+    timings, other = parse_importtime(stderr)
+
+    assert [(t.module, t.self_us, t.cumulative_us, t.depth) for t in timings] == [
+        ("goaliebot.core.models", 120, 120, 1),
+        ("goaliebot.core", 300, 420, 0),
+    ]
+    assert other == ["some warning"]
@@ -0,0 +1,175 @@
+import pytest
+from click.testing import CliRunner
+
+from goaliebot import rotation_entry
+from goaliebot.cli import cli
+from goaliebot.operations import command_runner
+from goaliebot.core.compiled import CURRENT_INDEX_OFFSET, CompiledRoster, compile_file
+from goaliebot.core.file_ops import RosterCache, load_roster, write_rotated_roster
+from goaliebot.core.models import MODES, Cadence, Command, SlackUser
+from goaliebot.core.roster import Roster
+
+ROSTER = "# team\nalice, U001\n\nbob **,   U002\r\ncarol, U003\ndan, U004"
+FIXED_FULL_ROSTER = (
+    "alice, U001 | bob, U002\n"
+    "bob **, U002 | carol, U003\n"
+    "carol, U003 | alice, U001\n"
+)
+
+
+def roster_text(mode):
+    return FIXED_FULL_ROSTER if mode == "fixed_full" else ROSTER
+
+
+@pytest.fixture
+def compiled(tmp_path):
+    def build(text, mode="next_as_deputy"):
+        source = tmp_path / "roster.txt"
+        source.write_bytes(text.encode("utf-8"))
+        target = tmp_path / "roster.bin"
+        compile_file(str(source), str(target), mode=mode)
+        return str(target)
+
+    return build
+
+
+class TestCompiledRoster:
+    @pytest.mark.parametrize("mode", MODES)
+    def test_matches_text_roster(self, compiled, mode):
+        text = roster_text(mode)
+        roster = Roster.from_text(text, mode=mode)
+
+        with CompiledRoster(compiled(text, mode)) as binary:
+            assert list(binary) == roster.users
+            assert binary.current_goalie == roster.current_goalie
+            for _ in range(5):
+                assert binary.next_goalie_and_deputy() == roster.rotate()
+                binary.current_index = roster.current_index
+
+    def test_decompiles_byte_for_byte(self, compiled):
+        with CompiledRoster(compiled(ROSTER)) as binary:
+            assert binary.dumps() == ROSTER
+
+    def test_rotation_patches_only_the_header(self, compiled):
+        path = compiled(ROSTER)
+        with open(path, "rb") as f:
+            before = f.read()
+
+        roster = load_roster(path)
+        assert isinstance(roster, CompiledRoster)
+        write_rotated_roster(roster, path)
+
+        with open(path, "rb") as f:
+            after = f.read()
+        assert len(after) == len(before)
+        assert [i for i in range(len(after)) if after[i] != before[i]] == [
+            CURRENT_INDEX_OFFSET
+        ]
+        with CompiledRoster(path) as binary:
+            assert binary.current_goalie == SlackUser("carol", "U003")
+            assert binary.dumps() == (
+                "# team\nalice, U001\n\nbob, U002\r\ncarol **, U003\ndan, U004"
+            )
+
+    def test_fixed_full_layout_required(self, compiled):
+        path = compiled(ROSTER)
+
+        with pytest.raises(ValueError, match="compiled for mode next_as_deputy"):
+            CompiledRoster(path, mode="fixed_full")
+        with CompiledRoster(path, mode="no_deputy") as binary:
+            assert binary.next_goalie_and_deputy() == (
+                SlackUser("carol", "U003"),
+                None,
+            )
+
+    def test_roster_cache_reads_compiled_files(self, compiled):
+        cache = RosterCache()
+
+        assert isinstance(cache.load(compiled(ROSTER)), CompiledRoster)
+        assert cache.parses == 0
+
+
+def test_rotation_closes_compiled_roster(compiled, monkeypatch):
+    path = compiled(ROSTER)
+    closed = []
+    monkeypatch.setattr(
+        CompiledRoster, "close", lambda self: closed.append(self._buffer.close())
+    )
+    monkeypatch.setattr(
+        rotation_entry, "resolve_user_group_id", lambda *args: "S00000001"
+    )
+    monkeypatch.setattr(command_runner, "run_slack_commands", lambda **kwargs: None)
+
+    for _ in range(2):
+        rotation_entry.run_rotation(
+            path,
+            "xoxb-test",
+            [],
+            "goalies",
+            [Command.UPDATE_USER_GROUP],
+            "next_as_deputy",
+            Cadence.WEEK,
+        )
+
+    assert len(closed) == 2
+    with CompiledRoster(path) as binary:
+        assert binary.current_goalie == SlackUser("dan", "U004")
+
+
+class TestCompileCommand:
+    def test_round_trip(self, tmp_path):
+        source = tmp_path / "roster.txt"
+        source.write_text(FIXED_FULL_ROSTER)
+        binary = tmp_path / "roster.bin"
+        runner = CliRunner()
+
+        result = runner.invoke(
+            cli,
+            [
+                "compile",
+                "--file-path",
+                str(source),
+                "--output",
+                str(binary),
+                "--mode",
+                "fixed_full",
+            ],
+        )
+        assert result.exit_code == 0, result.output
+        assert "Compiled 3 entries" in result.output
+
+        result = runner.invoke(
+            cli,
+            ["compile", "--decompile", "--file-path", str(binary), "--output", "-"],
+        )
+        assert result.exit_code == 0, result.output
+        assert result.output == FIXED_FULL_ROSTER
+
+    def test_non_ascii_round_trip_through_files(self, tmp_path):
+        text = "Zoë **, U001\r\nJosé, U002\n"
+        source = tmp_path / "roster.txt"
+        source.write_bytes(text.encode("utf-8"))
+        binary = tmp_path / "roster.bin"
+        decompiled = tmp_path / "decompiled.txt"
+        runner = CliRunner()
+
+        for args in (
+            ["--file-path", str(source), "--output", str(binary)],
+            ["--decompile", "--file-path", str(binary), "--output", str(decompiled)],
+        ):
+            result = runner.invoke(cli, ["compile", *args])
+            assert result.exit_code == 0, result.output
+
+        assert decompiled.read_bytes() == text.encode("utf-8")
+
+    def test_decompile_rejects_text(self, tmp_path):
+        source = tmp_path / "roster.txt"
+        source.write_text(ROSTER)
+
+        result = CliRunner().invoke(
+            cli,
+            ["compile", "--decompile", "--file-path", str(source), "--output", "-"],
+        )
+
+        assert result.exit_code == 1
+        assert "is not a compiled roster" in result.output
@@ -0,0 +1,108 @@
+import json
+
+from goaliebot.slack_api.directory import CHANNELS, SlackDirectory
+
+
+class FakeClient:
+    """Minimal stand-in for WebClient that counts listing calls."""
+
+    def __init__(self, pages, usergroups=None, token="xoxp-test"):
+        self.token = token
+        self.pages = pages
+        self.usergroups = usergroups or []
+        self.list_calls = 0
+        self.usergroup_calls = 0
+
+    def conversations_list(self, cursor=None, **kwargs):
+        self.list_calls += 1
+        page = int(cursor) if cursor else 0
+        next_cursor = str(page + 1) if page + 1 < len(self.pages) else ""
+        return {
+            "channels": self.pages[page],
+            "response_metadata": {"next_cursor": next_cursor},
+        }
+
+    def usergroups_list(self, **kwargs):
+        self.usergroup_calls += 1
+        return {"usergroups": self.usergroups}
+
+
+def make_client():
+    return FakeClient(
+        pages=[
+            [{"name": "general", "id": "C00000001"}],
+            [{"name": "goalies", "id": "C00000002"}],
+        ],
+        usergroups=[{"handle": "goaliebot", "id": "S00000001"}],
+    )
+
+
+class TestSlackDirectory:
+    """Test SlackDirectory name resolution and caching."""
+
+    def test_channels_resolved_from_single_paged_pass(self):
+        client = make_client()
+        directory = SlackDirectory()
+
+        assert directory.channel_id(client, "#general") == "C00000001"
+        assert directory.channel_id(client, "goalies") == "C00000002"
+        assert client.list_calls == 2  # one pass over both pages
+
+    def test_ids_skip_lookup(self):
+        client = make_client()
+        directory = SlackDirectory()
+
+        assert directory.channel_id(client, "C12345678") == "C12345678"
+        assert directory.user_group_id(client, "S12345678") == "S12345678"
+        assert client.list_calls == 0
+        assert client.usergroup_calls == 0
+
+    def test_index_persisted_between_instances(self, tmp_path):
+        cache_path = str(tmp_path / "directory.json")
+        SlackDirectory(cache_path=cache_path).user_group_id(make_client(), "goaliebot")
+
+        client = make_client()
+        directory = SlackDirectory(cache_path=cache_path)
+        assert directory.user_group_id(client, "@goaliebot") == "S00000001"
+        assert client.usergroup_calls == 0
+
+    def test_expired_index_is_refetched(self, tmp_path):
+        cache_path = str(tmp_path / "directory.json")
+        SlackDirectory(cache_path=cache_path).channel_id(make_client(), "general")
+
+        client = make_client()
+        SlackDirectory(cache_path=cache_path, ttl=-1).channel_id(client, "general")
+        assert client.list_calls == 2
+
+    def test_unknown_name_refreshes_once(self, tmp_path):
+        cache_path = str(tmp_path / "directory.json")
+        SlackDirectory(cache_path=cache_path).channel_id(make_client(), "general")
+
+        client = make_client()
+        client.pages[1].append({"name": "new-team", "id": "C00000003"})
+        directory = SlackDirectory(cache_path=cache_path)
+
+        assert directory.channel_id(client, "new-team") == "C00000003"
+        assert directory.channel_id(client, "missing") is None
+        assert client.list_calls == 2
+
+    def test_invalidate_drops_entry(self, tmp_path):
+        cache_path = str(tmp_path / "directory.json")
+        client = make_client()
+        directory = SlackDirectory(cache_path=cache_path)
+        directory.channel_id(client, "general")
+
+        directory.invalidate(client, CHANNELS, "#general")
+
+        with open(cache_path) as f:
+            state = json.load(f)
+        (workspace,) = state.values()
+        assert "general" not in workspace[CHANNELS]["index"]
+
+    def test_workspaces_do_not_share_entries(self):
+        directory = SlackDirectory()
+        directory.channel_id(make_client(), "general")
+
+        other = FakeClient(pages=[[]], token="xoxp-other")
+        assert directory.channel_id(other, "general") is None
+        assert other.list_calls == 1
@@ -1,15 +1,18 @@
 import pytest
 import tempfile
+import tracemalloc
 import os
+from goaliebot.core import patching
+from goaliebot.core.compact import CompactRoster
 from goaliebot.core.file_ops import (
+    StreamingRoster,
     get_goalie_and_users,
     get_next_goalie_and_deputy,
     update_goalie_file,
-    _find_current_goalie_index,
-    _find_target_line_index,
-    _line_matches_goalie,
 )
 from goaliebot.core.models import SlackUser
+from goaliebot.core.patching import FileChangedError, journal_path
+from goaliebot.core.roster import Roster
 
 
 @pytest.fixture
@@ -305,37 +308,56 @@ User6, ID006 | User3, ID003"""
         assert users[current_index + 1].handle == "User6"  # Position after current
 
 
-class TestHelperFunctions:
-    """Test helper functions."""
+class TestRoster:
+    """Test the in-memory Roster."""
 
-    def test_find_current_goalie_index(self):
-        """Test _find_current_goalie_index function."""
-        lines = ["Alice, U123", "Bob **, U456", "Charlie, U789"]
-        assert _find_current_goalie_index(lines) == 1
+    def test_current_goalie_position(self):
+        roster = Roster.from_text("Alice, U123\nBob **, U456\nCharlie, U789")
+        assert roster.current_index == 1
 
-        lines_no_current = ["Alice, U123", "Bob, U456", "Charlie, U789"]
-        assert _find_current_goalie_index(lines_no_current) == -1
+        roster = Roster.from_text("Alice, U123\nBob, U456\nCharlie, U789")
+        assert roster.current_index == -1
 
-    def test_line_matches_goalie(self):
-        """Test _line_matches_goalie function."""
-        assert _line_matches_goalie("Bob, U456", "Bob")
-        assert _line_matches_goalie("Bob **, U456", "Bob")
-        assert _line_matches_goalie("Bob, U456 | Alice, U123", "Bob")
-        assert not _line_matches_goalie("Alice, U123", "Bob")
-        assert not _line_matches_goalie("# Comment", "Bob")
-        assert not _line_matches_goalie("", "Bob")
+    def test_handle_index(self):
+        roster = Roster.from_text(
+            "# Comment\n\nBob, U456 | Alice, U123\nBob **, U456 | Carol, U789",
+            mode="fixed_full",
+        )
+        assert roster.handle_index == {"Bob": [0, 1]}
+        assert roster.line_indexes == [2, 3]
+        assert roster.deputies[1].handle == "Carol"
+
+    def test_find_next_position(self):
+        roster = Roster.from_text(
+            "User A, ID001\nUser B, ID002\nUser A **, ID001\nUser C, ID003"
+        )
+        assert roster.find_next_position(SlackUser("User C", "ID003")) == 3
+
+        # Wrap around to the first User A
+        roster.mark(3)
+        assert roster.find_next_position(SlackUser("User A", "ID001")) == 0
+        assert roster.find_next_position(SlackUser("User D", "ID004")) == -1
+
+    def test_rotate_preserves_unchanged_lines(self):
+        content = "# Team\nAlice, U123   \n\nBob **, U456\nCharlie,U789\n"
+        roster = Roster.from_text(content)
+
+        next_goalie, next_deputy = roster.rotate()
+
+        assert (next_goalie.handle, next_deputy.handle) == ("Charlie", "Alice")
+        assert roster.dumps() == (
+            "# Team\nAlice, U123   \n\nBob, U456\nCharlie **, U789\n"
+        )
 
-    def test_find_target_line_index(self):
-        """Test _find_target_line_index function."""
-        lines = ["User A, ID001", "User B, ID002", "User A **, ID001", "User C, ID003"]
+    def test_rotate_wraps_in_fixed_full(self):
+        roster = Roster.from_text(
+            "Alice, U123 | Bob, U456\nBob **, U456 | Alice, U123", mode="fixed_full"
+        )
 
-        current_index = 2  # User A ** is at index 2
-        target_index = _find_target_line_index(lines, current_index, "User C")
-        assert target_index == 3
+        roster.rotate()
 
-        # Test wrap around
-        target_index = _find_target_line_index(lines, 3, "User A")
-        assert target_index == 0  # Should find first User A
+        assert roster.current_index == 0
+        assert roster.dumps() == "Alice **, U123 | Bob, U456\nBob, U456 | Alice, U123"
 
 
 class TestUpdateGoalieFile:
@@ -381,3 +403,230 @@ Charlie, U789 | Alice, U123"""
         assert (
             "Charlie **, U789 | Alice, U123" in updated_content
         )  # ** added to Charlie
+
+    def test_update_goalie_file_keeps_comments(self, temp_file):
+        """Test that comments and blank lines survive an update."""
+        content = """# Goalies
+Alice, U123
+
+Bob **, U456
+"""
+        create_test_file(content, temp_file)
+
+        update_goalie_file(temp_file, SlackUser("Alice", "U123"))
+
+        with open(temp_file, "r") as f:
+            assert f.read() == "# Goalies\nAlice **, U123\n\nBob, U456\n"
+
+    def test_update_goalie_file_patches_changed_lines_in_place(
+        self, temp_file, monkeypatch
+    ):
+        """Only the changed span is written, after a journal of it."""
+        content = "# Goalies\r\nAlice,   U123\r\nBob **, U456\r\nCarol, U789\r\n"
+        with open(temp_file, "wb") as f:
+            f.write(content.encode("utf-8"))
+        atomic_write = patching.atomic_write
+        replaced = []
+        monkeypatch.setattr(
+            patching,
+            "atomic_write",
+            lambda path, chunks: replaced.append(path) or atomic_write(path, chunks),
+        )
+
+        update_goalie_file(temp_file, SlackUser("Carol", "U789"))
+
+        with open(temp_file, "rb") as f:
+            assert f.read() == (
+                b"# Goalies\r\nAlice,   U123\r\nBob, U456\r\nCarol **, U789\r\n"
+            )
+        assert replaced == [journal_path(temp_file)]
+        assert not os.path.exists(journal_path(temp_file))
+
+    def test_interrupted_patch_completed_on_load(self, temp_file, monkeypatch):
+        create_test_file("Alice, U123\nBob **, U456\nCarol, U789\n", temp_file)
+        roster = Roster.load(temp_file)
+        roster.rotate()
+
+        def torn_write(f, offset, data):
+            f.seek(offset)
+            f.write(data[: len(data) // 2])
+            f.flush()
+            raise OSError("No space left on device")
+
+        with monkeypatch.context() as m:
+            m.setattr(patching, "_write_span", torn_write)
+            with pytest.raises(OSError):
+                roster.save(temp_file)
+        assert os.path.exists(journal_path(temp_file))
+
+        assert Roster.load(temp_file).current_goalie == SlackUser("Carol", "U789")
+        with open(temp_file) as f:
+            assert f.read() == "Alice, U123\nBob, U456\nCarol **, U789\n"
+        assert not os.path.exists(journal_path(temp_file))
+
+    def test_length_change_replaces_file_atomically(self, temp_file):
+        create_test_file("Alice, U123\nBob **,   U456\n", temp_file)
+
+        update_goalie_file(temp_file, SlackUser("Alice", "U123"))
+
+        with open(temp_file) as f:
+            assert f.read() == "Alice **, U123\nBob, U456\n"
+        leftovers = os.listdir(os.path.dirname(temp_file))
+        assert not [name for name in leftovers if name.endswith(".tmp")]
+
+    def test_file_changed_on_disk_is_not_overwritten(self, temp_file):
+        create_test_file("Alice, U123\nBob **, U456\n", temp_file)
+        roster = Roster.load(temp_file)
+        create_test_file("Alice, U123\nBob **, U456\nCarol, U789\n", temp_file)
+
+        roster.rotate()
+        with pytest.raises(FileChangedError, match="changed on disk"):
+            roster.save(temp_file)
+
+        with open(temp_file) as f:
+            assert f.read() == "Alice, U123\nBob **, U456\nCarol, U789\n"
+
+    def test_same_size_reorder_is_not_overwritten(self, temp_file):
+        create_test_file("Alice, U123\nBob **, U456\nCarol, U789\n", temp_file)
+        roster = Roster.load(temp_file)
+        create_test_file("Carol, U789\nBob **, U456\nAlice, U123\n", temp_file)
+
+        roster.rotate()
+        with pytest.raises(FileChangedError):
+            roster.save(temp_file)
+
+        with open(temp_file) as f:
+            assert f.read() == "Carol, U789\nBob **, U456\nAlice, U123\n"
+        leftovers = os.listdir(os.path.dirname(temp_file))
+        assert not [name for name in leftovers if name.endswith(".tmp")]
+
+
+class TestStreamingRoster:
+    """Test the constant-memory streaming reader/rewriter."""
+
+    @pytest.mark.parametrize(
+        "mode", ["next_as_deputy", "former_goalie_is_deputy", "no_deputy"]
+    )
+    @pytest.mark.parametrize("current", [0, 2, 4])
+    def test_matches_roster(self, temp_file, mode, current):
+        lines = [f"User{i}{' **' if i == current else ''}, U{i:03d}" for i in range(5)]
+        content = "# Team\n" + "\n\n".join(lines) + "\n"
+        create_test_file(content, temp_file)
+
+        streaming = StreamingRoster(temp_file, mode=mode)
+        roster = Roster.from_text(content, mode=mode)
+
+        assert streaming.current_goalie == roster.current_goalie
+        assert streaming.rotate() == roster.rotate()
+        streaming.save(temp_file)
+        with open(temp_file) as f:
+            assert f.read() == roster.dumps()
+
+    def test_fixed_full_wraparound(self, temp_file):
+        content = """Alice, U123 | Bob, U456
+Bob, U456 | Carol, U789
+Carol **, U789 | Alice, U123"""
+        create_test_file(content, temp_file)
+
+        roster = StreamingRoster(temp_file, mode="fixed_full")
+        next_goalie, next_deputy = roster.rotate()
+        roster.save(temp_file)
+
+        assert next_goalie == SlackUser("Alice", "U123")
+        assert next_deputy == SlackUser("Bob", "U456")
+        with open(temp_file) as f:
+            assert f.read() == (
+                "Alice **, U123 | Bob, U456\n"
+                "Bob, U456 | Carol, U789\n"
+                "Carol, U789 | Alice, U123"
+            )
+
+    def test_file_changed_on_disk_is_not_overwritten(self, temp_file):
+        create_test_file("Alice, U123\nBob **, U456\nCarol, U789\n", temp_file)
+        streaming = StreamingRoster(temp_file)
+        create_test_file("Carol, U789\nBob **, U456\nAlice, U123\n", temp_file)
+
+        streaming.rotate()
+        with pytest.raises(FileChangedError):
+            streaming.save(temp_file)
+
+        with open(temp_file) as f:
+            assert f.read() == "Carol, U789\nBob **, U456\nAlice, U123\n"
+
+    def test_single_entry(self, temp_file):
+        create_test_file("Alice **, U123\n", temp_file)
+
+        roster = StreamingRoster(temp_file)
+
+        assert roster.rotate() == (SlackUser("Alice", "U123"),) * 2
+
+    def test_peak_memory_independent_of_roster_size(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(patching, "COPY_CHUNK_BYTES", 16 * 1024)
+
+        def peak_for(entries):
+            path = tmp_path / f"roster_{entries}.txt"
+            with open(path, "w") as f:
+                for i in range(entries):
+                    f.write(f"user{i}{' **' if i == entries // 2 else ''}, U{i:07d}\n")
+            tracemalloc.start()
+            roster = StreamingRoster(str(path))
+            roster.rotate()
+            roster.save(str(path))
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            return peak
+
+        small, large = peak_for(5_000), peak_for(50_000)
+        assert large < small * 1.5
+
+
+class TestCompactRoster:
+    """Test the dictionary-encoded CompactRoster."""
+
+    CONTENT = """# Team
+Alice, U123 | Bob, U456
+Bob **, U456 | Alice, U123
+Alice, U123 | Carol, U789
+"""
+
+    def test_matches_roster(self, temp_file):
+        create_test_file(self.CONTENT, temp_file)
+
+        compact = CompactRoster.load(temp_file, mode="fixed_full")
+        roster = Roster.load(temp_file, mode="fixed_full")
+
+        assert list(compact) == roster.users
+        assert list(compact.deputies) == roster.deputies
+        assert compact.current_goalie == roster.current_goalie
+        assert compact.next_goalie_and_deputy() == roster.next_goalie_and_deputy()
+
+    def test_non_ascii_handles_match_roster(self, temp_file):
+        with open(temp_file, "wb") as f:
+            f.write("Zoë, U123\nJosé **, U456\n".encode("utf-8"))
+
+        compact = CompactRoster.load(temp_file)
+
+        assert list(compact) == Roster.load(temp_file).users
+        assert compact.current_goalie == SlackUser("José", "U456")
+
+    def test_strings_stored_once(self):
+        compact = CompactRoster.from_roster(
+            Roster.from_text(self.CONTENT, mode="fixed_full")
+        )
+
+        assert len(compact) == 3
+        assert len(compact._strings) == 6  # three handles, three IDs
+        assert compact[0].handle is compact[2].handle
+
+    def test_standard_mode_has_no_deputies(self):
+        compact = CompactRoster.from_roster(Roster.from_text("A, U1\nB **, U2"))
+
+        assert compact.deputies is None
+        assert compact.deputy(0) is None
+        assert compact.next_goalie_and_deputy() == (
+            SlackUser("A", "U1"),
+            SlackUser("B", "U2"),
+        )
+
+    def test_slots(self):
+        assert not hasattr(CompactRoster(), "__dict__")
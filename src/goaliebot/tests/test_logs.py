@@ -0,0 +1,77 @@
+import io
+import json
+
+import pytest
+
+from goaliebot.slack_api.messaging import send_goalie_notification
+from goaliebot.slack_api.ratelimit import get_scheduler
+from goaliebot.telemetry.logs import FIELDS, RunLogger, configure_logging
+
+
+class FakeClient:
+    token = "xoxp-test"
+
+    def chat_postMessage(self, **kwargs):
+        return {"ok": True, "ts": "1.0", "message": {"text": "x" * 5000}}
+
+
+@pytest.fixture
+def log_stream():
+    stream = io.StringIO()
+    yield stream
+    configure_logging()
+
+
+def json_lines(stream):
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+class TestRunLogger:
+    def test_json_lines_have_a_fixed_schema(self, log_stream):
+        logger = RunLogger(fmt="json", stream=log_stream)
+
+        logger.info("message_sent", "Message sent to C1.", channel="C1", ok=True)
+        logger.warning("retry", "⏳ retrying", method="chat_postMessage")
+
+        records = json_lines(log_stream)
+        assert [tuple(record) for record in records] == [FIELDS, FIELDS]
+        assert records[0]["channel"] == "C1"
+        assert records[1]["level"] == "warning"
+        assert records[1]["ok"] is None
+
+    def test_levels_filter_events(self, log_stream):
+        logger = RunLogger(level="warning", stream=log_stream)
+
+        logger.info("noise", "not shown")
+        logger.error("failed", "shown")
+
+        assert log_stream.getvalue() == "shown\n"
+
+    def test_unknown_level_rejected(self):
+        with pytest.raises(ValueError, match="Unknown log level"):
+            RunLogger(level="loud")
+
+
+class TestSlackCallLogging:
+    def test_response_bodies_omitted_by_default(self, log_stream):
+        configure_logging(fmt="json", stream=log_stream)
+
+        send_goalie_notification(FakeClient(), ["C1"], "hello")
+
+        (record,) = json_lines(log_stream)
+        assert record["event"] == "message_sent"
+        assert record["method"] == "chat_postMessage"
+        assert record["ok"] is True
+        assert "response" not in record
+
+    def test_debug_captures_truncated_payloads(self, log_stream):
+        configure_logging(level="debug", fmt="json", stream=log_stream)
+
+        get_scheduler().call(FakeClient(), "chat_postMessage", channel="C1")
+
+        (record,) = json_lines(log_stream)
+        assert record["event"] == "slack_call"
+        assert record["channel"] == "C1"
+        assert record["latency_ms"] >= 0
+        assert len(record["response"]) < 2100
+        assert record["response"].endswith("more characters)")
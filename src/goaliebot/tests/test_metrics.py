@@ -0,0 +1,117 @@
+import json
+
+from click.testing import CliRunner
+from slack_sdk.errors import SlackApiError
+from slack_sdk.web.slack_response import SlackResponse
+
+from goaliebot.cli import cli
+from goaliebot.slack_api.client import configure_client
+from goaliebot.slack_api.directory import configure_directory
+from goaliebot.slack_api.ratelimit import RateLimitScheduler
+from goaliebot.telemetry.metrics import RunMetrics, configure_metrics
+from goaliebot.testing.slack_stub import SlackStub, start_stub_server, stub_base_url
+
+
+class RateLimitedOnce:
+    token = "xoxp-test"
+
+    def __init__(self):
+        self.calls = 0
+
+    def usergroups_list(self, **kwargs):
+        self.calls += 1
+        if self.calls == 1:
+            response = SlackResponse(
+                client=None,
+                http_verb="GET",
+                api_url="https://slack.com/api/usergroups.list",
+                req_args={},
+                data={"ok": False, "error": "ratelimited"},
+                headers={"retry-after": "0"},
+                status_code=429,
+            )
+            raise SlackApiError("ratelimited", response)
+        return {"ok": True, "usergroups": []}
+
+
+def test_phases_accumulate():
+    metrics = RunMetrics()
+    for _ in range(2):
+        with metrics.phase("parse_roster"):
+            pass
+
+    assert metrics.to_dict()["phases"]["parse_roster"]["count"] == 2
+
+
+def test_scheduler_records_calls_errors_and_retries():
+    metrics = configure_metrics()
+
+    RateLimitScheduler(throttle=False).call(RateLimitedOnce(), "usergroups_list")
+
+    method = metrics.to_dict()["slack_methods"]["usergroups_list"]
+    assert (method["calls"], method["errors"], method["retries"]) == (2, 1, 1)
+    assert method["latency_seconds"]["count"] == 2
+    assert method["response_bytes"] > 0
+
+
+def test_prometheus_histogram_is_cumulative():
+    metrics = RunMetrics()
+    for seconds in (0.01, 0.3, 20):
+        metrics.record_call("chat_postMessage", seconds)
+
+    text = metrics.to_prometheus()
+
+    bucket = 'goaliebot_slack_api_latency_seconds_bucket{method="chat_postMessage"'
+    assert f'{bucket},le="0.05"}} 1' in text
+    assert f'{bucket},le="0.5"}} 2' in text
+    assert f'{bucket},le="+Inf"}} 3' in text
+    assert 'goaliebot_slack_api_calls_total{method="chat_postMessage"} 3' in text
+
+
+def test_rotation_writes_metrics_files(tmp_path):
+    server = start_stub_server(SlackStub(channels=2))
+    roster = tmp_path / "roster.txt"
+    roster.write_text("alice **, U001\nbob, U002\ncarol, U003\n")
+    try:
+        result = CliRunner().invoke(
+            cli,
+            [
+                "--file-path",
+                str(roster),
+                "--slack-token",
+                "xoxb-stub",
+                "--slack-channels",
+                "#channel-0 #channel-1",
+                "--user-group-handle",
+                "goalies",
+                "--directory-cache",
+                str(tmp_path / "directory.json"),
+                "--slack-base-url",
+                stub_base_url(server),
+                "--metrics-json",
+                str(tmp_path / "metrics.json"),
+                "--metrics-textfile",
+                str(tmp_path / "goaliebot.prom"),
+            ],
+        )
+    finally:
+        server.shutdown()
+        server.server_close()
+        configure_client()
+        configure_directory()
+
+    assert result.exit_code == 0, result.output
+    metrics = json.loads((tmp_path / "metrics.json").read_text())
+    assert {
+        "rotation",
+        "parse_roster",
+        "resolve_rotation",
+        "lookup_user_group",
+        "update_user_group",
+        "update_topic_description",
+        "send_slack_message",
+        "write_roster",
+    } <= set(metrics["phases"])
+    assert metrics["slack_methods"]["chat_postMessage"]["calls"] == 2
+    prometheus = (tmp_path / "goaliebot.prom").read_text()
+    assert 'goaliebot_phase_runs{phase="rotation"} 1' in prometheus
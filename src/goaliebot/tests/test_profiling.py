@@ -0,0 +1,85 @@
+import pstats
+import time
+
+from click.testing import CliRunner
+
+from goaliebot.cli import cli
+from goaliebot.slack_api.client import configure_client
+from goaliebot.slack_api.directory import configure_directory
+from goaliebot.telemetry.profiling import RunProfiler
+from goaliebot.testing.slack_stub import SlackStub, start_stub_server, stub_base_url
+
+
+def busy_leaf(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def busy_caller():
+    busy_leaf(0.05)
+    return [str(i) * 10 for i in range(20_000)]
+
+
+def test_profiles_written(tmp_path):
+    profiler = RunProfiler(str(tmp_path / "profile"), top=5)
+
+    profiler.start()
+    try:
+        kept = busy_caller()
+    finally:
+        profiler.stop()
+    paths = profiler.write()
+
+    functions = {name for _, _, name in pstats.Stats(paths["pstats"]).stats}
+    assert {"busy_caller", "busy_leaf"} <= functions
+    stacks = open(paths["collapsed"]).read().splitlines()
+    assert any(
+        "busy_caller (tests/test_profiling.py:19);busy_leaf" in line for line in stacks
+    )
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in stacks)
+    report = open(paths["allocations"]).read()
+    assert report.startswith("Peak traced memory:")
+    assert "test_profiling.py:21" in report
+    assert len(kept) == 20_000
+
+
+def test_rotation_profile_option(tmp_path):
+    server = start_stub_server(SlackStub(channels=1))
+    roster = tmp_path / "roster.txt"
+    roster.write_text("alice **, U001\nbob, U002\n")
+    try:
+        result = CliRunner().invoke(
+            cli,
+            [
+                "--file-path",
+                str(roster),
+                "--slack-token",
+                "xoxb-stub",
+                "--slack-channels",
+                "#channel-0",
+                "--user-group-handle",
+                "goalies",
+                "--directory-cache",
+                str(tmp_path / "directory.json"),
+                "--slack-base-url",
+                stub_base_url(server),
+                "--profile",
+                str(tmp_path / "profile"),
+            ],
+        )
+    finally:
+        server.shutdown()
+        server.server_close()
+        configure_client()
+        configure_directory()
+
+    assert result.exit_code == 0, result.output
+    assert "📊 Profiles written to" in result.output
+    assert sorted(path.name for path in (tmp_path / "profile").iterdir()) == [
+        "allocations.txt",
+        "goaliebot.collapsed",
+        "goaliebot.pstats",
+    ]
+    stats = pstats.Stats(str(tmp_path / "profile" / "goaliebot.pstats"))
+    assert "run_rotation" in {name for _, _, name in stats.stats}
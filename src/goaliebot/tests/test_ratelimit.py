@@ -0,0 +1,251 @@
+import asyncio
+from urllib.error import URLError
+
+import pytest
+from slack_sdk.errors import SlackApiError
+from slack_sdk.web.slack_response import SlackResponse
+
+import goaliebot.slack_api.ratelimit as ratelimit
+from goaliebot.slack_api.ratelimit import RateLimitScheduler
+from goaliebot.slack_api.resilience import (
+    CircuitOpenError,
+    DeadlineExceededError,
+    Resilience,
+    RetryPolicy,
+    SlackUnavailableError,
+)
+
+
+def rate_limited_error(retry_after="2"):
+    response = SlackResponse(
+        client=None,
+        http_verb="POST",
+        api_url="https://slack.com/api/chat.postMessage",
+        req_args={},
+        data={"ok": False, "error": "ratelimited"},
+        headers={"retry-after": retry_after},
+        status_code=429,
+    )
+    return SlackApiError("ratelimited", response)
+
+
+def server_error():
+    response = rate_limited_error().response
+    response.status_code = 503
+    response.data = {"ok": False, "error": "service_unavailable"}
+    return SlackApiError("service_unavailable", response)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FlakyClient:
+    """Fails with a 429 a given number of times before succeeding."""
+
+    token = "xoxp-test"
+
+    def __init__(self, failures, error=None):
+        self.failures = failures
+        self.error = error or rate_limited_error()
+        self.calls = 0
+
+    def chat_postMessage(self, **kwargs):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error
+        return {"ok": True}
+
+    usergroups_users_update = chat_postMessage
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    recorded = []
+    monkeypatch.setattr(ratelimit.time, "sleep", recorded.append)
+    return recorded
+
+
+class TestRateLimitScheduler:
+    """Test token buckets and Retry-After handling."""
+
+    def test_retry_after_honored(self, sleeps):
+        client = FlakyClient(failures=2)
+        scheduler = RateLimitScheduler()
+
+        response = scheduler.call(client, "chat_postMessage", channel="C1", text="hi")
+
+        assert response == {"ok": True}
+        assert client.calls == 3
+        assert sleeps[0] == 0
+        assert sleeps[1] == pytest.approx(2, abs=0.1)
+
+    def test_gives_up_after_max_retries(self, sleeps):
+        client = FlakyClient(failures=5)
+        scheduler = RateLimitScheduler(max_retries=2)
+
+        with pytest.raises(SlackApiError):
+            scheduler.call(client, "chat_postMessage", channel="C1", text="hi")
+        assert client.calls == 3
+
+    def test_other_errors_not_retried(self, sleeps):
+        response = rate_limited_error().response
+        response.status_code = 200
+        response.data = {"ok": False, "error": "channel_not_found"}
+        client = FlakyClient(failures=1, error=SlackApiError("nope", response))
+
+        with pytest.raises(SlackApiError):
+            RateLimitScheduler().call(client, "chat_postMessage", channel="C1")
+        assert client.calls == 1
+
+    def test_bucket_queues_calls_beyond_burst(self):
+        scheduler = RateLimitScheduler()
+
+        # Tier 2: burst of 5, then one call every 3 seconds.
+        waits = [
+            scheduler.reserve("ws:conversations_setTopic", "conversations_setTopic")
+            for _ in range(7)
+        ]
+
+        assert waits[:5] == [0.0] * 5
+        assert waits[5] == pytest.approx(3, abs=0.1)
+        assert waits[6] == pytest.approx(6, abs=0.1)
+
+    def test_per_channel_buckets(self):
+        scheduler = RateLimitScheduler()
+        client = FlakyClient(failures=0)
+
+        keys = {
+            scheduler._bucket_key(client, "chat_postMessage", {"channel": channel})
+            for channel in ("C1", "C2")
+        }
+        assert len(keys) == 2
+
+    def test_state_shared_through_file(self, tmp_path):
+        state_file = str(tmp_path / "ratelimit.json")
+        first = RateLimitScheduler(state_file=state_file)
+        second = RateLimitScheduler(state_file=state_file)
+
+        assert first.reserve("ws:chat_postMessage:C1", "chat_postMessage") == 0
+        assert second.reserve(
+            "ws:chat_postMessage:C1", "chat_postMessage"
+        ) == pytest.approx(1, abs=0.1)
+
+        second.block("ws:usergroups_list", 30)
+        assert first._blocked_for("ws:usergroups_list") == pytest.approx(30, abs=0.5)
+
+
+class TestResilience:
+    """Test retries of transient errors, circuit breakers and the run deadline."""
+
+    def scheduler(self, **kwargs):
+        return RateLimitScheduler(throttle=False, resilience=Resilience(**kwargs))
+
+    def test_server_errors_retried_with_backoff(self, sleeps):
+        client = FlakyClient(failures=2, error=server_error())
+
+        response = self.scheduler().call(
+            client, "usergroups_users_update", usergroup="S1"
+        )
+
+        assert response == {"ok": True}
+        assert client.calls == 3
+        backoffs = [seconds for seconds in sleeps if seconds]
+        assert all(0 <= seconds <= 0.5 * 2**i for i, seconds in enumerate(backoffs))
+
+    def test_network_errors_give_up_after_retries(self, sleeps):
+        client = FlakyClient(failures=10, error=ConnectionResetError("reset"))
+
+        with pytest.raises(SlackUnavailableError, match="after 3 attempts: reset"):
+            self.scheduler(retry=RetryPolicy(retries=2)).call(
+                client, "usergroups_users_update", usergroup="S1"
+            )
+        assert client.calls == 3
+
+    def test_backoff_window_capped(self):
+        policy = RetryPolicy(base_delay=1, max_delay=4)
+
+        assert policy.delay(0, rng=lambda: 1.0) == 1
+        assert policy.delay(10, rng=lambda: 1.0) == 4
+        assert policy.delay(10, rng=lambda: 0.25) == 1
+
+    def test_circuit_opens_and_recovers(self, sleeps):
+        clock = FakeClock()
+        scheduler = self.scheduler(
+            retry=RetryPolicy(retries=0), breaker_threshold=2, clock=clock
+        )
+        failing = FlakyClient(failures=10, error=server_error())
+
+        for _ in range(2):
+            with pytest.raises(SlackApiError):
+                scheduler.call(failing, "chat_postMessage", channel="C1")
+        with pytest.raises(CircuitOpenError):
+            scheduler.call(failing, "chat_postMessage", channel="C1")
+        assert failing.calls == 2
+
+        # Other methods are unaffected, and after the cooldown calls resume.
+        assert scheduler.resilience.breaker("conversations_setTopic").allow()
+        clock.now += 30
+        healthy = FlakyClient(failures=0)
+        assert scheduler.call(healthy, "chat_postMessage", channel="C1")
+        assert scheduler.resilience.breaker("chat_postMessage").state == "closed"
+
+    def test_wait_past_deadline_fails_fast(self, sleeps):
+        clock = FakeClock()
+        scheduler = RateLimitScheduler(
+            resilience=Resilience(run_deadline=2, clock=clock)
+        )
+        client = FlakyClient(failures=1, error=rate_limited_error(retry_after="5"))
+
+        with pytest.raises(DeadlineExceededError):
+            scheduler.call(client, "chat_postMessage", channel="C1")
+        assert client.calls == 1
+
+    def test_call_timeout_cut_to_deadline(self):
+        clock = FakeClock()
+        resilience = Resilience(run_deadline=10, clock=clock)
+
+        assert resilience.call_timeout(30) == 10
+        clock.now += 8
+        assert resilience.call_timeout(30) == 2
+        clock.now += 2
+        with pytest.raises(DeadlineExceededError):
+            resilience.call_timeout(30)
+        resilience.start_run()
+        assert resilience.call_timeout(5) == 5
+
+    def test_async_calls_retried(self, monkeypatch):
+        async def no_sleep(seconds):
+            pass
+
+        monkeypatch.setattr(asyncio, "sleep", no_sleep)
+
+        class AsyncFlakyClient(FlakyClient):
+            async def usergroups_users_update(self, **kwargs):
+                return super().chat_postMessage(**kwargs)
+
+        client = AsyncFlakyClient(failures=1, error=TimeoutError())
+
+        response = asyncio.run(
+            self.scheduler().acall(client, "usergroups_users_update", usergroup="S1")
+        )
+
+        assert response == {"ok": True}
+        assert client.calls == 2
+
+    def test_writes_not_resent_after_they_may_have_reached_slack(self, sleeps):
+        for error in (TimeoutError("timed out"), ConnectionResetError("reset")):
+            client = FlakyClient(failures=1, error=error)
+
+            with pytest.raises(SlackUnavailableError, match="not retried"):
+                self.scheduler().call(client, "chat_postMessage", channel="C1")
+            assert client.calls == 1
+
+        refused = URLError(ConnectionRefusedError("refused"))
+        client = FlakyClient(failures=1, error=refused)
+        assert self.scheduler().call(client, "chat_postMessage", channel="C1")
+        assert client.calls == 2
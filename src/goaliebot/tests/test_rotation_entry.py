@@ -1,3 +1,5 @@
+import json
+
 import pytest
 from click.testing import CliRunner
 from goaliebot.core.models import Command
@@ -131,3 +133,97 @@ def test_cli_invalid_cadence():
     )
     assert result.exit_code != 0
     assert "Invalid value for '--cadence'" in result.output
+
+
+def test_roster_changed_during_rotation_fails_the_run(tmp_path, monkeypatch):
+    from goaliebot.core.roster import Roster
+    from goaliebot.slack_api.client import configure_client
+    from goaliebot.slack_api.directory import configure_directory
+    from goaliebot.testing.slack_stub import (
+        SlackStub,
+        start_stub_server,
+        stub_base_url,
+    )
+
+    roster = tmp_path / "roster.txt"
+    roster.write_text("alice **, U001\nbob, U002\n")
+    save = Roster.save
+
+    def edited_meanwhile(self, file_path):
+        roster.write_text("alice **, U001\nbob, U002\ncarol, U003\n")
+        save(self, file_path)
+
+    monkeypatch.setattr(Roster, "save", edited_meanwhile)
+    server = start_stub_server(SlackStub(channels=1))
+    try:
+        result = CliRunner().invoke(
+            main,
+            [
+                "--file-path",
+                str(roster),
+                "--slack-token",
+                "xoxb-stub",
+                "--commands",
+                "update_user_group",
+                "--user-group-handle",
+                "goalies",
+                "--directory-cache",
+                str(tmp_path / "directory.json"),
+                "--slack-base-url",
+                stub_base_url(server),
+            ],
+        )
+    finally:
+        server.shutdown()
+        server.server_close()
+        configure_client()
+        configure_directory()
+
+    assert result.exit_code == 1
+    assert "Slack was updated, but the goalie file was not" in result.output
+    assert roster.read_text() == "alice **, U001\nbob, U002\ncarol, U003\n"
+
+
+def test_json_log_format_writes_only_json_lines(tmp_path):
+    from goaliebot.slack_api.client import configure_client
+    from goaliebot.slack_api.directory import configure_directory
+    from goaliebot.telemetry.logs import configure_logging
+    from goaliebot.testing.slack_stub import (
+        SlackStub,
+        start_stub_server,
+        stub_base_url,
+    )
+
+    roster = tmp_path / "roster.txt"
+    roster.write_text("alice **, U001\nbob, U002\n")
+    server = start_stub_server(SlackStub(channels=1))
+    try:
+        result = CliRunner().invoke(
+            main,
+            [
+                "--file-path",
+                str(roster),
+                "--slack-token",
+                "xoxb-stub",
+                "--slack-channels",
+                "#channel-0",
+                "--user-group-handle",
+                "goalies",
+                "--directory-cache",
+                str(tmp_path / "directory.json"),
+                "--slack-base-url",
+                stub_base_url(server),
+                "--log-format",
+                "json",
+            ],
+        )
+    finally:
+        server.shutdown()
+        server.server_close()
+        configure_client()
+        configure_directory()
+        configure_logging()
+
+    assert result.exit_code == 0, result.output
+    events = [json.loads(line)["event"] for line in result.output.splitlines()]
+    assert {"next_goalie", "rotation_complete", "roster_updated"} <= set(events)
@@ -0,0 +1,186 @@
+from datetime import date, timedelta
+
+import pytest
+from click.testing import CliRunner
+
+from goaliebot.core.availability import AvailabilityCalendar
+from goaliebot.core.models import MODES, Cadence
+from goaliebot.core.roster import Roster
+from goaliebot.core.schedule import RotationSchedule, period_index, period_start
+from goaliebot.schedule_entry import render_ics, schedule
+
+ROSTER = "alice, U001\nbob **, U002\ncarol, U003\ndan, U004\n"
+FIXED_FULL_ROSTER = (
+    "alice, U001 | bob, U002\n"
+    "bob **, U002 | carol, U003\n"
+    "carol, U003 | alice, U001\n"
+)
+
+
+def roster_text(mode):
+    return FIXED_FULL_ROSTER if mode == "fixed_full" else ROSTER
+
+
+class TestRotationSchedule:
+    @pytest.mark.parametrize("mode", MODES)
+    def test_matches_rotating_step_by_step(self, mode):
+        schedule = RotationSchedule.from_roster(
+            Roster.from_text(roster_text(mode), mode=mode),
+            Cadence.WEEK,
+            date(2026, 1, 5),
+        )
+        roster = Roster.from_text(roster_text(mode), mode=mode)
+
+        for period in range(1, 10):
+            goalie, deputy = roster.rotate()
+            assignment = schedule.assignment(period)
+            assert (assignment.goalie, assignment.deputy) == (goalie, deputy)
+
+    def test_current_period_and_looking_back(self):
+        schedule = RotationSchedule.from_roster(
+            Roster.from_text(ROSTER, mode="next_as_deputy"),
+            "week",
+            date(2026, 1, 5),
+        )
+
+        assert schedule.assignment(0).goalie.handle == "bob"
+        assert schedule.assignment(-1).goalie.handle == "alice"
+        assert schedule.assignment(-2).goalie.handle == "dan"
+        assert schedule.on(date(2026, 2, 4)).goalie.handle == "bob"
+
+    @pytest.mark.parametrize("mode", MODES)
+    def test_availability_matches_rotating_step_by_step(self, mode):
+        anchor = date(2026, 1, 5)
+        availability = AvailabilityCalendar()
+        availability.add("carol", date(2026, 1, 12), date(2026, 1, 14))
+        availability.add("U001", date(2026, 1, 26), date(2026, 2, 8))
+        schedule = RotationSchedule.from_roster(
+            Roster.from_text(roster_text(mode), mode=mode),
+            Cadence.WEEK,
+            anchor,
+            availability,
+        )
+        roster = Roster.from_text(roster_text(mode), mode=mode)
+
+        expected = []
+        for period in range(1, 10):
+            start = period_start(anchor, Cadence.WEEK, period)
+            end = period_start(anchor, Cadence.WEEK, period + 1)
+            expected.append(roster.rotate(availability.available_during(start, end)))
+
+        assignments = schedule.periods(11, -1)
+        assert [(a.goalie, a.deputy) for a in assignments[2:]] == expected
+        assert assignments[1] == schedule.assignment(0)
+        assert assignments[1].goalie.handle == "bob"
+        assert schedule.assignment(3) == assignments[4]
+        assert schedule.assignment(1).goalie.handle != "carol"
+
+    def test_unmarked_roster_rejected(self):
+        with pytest.raises(ValueError, match="Current goalie index not found"):
+            RotationSchedule.from_roster(
+                Roster.from_text("alice, U001\n"), "week", date(2026, 1, 5)
+            )
+
+    @pytest.mark.parametrize("cadence", list(Cadence))
+    def test_period_index_inverts_period_start(self, cadence):
+        anchor = date(2024, 1, 31)
+        for offset in range(-60, 400):
+            when = anchor + timedelta(days=offset)
+            period = period_index(anchor, cadence, when)
+            start = period_start(anchor, cadence, period)
+            assert start <= when < period_start(anchor, cadence, period + 1)
+
+    def test_months_clamp_to_short_months(self):
+        anchor = date(2024, 1, 31)
+        starts = [period_start(anchor, "month", k) for k in range(4)]
+        assert starts == [
+            date(2024, 1, 31),
+            date(2024, 2, 29),
+            date(2024, 3, 31),
+            date(2024, 4, 30),
+        ]
+
+
+class TestScheduleCommand:
+    def test_manifest_exports_every_roster(self, tmp_path):
+        (tmp_path / "a.txt").write_text(ROSTER)
+        (tmp_path / "b.txt").write_text(FIXED_FULL_ROSTER)
+        manifest = tmp_path / "rotations.toml"
+        manifest.write_text(
+            '[[rotations]]\nname = "a"\nfile = "a.txt"\nanchor = 2026-01-05\n\n'
+            '[[rotations]]\nname = "b"\nfile = "b.txt"\nmode = "fixed_full"\n'
+            'cadence = "day"\n'
+        )
+
+        result = CliRunner().invoke(
+            schedule,
+            [
+                "--manifest",
+                str(manifest),
+                "--anchor",
+                "2026-03-01",
+                "--periods",
+                "2",
+                "--ics",
+                str(tmp_path / "out.ics"),
+                "--csv",
+                "-",
+            ],
+        )
+
+        assert result.exit_code == 0, result.output
+        assert result.output.splitlines()[1:] == [
+            "a,0,2026-01-05,2026-01-12,bob,U002,carol,U003",
+            "a,1,2026-01-12,2026-01-19,carol,U003,dan,U004",
+            "b,0,2026-03-01,2026-03-02,bob,U002,carol,U003",
+            "b,1,2026-03-02,2026-03-03,carol,U003,alice,U001",
+        ]
+        ics = (tmp_path / "out.ics").read_bytes()
+        assert ics.count(b"BEGIN:VEVENT\r\n") == 4
+        assert b"SUMMARY:[b] Goalie: carol (deputy: alice)\r\n" in ics
+
+    def test_availability_skips_people_away(self, tmp_path):
+        roster = tmp_path / "roster.txt"
+        roster.write_text(ROSTER)
+        away = tmp_path / "away.txt"
+        away.write_text("carol, 2026-01-14\n")
+
+        result = CliRunner().invoke(
+            schedule,
+            [
+                "--file-path",
+                str(roster),
+                "--anchor",
+                "2026-01-05",
+                "--periods",
+                "3",
+                "--availability",
+                str(away),
+            ],
+        )
+
+        assert result.exit_code == 0, result.output
+        assert result.output.splitlines()[1:] == [
+            ",0,2026-01-05,2026-01-12,bob,U002,carol,U003",
+            ",1,2026-01-12,2026-01-19,dan,U004,alice,U001",
+            ",2,2026-01-19,2026-01-26,alice,U001,bob,U002",
+        ]
+
+    def test_unmarked_roster_reported(self, tmp_path):
+        roster = tmp_path / "roster.txt"
+        roster.write_text("alice, U001\n")
+
+        result = CliRunner().invoke(schedule, ["--file-path", str(roster)])
+
+        assert result.exit_code == 1
+        assert "No current goalie marked" in result.output
+
+    def test_long_ics_lines_are_folded(self):
+        schedule_ = RotationSchedule.from_roster(
+            Roster.from_text("x" * 100 + " **, U001\n"), "week", date(2026, 1, 5)
+        )
+
+        ics = render_ics([("team", a) for a in schedule_.periods(1)])
+
+        assert all(len(line.encode()) <= 75 for line in ics.split("\r\n"))
+        assert "\r\n " in ics
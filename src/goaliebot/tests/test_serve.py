@@ -0,0 +1,214 @@
+import os
+from datetime import date, datetime, time, timezone
+
+import pytest
+
+import goaliebot.core.file_ops as file_ops
+import goaliebot.serve_entry as serve_entry
+from goaliebot.batch_entry import RotationResult
+from goaliebot.core.file_ops import RosterCache, StreamingRoster
+from goaliebot.core.manifest import load_manifest
+from goaliebot.core.models import Cadence
+from goaliebot.core.triggers import load_zone, next_trigger
+from goaliebot.serve_entry import RotationDaemon
+
+ROSTER = "alice, U001\nbob **, U002\ncarol, U003\n"
+
+MANIFEST = """
+[[rotations]]
+name = "tokyo"
+file = "tokyo.txt"
+cadence = "day"
+timezone = "Asia/Tokyo"
+at = "09:30"
+
+[[rotations]]
+name = "berlin"
+file = "berlin.txt"
+cadence = "week"
+timezone = "Europe/Berlin"
+"""
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+class TestNextTrigger:
+    def test_daily_in_team_timezone(self):
+        fire = next_trigger(
+            Cadence.DAY,
+            utc(2026, 3, 2, 1, 0),
+            at=time(9, 30),
+            zone=load_zone("Asia/Tokyo"),
+        )
+        assert fire == utc(2026, 3, 3, 0, 30)  # 09:30 JST, the next morning
+
+    def test_strictly_after(self):
+        zone = load_zone("UTC")
+        fire = next_trigger(Cadence.DAY, utc(2026, 3, 2, 9, 0), zone=zone)
+        assert fire == utc(2026, 3, 3, 9, 0)
+
+    def test_weekly_follows_anchor_weekday(self):
+        fire = next_trigger(
+            Cadence.WEEK,
+            utc(2026, 3, 4, 12, 0),  # a Wednesday
+            zone=load_zone("Europe/Berlin"),
+            anchor=date(2026, 1, 5),  # a Monday
+        )
+        assert fire == utc(2026, 3, 9, 8, 0)  # 09:00 CET
+
+    def test_unknown_timezone(self):
+        with pytest.raises(ValueError, match="unknown timezone"):
+            load_zone("Mars/Olympus")
+
+
+class TestManifestTriggers:
+    def test_timezone_and_time_of_day(self, tmp_path):
+        path = tmp_path / "rotations.toml"
+        path.write_text(MANIFEST)
+
+        tokyo, berlin = load_manifest(str(path))
+
+        assert (tokyo.timezone, tokyo.at) == ("Asia/Tokyo", time(9, 30))
+        assert (berlin.timezone, berlin.at) == ("Europe/Berlin", None)
+
+    @pytest.mark.parametrize(
+        "line, message",
+        [
+            ('timezone = "Nowhere/City"', "unknown timezone"),
+            ('at = "9am"', "invalid time of day"),
+        ],
+    )
+    def test_invalid_values(self, tmp_path, line, message):
+        path = tmp_path / "rotations.toml"
+        path.write_text(f'[[rotations]]\nfile = "a.txt"\n{line}\n')
+
+        with pytest.raises(ValueError, match=message):
+            load_manifest(str(path))
+
+
+class TestRosterCache:
+    def test_parsed_once_until_file_changes(self, tmp_path):
+        path = tmp_path / "roster.txt"
+        path.write_text(ROSTER)
+        cache = RosterCache()
+
+        first = cache.load(str(path))
+        assert cache.load(str(path)) is first
+        assert cache.parses == 1
+
+        path.write_text(ROSTER.replace("carol", "dave"))
+        reloaded = cache.load(str(path))
+        assert reloaded is not first
+        assert [user.handle for user in reloaded.users][-1] == "dave"
+        assert cache.parses == 2
+
+    def test_touched_but_unchanged_file_not_reparsed(self, tmp_path):
+        path = tmp_path / "roster.txt"
+        path.write_text(ROSTER)
+        cache = RosterCache()
+        first = cache.load(str(path))
+
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        assert cache.load(str(path)) is first
+        assert cache.parses == 1
+
+    def test_own_writes_remembered(self, tmp_path):
+        path = tmp_path / "roster.txt"
+        path.write_text(ROSTER)
+        cache = RosterCache()
+        roster = cache.load(str(path))
+
+        roster.rotate()
+        roster.save(str(path))
+        cache.remember(str(path), roster)
+
+        assert cache.load(str(path)) is roster
+        assert roster.current_goalie.handle == "carol"
+        assert cache.parses == 1
+
+    def test_large_roster_streamed_without_reading_it(self, tmp_path, monkeypatch):
+        path = tmp_path / "roster.txt"
+        path.write_text(ROSTER)
+        monkeypatch.setattr(file_ops, "STREAMING_THRESHOLD_BYTES", len(ROSTER))
+        reads = []
+        monkeypatch.setattr(file_ops, "digest_file", reads.append)
+
+        roster = RosterCache().load(str(path))
+
+        assert isinstance(roster, StreamingRoster)
+        assert reads == []
+        assert roster.current_goalie.handle == "bob"
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def manifest_path(tmp_path):
+    for name in ("tokyo", "berlin"):
+        (tmp_path / f"{name}.txt").write_text(ROSTER)
+    path = tmp_path / "rotations.toml"
+    path.write_text(MANIFEST)
+    return str(path)
+
+
+class TestRotationDaemon:
+    def test_fires_due_rotations_once(self, manifest_path, monkeypatch):
+        fired = []
+
+        def fake_run_spec(spec, slack_token, client, **kwargs):
+            fired.append((spec.name, kwargs["roster_cache"]))
+            return RotationResult(name=spec.name, ok=True)
+
+        monkeypatch.setattr(serve_entry, "run_spec", fake_run_spec)
+        monkeypatch.setattr(serve_entry, "write_run_metrics", lambda *args: None)
+        monkeypatch.setattr(
+            "goaliebot.slack_api.client.get_client", lambda token: object()
+        )
+        clock = FakeClock(utc(2026, 3, 2, 0, 0).timestamp())
+        daemon = RotationDaemon(manifest_path, "xoxp-test", clock=clock)
+
+        (tokyo_at, tokyo), (berlin_at, berlin) = daemon.upcoming()
+        assert tokyo.name == "tokyo"
+        assert tokyo_at == utc(2026, 3, 2, 0, 30).timestamp()
+        assert berlin_at == utc(2026, 3, 2, 8, 0).timestamp()
+        assert daemon.seconds_until_next() == 30 * 60
+        assert daemon.run_due() == []
+
+        # Asleep for a week: each rotation fires once, not once per missed period.
+        clock.now = utc(2026, 3, 9, 10, 0).timestamp()
+        results = daemon.run_due()
+
+        assert sorted(result.name for result in results) == ["berlin", "tokyo"]
+        assert all(cache is daemon.roster_cache for _, cache in fired)
+        assert daemon.upcoming()[0][0] == utc(2026, 3, 10, 0, 30).timestamp()
+
+    def test_rotation_due_before_start_up_not_fired(self, manifest_path):
+        # Started 15 minutes after Tokyo's 09:30 rotation.
+        clock = FakeClock(utc(2026, 3, 2, 0, 45).timestamp())
+        daemon = RotationDaemon(manifest_path, "xoxp-test", clock=clock)
+
+        assert daemon.run_due() == []
+        assert daemon.upcoming()[1] == (
+            utc(2026, 3, 3, 0, 30).timestamp(),
+            daemon.specs[0],
+        )
+
+    def test_invalid_reload_keeps_rotations(self, manifest_path, capsys):
+        daemon = RotationDaemon(manifest_path, "xoxp-test")
+
+        with open(manifest_path, "w") as f:
+            f.write("[defaults]\n")
+        daemon.reload()
+
+        assert [spec.name for spec in daemon.specs] == ["tokyo", "berlin"]
+        assert "keeping the old one" in capsys.readouterr().out
@@ -0,0 +1,260 @@
+import asyncio
+
+from slack_sdk.errors import SlackApiError
+
+from goaliebot.core.models import Cadence, Command, SlackUser
+from goaliebot.operations.slack_helpers import (
+    perform_slack_rotation_updates,
+    perform_slack_rotation_updates_async,
+    RotationWrites,
+    plan_slack_rotation_updates,
+    record_rotation_writes,
+)
+from goaliebot.operations.summary import print_success_summary
+from goaliebot.slack_api.directory import SlackDirectory
+from goaliebot.slack_api.state import SlackStateReader
+import goaliebot.slack_api.channel as channel_module
+
+
+class FakeAsyncClient:
+    """Async stand-in for AsyncWebClient that tracks in-flight requests."""
+
+    def __init__(self, latency=0.01):
+        self.token = "xoxp-test"
+        self.latency = latency
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = []
+
+    async def _call(self, method, **kwargs):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        self.calls.append((method, kwargs))
+        await asyncio.sleep(self.latency)
+        self.in_flight -= 1
+        return {"ok": True}
+
+    async def conversations_list(self, **kwargs):
+        return {"channels": [], "response_metadata": {"next_cursor": ""}}
+
+    async def conversations_setTopic(self, **kwargs):
+        return await self._call("conversations_setTopic", **kwargs)
+
+    async def chat_postMessage(self, **kwargs):
+        return await self._call("chat_postMessage", **kwargs)
+
+    async def usergroups_users_update(self, **kwargs):
+        return await self._call("usergroups_users_update", **kwargs)
+
+
+class TestPerformSlackRotationUpdatesAsync:
+    """Test the concurrent execution path."""
+
+    def run(self, client, channels, commands, concurrency, monkeypatch):
+        monkeypatch.setattr(channel_module, "get_directory", lambda: SlackDirectory())
+        asyncio.run(
+            perform_slack_rotation_updates_async(
+                client,
+                channels,
+                "S12345678",
+                SlackUser("alice", "U123"),
+                SlackUser("bob", "U456"),
+                "hello",
+                commands,
+                concurrency,
+            )
+        )
+
+    def test_all_commands_run(self, monkeypatch):
+        client = FakeAsyncClient()
+        channels = ["C00000001", "C00000002"]
+
+        self.run(client, channels, list(Command), 4, monkeypatch)
+
+        methods = [method for method, _ in client.calls]
+        assert methods.count("usergroups_users_update") == 1
+        assert methods.count("conversations_setTopic") == 2
+        assert methods.count("chat_postMessage") == 2
+
+    def test_fan_out_respects_concurrency_bound(self, monkeypatch):
+        client = FakeAsyncClient()
+        channels = [f"C{i:08d}" for i in range(10)]
+
+        self.run(client, channels, [Command.SEND_SLACK_MESSAGE], 3, monkeypatch)
+
+        assert len(client.calls) == 10
+        assert client.max_in_flight == 3
+
+    def test_commands_overlap(self, monkeypatch):
+        client = FakeAsyncClient()
+
+        self.run(client, ["C00000001"], list(Command), 3, monkeypatch)
+
+        # User group, topic and message calls are independent and overlap.
+        assert client.max_in_flight == 3
+
+    def test_commands_share_concurrency_bound(self, monkeypatch):
+        client = FakeAsyncClient()
+        channels = [f"C{i:08d}" for i in range(5)]
+
+        self.run(client, channels, list(Command), 2, monkeypatch)
+
+        assert len(client.calls) == 11
+        assert client.max_in_flight == 2
+
+    def test_unknown_channel_skipped(self, monkeypatch):
+        client = FakeAsyncClient()
+
+        self.run(
+            client, ["missing"], [Command.UPDATE_TOPIC_DESCRIPTION], 2, monkeypatch
+        )
+
+        assert client.calls == []
+
+
+class FakeSlack:
+    """Sync stand-in for WebClient that keeps the state it is given."""
+
+    def __init__(self):
+        self.token = "xoxp-test"
+        self.members = {"S12345678": ["U999"]}
+        self.topics = {"C00000001": "old topic", "C00000002": "old topic"}
+        self.history = {"C00000001": [], "C00000002": []}
+        self.writes = []
+        self.failing = set()
+
+    def usergroups_list(self, include_users=None):
+        return {
+            "usergroups": [
+                {"id": group_id, "handle": "goalies", "users": list(users)}
+                for group_id, users in self.members.items()
+            ]
+        }
+
+    def conversations_info(self, channel):
+        return {"channel": {"topic": {"value": self.topics[channel]}}}
+
+    def conversations_history(self, channel, **kwargs):
+        return {"messages": [{"text": text} for text in self.history[channel]]}
+
+    def usergroups_users_update(self, usergroup, users):
+        self.writes.append("usergroups_users_update")
+        self.members[usergroup] = users.split(",")
+        return {"ok": True}
+
+    def conversations_setTopic(self, channel, topic):
+        self.writes.append("conversations_setTopic")
+        if channel in self.failing:
+            raise SlackApiError("error", {"ok": False, "error": "not_in_channel"})
+        self.topics[channel] = topic
+        return {"ok": True}
+
+    def chat_postMessage(self, channel, text, **kwargs):
+        self.writes.append("chat_postMessage")
+        self.history[channel].append(text)
+        return {"ok": True}
+
+
+class TestReconciliation:
+    """Test that reconciled runs only send writes that change something."""
+
+    def apply(self, client, monkeypatch, state=None):
+        monkeypatch.setattr(
+            "goaliebot.operations.slack_helpers.get_directory", SlackDirectory
+        )
+        monkeypatch.setattr(channel_module, "get_directory", SlackDirectory)
+        channels = ["C00000001", "C00000002"]
+        args = (
+            channels,
+            "S12345678",
+            SlackUser("alice", "U123"),
+            SlackUser("bob", "U456"),
+            "hello",
+            list(Command),
+        )
+        state = state or SlackStateReader()
+        plan = plan_slack_rotation_updates(client, state, *args, Cadence.WEEK)
+        writes = perform_slack_rotation_updates(client, *args, plan=plan)
+        record_rotation_writes(state, plan, writes, "S12345678", "hello")
+        return plan
+
+    def test_first_run_writes_everything(self, monkeypatch):
+        client = FakeSlack()
+
+        plan = self.apply(client, monkeypatch)
+
+        assert plan.skipped == []
+        assert len(client.writes) == 5
+
+    def test_repeated_run_makes_no_writes(self, monkeypatch):
+        client = FakeSlack()
+        self.apply(client, monkeypatch)
+        client.writes.clear()
+
+        plan = self.apply(client, monkeypatch)
+
+        assert client.writes == []
+        assert plan.skipped == [
+            "user group S12345678",
+            "topic of C00000001",
+            "topic of C00000002",
+            "message to C00000001",
+            "message to C00000002",
+        ]
+
+    def test_only_changed_channel_written(self, monkeypatch):
+        client = FakeSlack()
+        self.apply(client, monkeypatch)
+        client.writes.clear()
+        client.topics["C00000002"] = "someone edited this"
+
+        self.apply(client, monkeypatch)
+
+        assert client.writes == ["conversations_setTopic"]
+
+    def test_failed_write_not_recorded(self, monkeypatch):
+        client = FakeSlack()
+        client.failing.add("C00000002")
+        state = SlackStateReader()
+        self.apply(client, monkeypatch, state)
+        client.writes.clear()
+        client.failing.clear()
+
+        plan = self.apply(client, monkeypatch, state)
+
+        # Only the topic Slack refused is written again.
+        assert client.writes == ["conversations_setTopic"]
+        assert plan.topic_channels == ["C00000002"]
+
+    def test_state_shared_across_rotations(self):
+        client = FakeSlack()
+        state = SlackStateReader()
+
+        state.usergroup_members(client, "S12345678")
+        state.record_members("S12345678", {"U123"})
+        client.members["S12345678"] = ["U777"]
+
+        # The second read comes from the cache, including the recorded write.
+        assert state.usergroup_members(client, "S12345678") == {"U123"}
+
+
+def test_summary_lists_only_performed_writes(capsys):
+    writes = RotationWrites(user_group=False, topic_channels=["C00000002"])
+
+    print_success_summary(
+        SlackUser("alice", "U123"),
+        None,
+        ["C00000001", "C00000002"],
+        "S12345678",
+        "week",
+        writes,
+        skipped=["user group S12345678", "topic of C00000001"],
+    )
+
+    out = capsys.readouterr().out
+    assert "🎯 Slack updates: topic updated in C00000002." in out
+    assert (
+        "⏭️ Already up to date, skipped: user group S12345678, topic of C00000001."
+        in out
+    )
+    assert "user group updated" not in out
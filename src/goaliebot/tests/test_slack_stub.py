@@ -0,0 +1,214 @@
+import asyncio
+import time
+from http.client import RemoteDisconnected
+from urllib.error import URLError
+from urllib.request import Request
+
+import pytest
+from slack_sdk.errors import SlackApiError
+
+from goaliebot.core.models import Cadence, Command, SlackUser
+from goaliebot.operations.command_runner import run_slack_commands
+from goaliebot.slack_api.client import (
+    configure_client,
+    create_async_web_client,
+    get_client,
+    pooled_session,
+)
+from goaliebot.slack_api.directory import SlackDirectory, configure_directory
+import goaliebot.slack_api.pool as pool
+from goaliebot.slack_api.pool import ConnectionPool, transport_hook_supported
+from goaliebot.slack_api.ratelimit import slack_call
+from goaliebot.testing.slack_stub import SlackStub, start_stub_server, stub_base_url
+
+
+@pytest.fixture
+def serve(monkeypatch):
+    """Start a stub server for a SlackStub and point new clients at it."""
+    servers = []
+
+    def start(stub):
+        server = start_stub_server(stub)
+        servers.append(server)
+        configure_client(base_url=stub_base_url(server))
+        configure_directory()
+        return get_client("xoxb-stub")
+
+    yield start
+    configure_client()
+    configure_directory()
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_channel_listing_is_paginated(serve):
+    stub = SlackStub(channels=7, page_size=3)
+    client = serve(stub)
+
+    assert SlackDirectory().channel_id(client, "#channel-6") == "C00000006"
+    assert stub.calls["conversations.list"] == 3
+
+
+def test_rotation_applied_through_real_client(serve):
+    stub = SlackStub(channels=3)
+    client = serve(stub)
+    goalie, deputy = SlackUser("alice", "U001"), SlackUser("bob", "U002")
+
+    run_slack_commands(
+        "xoxb-stub",
+        ["#channel-0", "#channel-2"],
+        goalie,
+        deputy,
+        "S00000000",
+        list(Command),
+        Cadence.WEEK,
+        client=client,
+    )
+
+    assert stub.user_groups[0]["users"] == ["U001", "U002"]
+    assert "alice" not in stub.channels[1]["topic"]["value"]
+    assert "<@U001>" in stub.channels[0]["topic"]["value"]
+    assert len(stub.messages["C00000002"]) == 1
+
+
+def test_rate_limits_are_retried(serve):
+    stub = SlackStub(rate_limit_rate=0.5, retry_after=0, seed=7)
+    client = serve(stub)
+
+    for _ in range(10):
+        response = slack_call(
+            client, "conversations_setTopic", channel="C00000001", topic="hi"
+        )
+        assert response["ok"]
+    assert stub.stats()["rate_limited"]["conversations.setTopic"] > 0
+    assert client.pool.connections_opened == 1
+
+
+def test_injected_errors_surface_as_slack_errors(serve):
+    client = serve(SlackStub(error_rate=1.0))
+
+    with pytest.raises(SlackApiError) as error:
+        slack_call(client, "usergroups_list")
+    assert error.value.response.status_code == 503
+    assert error.value.response["error"] == "service_unavailable"
+
+
+def test_lookups_and_writes_share_one_connection(serve):
+    stub = SlackStub(channels=5, page_size=2)
+    client = serve(stub)
+    goalie, deputy = SlackUser("alice", "U001"), SlackUser("bob", "U002")
+
+    run_slack_commands(
+        "xoxb-stub",
+        ["#channel-0", "#channel-4"],
+        goalie,
+        deputy,
+        "S00000000",
+        list(Command),
+        Cadence.WEEK,
+    )
+
+    assert get_client("xoxb-stub") is client
+    assert sum(stub.calls.values()) > 5
+    assert client.pool.connections_opened == 1
+
+
+def test_changed_transport_hook_falls_back_to_stock_transport(serve, monkeypatch):
+    class OldWebClient:
+        pass
+
+    class ChangedWebClient:
+        def _perform_urllib_http_request_internal(self, url, req, timeout):
+            pass
+
+    assert not transport_hook_supported(OldWebClient)
+    assert not transport_hook_supported(ChangedWebClient)
+    assert transport_hook_supported()
+
+    monkeypatch.setattr(pool, "POOLED_TRANSPORT", False)
+    client = serve(SlackStub())
+    assert slack_call(client, "usergroups_list")["ok"]
+    assert client.pool.connections_opened == 0
+
+
+class FakeResponse:
+    status, reason, headers, will_close = 200, "OK", {}, False
+
+    def read(self):
+        return b"{}"
+
+
+class FakeConnection:
+    """A keep-alive connection the server closes while sending or reading."""
+
+    sock = None
+
+    def __init__(self, fails=None):
+        self.fails = fails
+
+    def request(self, method, selector, body=None, headers=None):
+        if self.fails == "send":
+            raise BrokenPipeError("closed")
+
+    def getresponse(self):
+        if self.fails == "read":
+            raise RemoteDisconnected("closed")
+        return FakeResponse()
+
+    def close(self):
+        pass
+
+
+class FakePool(ConnectionPool):
+    def __init__(self, stale=None):
+        super().__init__()
+        self._idle[("https", "slack.com")] = [(FakeConnection(stale), time.monotonic())]
+
+    def _connect(self, scheme, host):
+        self.connections_opened += 1
+        return FakeConnection()
+
+
+def slack_request(method):
+    return Request(f"https://slack.com/api/{method}", data=b"{}", method="POST")
+
+
+def test_stale_connection_resent_only_when_safe():
+    # Closed before the request went out: always sent again.
+    stale_pool = FakePool(stale="send")
+    assert stale_pool.request(slack_request("chat.postMessage"))[0] == 200
+    assert stale_pool.connections_opened == 1
+
+    # Closed after it went out: only idempotent methods are sent again.
+    stale_pool = FakePool(stale="read")
+    assert stale_pool.request(slack_request("users.list"))[0] == 200
+    stale_pool = FakePool(stale="read")
+    with pytest.raises(RemoteDisconnected):
+        stale_pool.request(slack_request("chat.postMessage"))
+    assert stale_pool.connections_opened == 0
+
+    # Sending over a new connection failed: the request never arrived.
+    class RefusingPool(FakePool):
+        def _connect(self, scheme, host):
+            return FakeConnection(fails="send")
+
+    with pytest.raises(URLError):
+        RefusingPool(stale="send").request(slack_request("chat.postMessage"))
+
+
+def test_async_fan_out_uses_one_session(serve):
+    serve(SlackStub(channels=3))
+    client = create_async_web_client("xoxb-stub")
+    sessions = set()
+
+    async def fan_out():
+        async with pooled_session(client):
+            for _ in range(3):
+                await client.conversations_info(channel="C00000001")
+                sessions.add(id(client.session))
+
+    asyncio.run(fan_out())
+
+    assert len(sessions) == 1
+    assert client.session is None
@@ -0,0 +1,172 @@
+import json
+
+import pytest
+
+from goaliebot.core.file_ops import StreamingRoster
+from goaliebot.core.manifest import load_manifest
+from goaliebot.core.models import Cadence, SlackUser
+from goaliebot.core.roster import Roster
+from goaliebot.core.templates import (
+    compile_template,
+    default_template,
+    load_template,
+    notification_context,
+)
+from goaliebot.operations.slack_helpers import compose_goalie_notification
+from goaliebot.slack_api.messaging import send_goalie_notification
+
+ALICE = SlackUser("alice", "U001")
+BOB = SlackUser("bob", "U002")
+CAROL = SlackUser("carol", "U003")
+
+
+def context(deputy=BOB, next_goalie=CAROL, cadence=Cadence.WEEK):
+    return notification_context(ALICE, deputy, "S123", cadence, next_goalie)
+
+
+class FakeClient:
+    def __init__(self):
+        self.posts = []
+
+    def chat_postMessage(self, **kwargs):
+        self.posts.append(kwargs)
+        return {"ok": True}
+
+
+class TestDefaultTemplate:
+    def test_matches_the_built_in_messages(self):
+        assert compose_goalie_notification(ALICE, BOB, "S123", Cadence.WEEK) == (
+            "🎉 <@U001> is the goalie this week! "
+            "👮‍♂️ Your trusty deputy is <@U002> 🙌. "
+            "Give the team a nudge with <!subteam^S123>! 🎉"
+        )
+        assert compose_goalie_notification(ALICE, None, "S123", "day") == (
+            "🎉 <@U001> is the goalie today! No deputy assigned. "
+            "Use <!subteam^S123> to reach out. 🎯"
+        )
+
+    def test_plain_text_has_no_blocks(self):
+        assert default_template().render(context()).blocks is None
+
+
+class TestTextTemplates:
+    def test_variables_and_sections(self):
+        template = compile_template(
+            "{goalie_handle} on call {cadence_text}"
+            "{#deputy}, backed by {deputy_handle}{/deputy}"
+            "{^deputy}, alone{/deputy}. Next: {next_goalie_handle} {{ok}}"
+        )
+
+        assert template.render(context()).text == (
+            "alice on call this week, backed by bob. Next: carol {ok}"
+        )
+        assert template.render(context(deputy=None)).text == (
+            "alice on call this week, alone. Next: carol {ok}"
+        )
+
+    def test_section_without_next_goalie(self):
+        template = compile_template(
+            "{goalie}{#next_goalie}, then {next_goalie}{/next_goalie}"
+        )
+
+        assert template.render(context(next_goalie=None)).text == "<@U001>"
+
+    @pytest.mark.parametrize(
+        "source, message",
+        [
+            ("{goalee}", "Unknown template variable 'goalee'"),
+            ("{#deputy}x", "Unclosed {#deputy}"),
+            ("x{/deputy}", "Unexpected {/deputy}"),
+        ],
+    )
+    def test_invalid_templates(self, source, message):
+        with pytest.raises(ValueError, match=message):
+            compile_template(source)
+
+    def test_compiled_once_per_content(self):
+        source = '[{"type": "divider"}]'
+        first = compile_template(source)
+
+        assert compile_template(source) is first
+        assert compile_template(source, block_kit=True) is not first
+
+
+class TestBlockKitTemplates:
+    BLOCKS = {
+        "text": "{goalie} is the goalie {cadence_text}",
+        "blocks": [
+            {
+                "type": "section",
+                "text": {"type": "mrkdwn", "text": "*Goalie:* {goalie}"},
+            },
+            {
+                "type": "context",
+                "elements": [
+                    {"type": "mrkdwn", "text": "Up next: {next_goalie_handle}"}
+                ],
+            },
+        ],
+    }
+
+    def test_rendered_into_blocks(self, tmp_path):
+        path = tmp_path / "goalie.json"
+        path.write_text(json.dumps(self.BLOCKS))
+
+        notification = load_template(str(path)).render(context())
+
+        assert notification.text == "<@U001> is the goalie this week"
+        assert notification.blocks[0]["text"]["text"] == "*Goalie:* <@U001>"
+        assert notification.blocks[1]["elements"][0]["text"] == "Up next: carol"
+        # Rendering builds new blocks each time rather than editing the template.
+        assert self.BLOCKS["blocks"][0]["text"]["text"] == "*Goalie:* {goalie}"
+
+    def test_bare_block_list_uses_default_text(self):
+        template = compile_template(json.dumps(self.BLOCKS["blocks"]), block_kit=True)
+
+        notification = template.render(context())
+
+        assert notification.text.startswith("🎉 <@U001> is the goalie this week!")
+
+    def test_invalid_json(self):
+        with pytest.raises(ValueError, match="Invalid Block Kit JSON"):
+            compile_template("{goalie}", block_kit=True)
+
+    def test_blocks_posted_with_fallback_text(self):
+        client = FakeClient()
+        notification = compile_template(json.dumps(self.BLOCKS), block_kit=True).render(
+            context()
+        )
+
+        send_goalie_notification(
+            client, ["C001"], notification.text, notification.blocks
+        )
+
+        assert client.posts[0]["text"] == notification.text
+        assert client.posts[0]["blocks"] == notification.blocks
+
+
+class TestUpcomingGoalie:
+    ROSTER = "alice, U001\nbob **, U002\ncarol, U003\n"
+
+    def test_goalie_after_next(self):
+        roster = Roster.from_text(self.ROSTER)
+
+        assert roster.upcoming_goalie() == ALICE
+        assert roster.upcoming_goalie(lambda user: user != CAROL) == BOB
+
+    def test_streamed_roster(self, tmp_path):
+        path = tmp_path / "roster.txt"
+        path.write_text(self.ROSTER)
+
+        assert StreamingRoster(str(path)).upcoming_goalie() == ALICE
+
+
+def test_manifest_template_resolved_against_manifest(tmp_path):
+    manifest = tmp_path / "rotations.toml"
+    manifest.write_text(
+        '[[rotations]]\nfile = "team.txt"\ntemplate = "templates/team.json"\n'
+    )
+
+    (spec,) = load_manifest(str(manifest))
+
+    assert spec.template == str(tmp_path / "templates" / "team.json")
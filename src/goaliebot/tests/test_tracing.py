@@ -0,0 +1,155 @@
+import asyncio
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from goaliebot.cli import cli
+from goaliebot.slack_api.client import configure_client
+from goaliebot.slack_api.directory import configure_directory
+from goaliebot.slack_api.ratelimit import get_scheduler
+from goaliebot.telemetry.tracing import (
+    NOOP_SPAN,
+    SPAN_KIND_CLIENT,
+    STATUS_ERROR,
+    Tracer,
+    configure_tracing,
+)
+from goaliebot.testing.slack_stub import SlackStub, start_stub_server, stub_base_url
+
+
+class FakeClient:
+    token = "xoxp-test"
+
+    def chat_postMessage(self, **kwargs):
+        return {"ok": True}
+
+
+@pytest.fixture
+def tracer(tmp_path):
+    yield configure_tracing(str(tmp_path / "trace.jsonl"))
+    configure_tracing()
+
+
+def exported_spans(path):
+    spans = []
+    for line in open(path):
+        for resource in json.loads(line)["resourceSpans"]:
+            for scope in resource["scopeSpans"]:
+                spans.extend(scope["spans"])
+    return {span["name"]: span for span in spans}
+
+
+def attributes(span):
+    return {item["key"]: item["value"] for item in span["attributes"]}
+
+
+class TestTracer:
+    def test_spans_nest_under_the_run(self, tracer):
+        tracer.start_run("goaliebot", command="test")
+        with tracer.span("parse_roster", lines=3):
+            with tracer.span("inner"):
+                pass
+        tracer.export()
+
+        spans = exported_spans(tracer.path)
+        root, parse, inner = spans["goaliebot"], spans["parse_roster"], spans["inner"]
+        assert "parentSpanId" not in root
+        assert parse["parentSpanId"] == root["spanId"]
+        assert inner["parentSpanId"] == parse["spanId"]
+        assert {span["traceId"] for span in spans.values()} == {root["traceId"]}
+        assert attributes(parse)["lines"] == {"intValue": "3"}
+        assert int(root["endTimeUnixNano"]) >= int(parse["endTimeUnixNano"])
+
+    def test_error_sets_status(self, tracer):
+        with pytest.raises(ValueError):
+            with tracer.span("broken"):
+                raise ValueError("bad roster")
+        tracer.export()
+
+        status = exported_spans(tracer.path)["broken"]["status"]
+        assert status == {"code": STATUS_ERROR, "message": "bad roster"}
+
+    def test_async_tasks_nest_under_their_parent(self, tracer):
+        async def call(name):
+            with tracer.span(name):
+                await asyncio.sleep(0)
+
+        async def run():
+            with tracer.span("commands"):
+                await asyncio.gather(call("a"), call("b"))
+
+        asyncio.run(run())
+        tracer.export()
+
+        spans = exported_spans(tracer.path)
+        assert spans["a"]["parentSpanId"] == spans["commands"]["spanId"]
+        assert spans["b"]["parentSpanId"] == spans["commands"]["spanId"]
+
+    def test_disabled_without_a_path(self, tmp_path):
+        tracer = Tracer()
+
+        with tracer.span("anything") as span:
+            pass
+        tracer.export()
+
+        assert span is NOOP_SPAN
+        assert not list(tmp_path.iterdir())
+
+
+def test_slack_calls_are_client_spans(tracer):
+    get_scheduler().call(FakeClient(), "chat_postMessage", channel="C1")
+    tracer.export()
+
+    span = exported_spans(tracer.path)["slack.chat_postMessage"]
+    assert span["kind"] == SPAN_KIND_CLIENT
+    assert attributes(span) == {
+        "slack.method": {"stringValue": "chat_postMessage"},
+        "slack.channel": {"stringValue": "C1"},
+        "slack.attempts": {"intValue": "1"},
+    }
+
+
+def test_rotation_writes_trace_file(tmp_path):
+    server = start_stub_server(SlackStub(channels=2))
+    roster = tmp_path / "roster.txt"
+    roster.write_text("alice **, U001\nbob, U002\ncarol, U003\n")
+    try:
+        result = CliRunner().invoke(
+            cli,
+            [
+                "--file-path",
+                str(roster),
+                "--slack-token",
+                "xoxb-stub",
+                "--slack-channels",
+                "#channel-0 #channel-1",
+                "--user-group-handle",
+                "goalies",
+                "--directory-cache",
+                str(tmp_path / "directory.json"),
+                "--slack-base-url",
+                stub_base_url(server),
+                "--trace-file",
+                str(tmp_path / "trace.jsonl"),
+            ],
+        )
+    finally:
+        server.shutdown()
+        server.server_close()
+        configure_client()
+        configure_directory()
+        configure_tracing()
+
+    assert result.exit_code == 0, result.output
+    spans = exported_spans(tmp_path / "trace.jsonl")
+    assert {
+        "parse_roster",
+        "resolve_rotation",
+        "conversations_list page",
+        "slack.chat_postMessage",
+        "slack.usergroups_users_update",
+    } <= set(spans)
+    root = next(span for span in spans.values() if "parentSpanId" not in span)
+    assert spans["parse_roster"]["parentSpanId"] == spans["rotation"]["spanId"]
+    assert spans["rotation"]["parentSpanId"] == root["spanId"]
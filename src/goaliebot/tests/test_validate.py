@@ -0,0 +1,193 @@
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from goaliebot.cli import cli
+from goaliebot.core.models import SlackUser
+from goaliebot.core.roster import Roster
+from goaliebot.operations.validation import (
+    check_user,
+    email_index,
+    resolve_emails,
+    validate_roster,
+)
+from goaliebot.slack_api.client import configure_client
+from goaliebot.slack_api.directory import SlackDirectory, configure_directory
+from goaliebot.testing.slack_stub import SlackStub, start_stub_server, stub_base_url
+
+USERS = {
+    "U001": {"name": "alice", "display_name": "Alice", "email": "alice@example.com"},
+    "U002": {"name": "bob", "display_name": "", "deleted": True},
+    "U003": {"name": "carol.k", "display_name": "carol", "email": "c@example.com"},
+}
+
+
+class FakeClient:
+    def __init__(self, pages, token="xoxp-test"):
+        self.token = token
+        self.pages = pages
+        self.calls = 0
+
+    def users_list(self, cursor=None, **kwargs):
+        self.calls += 1
+        page = int(cursor) if cursor else 0
+        next_cursor = str(page + 1) if page + 1 < len(self.pages) else ""
+        return {
+            "members": self.pages[page],
+            "response_metadata": {"next_cursor": next_cursor},
+        }
+
+
+class TestUserDirectory:
+    def test_users_fetched_in_one_paged_pass_and_cached(self, tmp_path):
+        client = FakeClient(
+            [
+                [{"id": "U001", "name": "alice", "profile": {"email": "a@x.io"}}],
+                [{"id": "U002", "name": "bob", "deleted": True}],
+            ]
+        )
+        cache = str(tmp_path / "directory.json")
+
+        users = SlackDirectory(cache_path=cache).users(client)
+        assert users["U001"] == {
+            "name": "alice",
+            "display_name": "",
+            "real_name": "",
+            "deleted": False,
+        }
+        assert users["U002"]["deleted"] is True
+        assert client.calls == 2
+
+        assert SlackDirectory(cache_path=cache).users(client, expected={"U001"})
+        assert client.calls == 2
+
+    def test_unknown_id_refreshes_once(self, tmp_path):
+        client = FakeClient([[{"id": "U001", "name": "alice"}]])
+        cache = str(tmp_path / "directory.json")
+        SlackDirectory(cache_path=cache).users(client)
+
+        directory = SlackDirectory(cache_path=cache)
+        directory.users(client, expected={"U999"})
+        directory.users(client, expected={"U999"})
+
+        assert client.calls == 2
+
+    def test_refresh_ignores_a_fresh_cache(self, tmp_path):
+        cache = str(tmp_path / "directory.json")
+        SlackDirectory(cache_path=cache).users(
+            FakeClient([[{"id": "U001", "name": "alice"}]])
+        )
+        client = FakeClient([[{"id": "U001", "name": "alice", "deleted": True}]])
+
+        directory = SlackDirectory(cache_path=cache)
+        assert directory.users(client, refresh=True)["U001"]["deleted"] is True
+        directory.users(client, refresh=True)
+
+        assert client.calls == 1
+
+    def test_emails_kept_out_of_the_cache_file(self, tmp_path):
+        client = FakeClient(
+            [[{"id": "U001", "name": "alice", "profile": {"email": "a@x.io"}}]]
+        )
+        cache = tmp_path / "directory.json"
+
+        users = SlackDirectory(cache_path=str(cache)).users(client, emails=True)
+
+        assert users["U001"]["email"] == "a@x.io"
+        assert "a@x.io" not in cache.read_text()
+
+
+class TestValidateRoster:
+    @pytest.mark.parametrize(
+        "user, problem",
+        [
+            (SlackUser("alice", "U001"), None),
+            (SlackUser("@Carol", "U003"), None),
+            (SlackUser("bob", "U002"), "deactivated user"),
+            (SlackUser("dave", "U004"), "unknown user ID"),
+            (SlackUser("dave", "dave"), "invalid user ID format"),
+            (SlackUser("alice", "alice@example.com"), "e-mail address"),
+            (SlackUser("alicia", "U001"), "handle does not match Slack user 'alice'"),
+        ],
+    )
+    def test_check_user(self, user, problem):
+        result = check_user(user, USERS)
+        if problem is None:
+            assert result is None
+        else:
+            assert result.startswith(problem)
+
+    def test_fixed_full_deputies_checked_with_line_numbers(self):
+        roster = Roster.from_text(
+            "# team\nalice **, U001 | bob, U002\ncarol, U003 | dave, U004\n",
+            mode="fixed_full",
+        )
+
+        issues = validate_roster("team.txt", roster, USERS)
+
+        assert [(i.line, i.role, i.handle, i.problem) for i in issues] == [
+            (2, "deputy", "bob", "deactivated user"),
+            (3, "deputy", "dave", "unknown user ID"),
+        ]
+
+    def test_emails_resolved_without_touching_other_lines(self):
+        roster = Roster.from_text(
+            "alice **,  ALICE@example.com\nbob, U002\ncarol, nobody@example.com\n"
+        )
+
+        resolved = resolve_emails(roster, email_index(USERS))
+
+        assert resolved == [(0, "goalie", "ALICE@example.com", "U001")]
+        assert roster.dumps() == (
+            "alice **, U001\nbob, U002\ncarol, nobody@example.com\n"
+        )
+        assert roster.current_goalie == SlackUser("alice", "U001")
+
+
+@pytest.fixture
+def stub_url():
+    stub = SlackStub(users=3)
+    stub.users[1]["deleted"] = True
+    server = start_stub_server(stub)
+    yield stub, stub_base_url(server)
+    configure_client()
+    configure_directory()
+    server.shutdown()
+    server.server_close()
+
+
+def test_cli_checks_many_rosters_with_one_listing(stub_url, tmp_path):
+    stub, base_url = stub_url
+    first = tmp_path / "first.txt"
+    first.write_text("user-0 **, user-0@example.com\nuser-1, U00000001\n")
+    second = tmp_path / "second.txt"
+    second.write_text("user-2 **, U00000002\nuser-9, U00000009\n")
+    report = tmp_path / "report.json"
+
+    result = CliRunner().invoke(
+        cli,
+        [
+            "validate",
+            "--file-path",
+            str(first),
+            "--file-path",
+            str(second),
+            "--slack-token",
+            "xoxb-stub",
+            "--slack-base-url",
+            base_url,
+            "--directory-cache",
+            str(tmp_path / "directory.json"),
+            "--resolve-emails",
+            "--report",
+            str(report),
+        ],
+    )
+
+    assert result.exit_code == 1, result.output
+    assert first.read_text().startswith("user-0 **, U00000000\n")
+    problems = [(i["line"], i["problem"]) for i in json.loads(report.read_text())]
+    assert problems == [(2, "deactivated user"), (2, "unknown user ID")]
+    # Fetched fresh, so the unknown U00000009 does not trigger a refetch.
+    assert stub.calls["users.list"] == 1
@@ -0,0 +1,207 @@
+import json
+import sys
+from dataclasses import asdict
+
+import click
+
+from goaliebot.core.compiled import CompiledRoster, is_compiled
+from goaliebot.core.manifest import load_manifest
+from goaliebot.core.models import MODES
+from goaliebot.core.roster import Roster
+from goaliebot.slack_api.resilience import SlackUnavailableError
+from goaliebot.rotation_entry import (
+    configure_slack_runtime,
+    slack_client_options,
+    write_run_metrics,
+)
+from goaliebot.telemetry.logs import get_logger
+from goaliebot.telemetry.metrics import get_metrics
+
+
+def load_targets(file_paths, manifests, mode):
+    """``(file_path, mode)`` for every roster named directly or in a manifest."""
+    targets = [(file_path, mode) for file_path in file_paths]
+    for manifest in manifests:
+        targets += [(spec.file_path, spec.mode) for spec in load_manifest(manifest)]
+    # A roster listed twice is checked once.
+    return list(dict.fromkeys(targets))
+
+
+def load_for_validation(file_path, mode):
+    """The roster with its lines; compiled rosters are decompiled in memory."""
+    if is_compiled(file_path):
+        with CompiledRoster(file_path, mode=mode) as compiled:
+            return compiled.to_roster()
+    return Roster.load(file_path, mode=mode)
+
+
+def validate_rosters(targets, slack_token, resolve=False, client=None):
+    """
+    Check every roster in ``targets`` against one fresh fetch of the
+    workspace's user directory. With ``resolve``, e-mail addresses in the user ID
+    column are first replaced with their IDs and the rosters saved.
+    Returns the RosterIssues found.
+    """
+    from goaliebot.operations.validation import (
+        email_index,
+        resolve_emails,
+        validate_roster,
+    )
+    from goaliebot.slack_api.client import get_client
+    from goaliebot.slack_api.directory import get_directory
+
+    metrics = get_metrics()
+    with metrics.phase("parse_roster"):
+        rosters = [
+            (file_path, load_for_validation(file_path, mode))
+            for file_path, mode in targets
+        ]
+
+    with metrics.phase("fetch_users"):
+        client = client or get_client(slack_token)
+        # Always fetched: a cached listing would miss users deactivated since.
+        users = get_directory().users(client, refresh=True, emails=resolve)
+    logger = get_logger()
+    logger.info(
+        "validation_started",
+        f"🔍 Checking {len(rosters)} rosters against {len(users)} Slack users",
+    )
+
+    if resolve:
+        emails = email_index(users)
+        for file_path, roster in rosters:
+            resolved = resolve_emails(roster, emails)
+            for position, role, email, user_id in resolved:
+                line = roster.line_indexes[position] + 1
+                logger.info(
+                    "email_resolved",
+                    f"✏️ {file_path}:{line}: {role} {email} -> {user_id}",
+                )
+            if resolved and is_compiled(file_path):
+                logger.warning(
+                    "compiled_roster_not_resolved",
+                    f"⚠️ {file_path} is compiled; recompile it from the text roster",
+                )
+            elif resolved:
+                roster.save(file_path)
+
+    issues = []
+    with metrics.phase("validate_rosters"):
+        for file_path, roster in rosters:
+            issues += validate_roster(file_path, roster, users)
+    return issues
+
+
+@click.command()
+@click.option(
+    "--file-path",
+    "file_paths",
+    multiple=True,
+    type=click.Path(exists=True, dir_okay=False),
+    help="Roster to check (repeatable)",
+)
+@click.option(
+    "--manifest",
+    "manifests",
+    multiple=True,
+    type=click.Path(exists=True, dir_okay=False),
+    help="TOML manifest whose rosters to check (repeatable)",
+)
+@click.option(
+    "--mode",
+    default="next_as_deputy",
+    type=click.Choice(MODES),
+    help="Mode of deputy assignment (with --file-path)",
+)
+@click.option(
+    "--slack-token",
+    required=True,
+    envvar="SLACK_TOKEN",
+    help="Slack API token (or set SLACK_TOKEN)",
+)
+@click.option(
+    "--resolve-emails",
+    is_flag=True,
+    default=False,
+    help="Replace e-mail addresses in the user ID column with the users' IDs (needs users:read.email)",
+)
+@click.option(
+    "--report",
+    default=None,
+    help="Write a JSON report with one entry per problem to this file",
+)
+@slack_client_options
+def validate(
+    file_paths,
+    manifests,
+    mode,
+    slack_token,
+    resolve_emails,
+    report,
+    directory_cache,
+    directory_cache_ttl,
+    rate_limit_state,
+    slack_base_url,
+    slack_timeout,
+    slack_pool_size,
+    slack_retries,
+    circuit_breaker_threshold,
+    run_deadline,
+    log_level,
+    log_format,
+    metrics_json,
+    metrics_textfile,
+    trace_file,
+):
+    """Check roster entries against the Slack user directory."""
+    configure_slack_runtime(
+        directory_cache,
+        directory_cache_ttl,
+        rate_limit_state,
+        slack_base_url,
+        slack_timeout,
+        slack_pool_size,
+        slack_retries,
+        circuit_breaker_threshold,
+        run_deadline,
+        log_level,
+        log_format,
+        trace_file,
+    )
+    if not (file_paths or manifests):
+        get_logger().error(
+            "invalid_inputs", "❌ Pass at least one '--file-path' or '--manifest'."
+        )
+        sys.exit(1)
+    try:
+        targets = load_targets(file_paths, manifests, mode)
+        issues = validate_rosters(targets, slack_token, resolve=resolve_emails)
+    except (OSError, ValueError, SlackUnavailableError) as e:
+        get_logger().error("validation_failed", f"❌ Could not validate rosters: {e}")
+        sys.exit(1)
+    finally:
+        write_run_metrics(metrics_json, metrics_textfile)
+
+    logger = get_logger()
+    for issue in issues:
+        logger.error(
+            "roster_issue",
+            f"❌ {issue.file}:{issue.line}: {issue.role} {issue.handle} "
+            f"({issue.user_id}): {issue.problem}",
+            error=issue.problem,
+        )
+    if report:
+        with open(report, "w") as f:
+            json.dump([asdict(issue) for issue in issues], f, indent=2)
+    if issues:
+        logger.info("validation_complete", f"\n{len(issues)} problems found.", ok=False)
+        sys.exit(1)
+    logger.info(
+        "validation_complete",
+        "✅ Every roster entry matches an active Slack user.",
+        ok=True,
+    )
+
+
+if __name__ == "__main__":
+    validate()